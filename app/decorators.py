@@ -0,0 +1,121 @@
+"""
+Decorators of async views. Django's own ones call the view synchronously, so they cannot wrap coroutines.
+They follow `login_required`, `require_http_methods`, `cache_control` and `condition` from Django.
+`max_queries` marks sync and async views alike, like `csrf_exempt` does.
+"""
+
+from datetime import timezone as dt_timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.log import log_response
+
+
+def async_login_required(view_func):
+    """Redirects anonymous users to the login page. The user is loaded from the session in a worker thread."""
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        # Once loaded, `request.user` can be read without queries in the view and in templates
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return redirect_to_login(request.get_full_path())
+
+        return await view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+def async_require_http_methods(request_method_list: list):
+    """Returns 405 Method Not Allowed to requests made with methods that are not listed"""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in request_method_list:
+                response = HttpResponseNotAllowed(request_method_list)
+                log_response(f"Method Not Allowed ({ request.method }): { request.path }", response=response, request=request)
+
+                return response
+
+            return await view_func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async_require_GET = async_require_http_methods(['GET'])
+
+
+def async_cache_control(**kwargs):
+    """Adds the directives provided to the Cache-Control header of the response"""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **view_kwargs):
+            response = await view_func(request, *args, **view_kwargs)
+            patch_cache_control(response, **kwargs)
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def async_condition(etag_func=None, last_modified_func=None):
+    """
+    Answers conditional requests with 304 Not Modified or 412 Precondition Failed without calling the view,
+    and adds ETag and Last-Modified headers to responses. `etag_func` and `last_modified_func` must not query the database.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            last_modified = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+
+            if last_modified is not None:
+                if not timezone.is_aware(last_modified):
+                    last_modified = timezone.make_aware(last_modified, dt_timezone.utc)
+
+                last_modified = int(last_modified.timestamp())
+
+            etag = etag_func(request, *args, **kwargs) if etag_func else None
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def max_queries(limit: int = None):
+    """
+    Sets the number of queries after which `QueryTimingMiddleware` flags requests to the view, instead of
+    `PERFORMANCE_MAX_QUERIES`. Views that write a number of rows chosen by the request pass None, and are not flagged.
+    """
+
+    def decorator(view_func):
+        view_func.max_queries = limit
+
+        return view_func
+
+    return decorator
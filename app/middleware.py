@@ -0,0 +1,324 @@
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings as stg
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+import gzip
+import logging
+import time
+
+try:
+    import brotli
+
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger('app.performance')
+
+
+def record_query(metrics: dict):
+    """Returns the execute wrapper that counts queries and adds the time they take to the metrics provided"""
+
+    def wrapper(execute, sql, params, many, context):
+        started_at = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+
+        finally:
+            metrics['db'] += time.perf_counter() - started_at
+            metrics['queries'] += 1
+
+    return wrapper
+
+
+def record_queries(metrics: dict) -> ExitStack:
+    """
+    Installs the execute wrapper of the metrics on the connections of the current thread.
+    Returns the stack that removes them once closed, in the same thread.
+    """
+
+    stack = ExitStack()
+
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(record_query(metrics)))
+
+    return stack
+
+
+class QueryTimingMiddleware:
+    """
+    Measures the number of SQL queries, the time spent in the database, in templates and in the view
+    for every request. Metrics are logged to the `app.performance` logger, and are added to the response
+    as a `Server-Timing` header if `SERVER_TIMING` is True.
+
+    Queries are recorded by execute wrappers installed on the connections for the request only, in the thread
+    that runs its sync code. Templates rendered by `app.utils.render` add their time to `request.performance_metrics`.
+
+    Requests that make more than `PERFORMANCE_MAX_QUERIES` queries or take longer than
+    `PERFORMANCE_MAX_DURATION` milliseconds are logged as warnings. Views that write rows
+    set their own number of queries with the `app.decorators.max_queries` decorator.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        # Under ASGI requests are not passed to worker threads to be measured
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = self.start(request)
+
+        try:
+            with record_queries(metrics):
+                response = self.get_response(request)
+
+        finally:
+            self.finish(request, metrics)
+
+        self.report(request, response, metrics)
+
+        return response
+
+    async def __acall__(self, request):
+        metrics = self.start(request)
+
+        # Queries of async views are made by the thread that runs sync code of the request, so wrappers are installed there
+        queries = await sync_to_async(record_queries)(metrics)
+
+        try:
+            response = await self.get_response(request)
+
+        finally:
+            await sync_to_async(queries.close)()
+            self.finish(request, metrics)
+
+        self.report(request, response, metrics)
+
+        return response
+
+    def start(self, request) -> dict:
+        """Starts measuring the request, returns its metrics: the number of queries and the time spent in the database and in templates"""
+
+        request.view_started_at = None
+        request.max_queries = stg.PERFORMANCE_MAX_QUERIES
+        request.started_at = time.perf_counter()
+        request.performance_metrics = {'queries': 0, 'db': 0.0, 'render': 0.0}
+
+        return request.performance_metrics
+
+    def finish(self, request, metrics: dict):
+        """Stops measuring the request, adds the total time and the time spent in the view to its metrics"""
+
+        finished_at = time.perf_counter()
+
+        metrics['total'] = finished_at - request.started_at
+        metrics['view'] = finished_at - request.view_started_at if request.view_started_at else 0.0
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.view_started_at = time.perf_counter()
+        request.max_queries = getattr(view_func, 'max_queries', request.max_queries)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        request.view_started_at = time.perf_counter()
+        request.max_queries = getattr(view_func, 'max_queries', request.max_queries)
+
+    def report(self, request, response, metrics: dict):
+        """Logs the metrics of the request and adds them to the response"""
+
+        durations = {name: round(metrics[name] * 1000, 1) for name in ('db', 'view', 'render', 'total')}
+
+        if stg.SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={ durations["db"] };desc="{ metrics["queries"] } queries"',
+                f'view;dur={ durations["view"] }',
+                f'render;dur={ durations["render"] }',
+                f'total;dur={ durations["total"] }',
+            ])
+
+        flags = []
+
+        if request.max_queries is not None and metrics['queries'] > request.max_queries:
+            flags.append('too_many_queries')
+
+        if durations['total'] > stg.PERFORMANCE_MAX_DURATION:
+            flags.append('slow')
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': request.resolver_match.view_name if request.resolver_match else None,
+            'status': response.status_code,
+            'queries': metrics['queries'],
+            **{f'{ name }_ms': duration for name, duration in durations.items()},
+            'flags': flags,
+        }
+
+        logger.log(
+            logging.WARNING if flags else logging.INFO,
+            "%s %s %s queries=%d db=%.1fms view=%.1fms render=%.1fms total=%.1fms%s",
+            record['method'], record['path'], record['status'], record['queries'],
+            durations['db'], durations['view'], durations['render'], durations['total'],
+            f" flags={ ','.join(flags) }" if flags else '',
+            extra={'performance': record},
+        )
+
+
+def gzip_compress(content: bytes) -> bytes:
+    # Without a modification time in the header the same content is always compressed to the same bytes
+    return gzip.compress(content, compresslevel=stg.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def brotli_compress(content: bytes) -> bytes:
+    return brotli.compress(content, quality=stg.COMPRESSION_BROTLI_QUALITY)
+
+
+# Content codings by preference, brotli is used where the `brotli` package is installed
+ENCODINGS = {'br': brotli_compress, 'gzip': gzip_compress} if brotli else {'gzip': gzip_compress}
+
+
+def negotiate_encoding(accept_encoding: str):
+    """Returns the content coding of `ENCODINGS` the client accepts with the highest weight, or None"""
+
+    weights = {}
+
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        name, params = name.strip().lower(), params.replace(' ', '')
+
+        try:
+            weights[name] = float(params[2:]) if params.startswith('q=') else 1.0
+
+        except ValueError:
+            continue
+
+    # Codings that are not listed get the weight of `*`, the first one of equal weights is preferred
+    accepted = [(weights.get(name, weights.get('*', 0.0)), name) for name in ENCODINGS]
+    weight, name = max(accepted, key=lambda item: item[0])
+
+    return name if weight > 0 else None
+
+
+def add_encoding(etag: str, encoding: str) -> str:
+    """Returns the strong ETag of the representation of the content with the coding, eg. `"1-42"` and `"1-42-gzip"`"""
+
+    return f'{ etag[:-1] }-{ encoding }"'
+
+
+def remove_encoding(etag: str) -> tuple:
+    """Returns the strong ETag without its coding and the coding, or the ETag as it is and None"""
+
+    for encoding in ENCODINGS:
+        if not etag.startswith('W/') and etag.endswith(f'-{ encoding }"'):
+            return f'{ etag[:-len(encoding) - 2] }"', encoding
+
+    return etag, None
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses of at least `COMPRESSION_MIN_SIZE` bytes with brotli or gzip, as negotiated
+    with the `Accept-Encoding` header. Streaming responses are sent as they are. Under ASGI, bodies of at least
+    `COMPRESSION_THREAD_MIN_SIZE` bytes are compressed in a worker thread rather than in the event loop.
+
+    Unlike `GZipMiddleware`, strong ETags are kept strong: the coding is added to them, eg. `"1-42-gzip"`,
+    so that every representation of a page has its own validator. The suffix is removed from `If-None-Match`
+    before views compare ETags, so that pages not changed since are still answered with 304 Not Modified.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        encodings = self.process_request(request)
+
+        return self.process_response(request, self.get_response(request), encodings)
+
+    async def __acall__(self, request):
+        encodings = self.process_request(request)
+        response = await self.get_response(request)
+
+        # Large bodies are compressed in a worker thread, so that the event loop goes on serving other requests
+        if not response.streaming and len(response.content) >= stg.COMPRESSION_THREAD_MIN_SIZE:
+            return await sync_to_async(self.process_response, thread_sensitive=False)(request, response, encodings)
+
+        return self.process_response(request, response, encodings)
+
+    def process_request(self, request) -> dict:
+        """Removes codings from ETags of `If-None-Match`, returns the codings by the ETags they were removed from"""
+
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+
+        if not if_none_match:
+            return {}
+
+        etags, encodings = [], {}
+
+        for etag in parse_etags(if_none_match):
+            etag, encoding = remove_encoding(etag)
+            etags.append(etag)
+
+            if encoding:
+                encodings[etag] = encoding
+
+        request.META['HTTP_IF_NONE_MATCH'] = ', '.join(etags)
+
+        return encodings
+
+    def process_response(self, request, response, encodings: dict):
+        # Pages that are not modified have the ETag of the representation the client has
+        if response.status_code == 304:
+            etag = response.get('ETag')
+
+            if etag in encodings:
+                response.headers['ETag'] = add_encoding(etag, encodings[etag])
+
+            return response
+
+        if response.streaming or response.has_header('Content-Encoding') or len(response.content) < stg.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+        if encoding is None:
+            return response
+
+        compressed_content = ENCODINGS[encoding](response.content)
+
+        # Content that does not compress is sent as it is
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(compressed_content))
+        response.headers['Content-Encoding'] = encoding
+
+        etag = response.get('ETag')
+
+        if etag and not etag.startswith('W/'):
+            response.headers['ETag'] = add_encoding(etag, encoding)
+
+        return response
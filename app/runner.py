@@ -0,0 +1,23 @@
+from django.test.runner import DiscoverRunner
+
+import logging
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs tests without printing requests logged by `QueryTimingMiddleware`, since tests make slow requests
+    and requests with many queries on purpose. Tests of the log capture it with `assertLogs`.
+    """
+
+    performance_logger = logging.getLogger('app.performance')
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+
+        self.logger_handlers = self.performance_logger.handlers
+        self.performance_logger.handlers = [logging.NullHandler()]
+
+    def teardown_test_environment(self, **kwargs):
+        self.performance_logger.handlers = self.logger_handlers
+
+        super().teardown_test_environment(**kwargs)
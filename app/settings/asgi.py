@@ -0,0 +1,6 @@
+from .production import *
+
+# Under ASGI the sync code of all requests, including queries of the async ORM, runs in a single shared thread,
+# while requests are finished in the event loop, so persistent connections would never be closed.
+# They are disabled even if local settings enable them.
+CONN_MAX_AGE = 0
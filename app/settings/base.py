@@ -35,6 +35,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Measures the whole request, so it goes first
+    'app.middleware.QueryTimingMiddleware',
+    # Compresses responses once the other middleware changed them
+    'app.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +82,42 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Import and deletion jobs run in their own process, and ASGI servers run several workers, so production must
+# use a cache shared by all processes, eg. Redis or Memcached. Summaries they invalidate are rebuilt right away then,
+# and versions of dictionaries they change are seen by all workers. The local memory cache is kept by each process,
+# so pages are neither cached nor revalidated with ETags on it unless `WORKER_PROCESSES` is 1
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.1/topics/logging/
+# Requests over the performance thresholds are logged as warnings, set the level to INFO to log every request
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'app.performance': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -98,6 +138,9 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Requests logged by `QueryTimingMiddleware` are not printed while tests run
+TEST_RUNNER = 'app.runner.TestRunner'
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 
@@ -122,6 +165,9 @@ STATICFILES_DIRS = [
     os.path.join(PROJECT_DIR, "static"),
 ]
 
+# Uploaded files, eg. words files waiting to be imported
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -130,4 +176,45 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Custom settings
 PAGINATOR_PER_PAGE = 20
-RECENT_WORD_COUNT = 20
\ No newline at end of file
+PAGINATOR_COUNT = False
+RECENT_WORD_COUNT = 20
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_FILE_SIZE = 500_000_000
+IMPORT_WORKERS = 2
+IMPORT_POLL_INTERVAL = 1
+JOB_HEARTBEAT_TIMEOUT = 600
+FUZZY_SEARCH_RESULTS = 20
+FUZZY_SEARCH_THRESHOLD = 0.3
+FUZZY_INDEX_TIMEOUT = 300
+FUZZY_INDEX_MAX_USERS = 100
+AUTOCOMPLETE_RESULTS = 10
+AUTOCOMPLETE_INDEX_TIMEOUT = 300
+AUTOCOMPLETE_INDEX_MAX_USERS = 100
+QUIZ_QUESTIONS = 100
+QUIZ_OPTIONS = 4
+QUIZ_INDEX_TIMEOUT = 300
+QUIZ_INDEX_MAX_USERS = 100
+SUMMARY_CACHE_TIMEOUT = 300
+FRAGMENT_CACHE_TIMEOUT = 300
+VERSION_CACHE_TIMEOUT = 300
+# Processes that serve requests or run jobs, ie. ASGI workers and the job worker
+WORKER_PROCESSES = 2
+EXPORT_CHUNK_SIZE = 2000
+DELETION_BATCH_SIZE = 1000
+DELETION_BATCH_PAUSE = 0.05
+DELETION_SYNC_LIMIT = 5000
+REVIEW_BATCH_SIZE = 50
+REVIEW_RELEARN_DELAY = 600
+API_PAGE_SIZE = 100
+API_BATCH_MAX_ITEMS = 1000
+SYNC_PAGE_SIZE = 1000
+SYNC_OVERLAP = 5
+SYNC_TOMBSTONE_RETENTION = 30 * 24 * 3600
+SERVER_TIMING = False
+COMPRESSION_MIN_SIZE = 1000
+COMPRESSION_THREAD_MIN_SIZE = 32_000
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+# Read views make a few queries, views that write rows set their own number with `app.decorators.max_queries`
+PERFORMANCE_MAX_QUERIES = 10
+PERFORMANCE_MAX_DURATION = 500
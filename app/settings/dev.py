@@ -12,6 +12,9 @@ CSRF_TRUSTED_ORIGINS = ["https://*", "http://*"]
 
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Query counts and timings are shown in browser's developer tools
+SERVER_TIMING = True
+
 
 try:
     from .local import *
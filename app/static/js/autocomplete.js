@@ -0,0 +1,46 @@
+// Suggests user's words as they are typed into inputs that have the `data-autocomplete-url` attribute.
+(function () {
+    const DELAY = 100;
+
+    function attach(input) {
+        const datalist = document.createElement('datalist');
+        datalist.id = `${ input.id || input.name }-autocomplete`;
+        input.after(datalist);
+        input.setAttribute('list', datalist.id);
+
+        let timeout = null;
+        let controller = null;
+
+        input.addEventListener('input', function () {
+            clearTimeout(timeout);
+
+            timeout = setTimeout(function () {
+                const term = input.value.trim();
+
+                if (controller) {
+                    controller.abort();
+                }
+
+                if (!term) {
+                    datalist.replaceChildren();
+                    return;
+                }
+
+                controller = new AbortController();
+
+                fetch(`${ input.dataset.autocompleteUrl }?term=${ encodeURIComponent(term) }`, {signal: controller.signal})
+                    .then((response) => response.json())
+                    .then(function (data) {
+                        datalist.replaceChildren(...data.results.map(function (result) {
+                            const option = document.createElement('option');
+                            option.value = result.word;
+                            return option;
+                        }));
+                    })
+                    .catch(() => {});
+            }, DELAY);
+        });
+    }
+
+    document.querySelectorAll('input[data-autocomplete-url]').forEach(attach);
+})();
@@ -1,7 +1,29 @@
 from typing import Type
 
+from django import shortcuts
 from django.forms import CheckboxInput, Form, Select, SelectMultiple
 
+import time
+
+
+def render(request, template_name: str, context: dict = None, *args, **kwargs):
+    """
+    Returns the response of the template rendered with the context, like `django.shortcuts.render`,
+    and adds the time it takes to the metrics of the request recorded by `QueryTimingMiddleware`.
+    """
+
+    started_at = time.perf_counter()
+
+    try:
+        return shortcuts.render(request, template_name, context, *args, **kwargs)
+
+    finally:
+        # Requests are not measured if the middleware is not installed, eg. in some tests
+        metrics = getattr(request, 'performance_metrics', None)
+
+        if metrics is not None:
+            metrics['render'] += time.perf_counter() - started_at
+
 
 def bootstrapify_form(form, floating = False) -> Type[Form]:
     """
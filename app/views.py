@@ -1,10 +1,9 @@
 from django.http import HttpResponseRedirect
-from django.shortcuts import render
 
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
-from app.utils import bootstrapify_form
+from app.utils import bootstrapify_form, render
 
 
 def sign_up(request):
@@ -4,4 +4,8 @@ from .models import *
 admin.site.register(Language)
 admin.site.register(Word)
 admin.site.register(Hint)
-admin.site.register(Translation)
\ No newline at end of file
+admin.site.register(Translation)
+admin.site.register(Review)
+admin.site.register(Tombstone)
+admin.site.register(ImportJob)
+admin.site.register(DeletionJob)
\ No newline at end of file
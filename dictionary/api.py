@@ -0,0 +1,122 @@
+"""
+JSON API of user's languages, words, hints and translations, for clients that sync many changes at once.
+Requests are authenticated with the session, and writes need the CSRF token like the forms of the site do.
+"""
+
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings as stg
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from app.decorators import async_cache_control, async_condition, async_require_GET, max_queries
+
+from . import sync, versions
+from .batches import BATCHES
+from .pagination import CursorPaginator
+
+import json
+
+
+OPERATIONS = ('create', 'update', 'delete')
+
+
+def error_response(message: str, status: int) -> JsonResponse:
+    return JsonResponse({'error': message}, status=status)
+
+
+def api_login_required(view_func):
+    """Answers requests of anonymous users with 401 Unauthorized, rather than redirecting them to the login page"""
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if not await sync_to_async(lambda: request.user.is_authenticated)():
+                return error_response("Authentication credentials were not provided.", 401)
+
+            return await view_func(request, *args, **kwargs)
+
+    else:
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return error_response("Authentication credentials were not provided.", 401)
+
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+@async_require_GET
+@api_login_required
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=versions.etag, last_modified_func=versions.last_modified)
+async def list_objects(request, resource: str):
+    """
+    URL: /dictionary/api/<str: resource>/
+    Returns a page of `API_PAGE_SIZE` user's languages, words, hints or translations, from the most recent one.
+    Pages are linked by the `next` and `previous` cursors, given back in the `cursor` GET parameter.
+    Clients revalidate pages with their ETag, which changes with the version of the dictionary.
+    """
+
+    if resource not in BATCHES:
+        return error_response("Not found.", 404)
+
+    writer = BATCHES[resource](request.user)
+    paginator = CursorPaginator(writer.queryset(), stg.API_PAGE_SIZE)
+
+    # aget_page returns the first page if a cursor value is not valid
+    page = await paginator.aget_page(request.GET.get('cursor'))
+
+    return JsonResponse({
+        'results': [writer.serialize(instance) for instance in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@async_require_GET
+@api_login_required
+@async_cache_control(private=True, no_cache=True)
+async def sync_changes(request):
+    """
+    URL: /dictionary/api/sync
+    Returns a page of up to `SYNC_PAGE_SIZE` user's languages, words, hints and translations changed since
+    the sync the `cursor` GET parameter was returned by, and ids of the ones deleted, or all of them without it.
+    Pages of a sync are read while `has_more` is true, the cursor of the last one starts the next sync.
+    Pages of a full sync, returned as well when the last sync is older than the retention of tombstones, have `full` set.
+    Pages have no ETag: the cursor already makes a sync without changes cheap, and a version that is not seen by
+    all processes would hide changes made by the job worker from clients that poll.
+    """
+
+    return JsonResponse(await sync_to_async(sync.get_changes)(request.user, request.GET.get('cursor')))
+
+
+@max_queries(None)
+@require_POST
+@api_login_required
+def batch(request, resource: str):
+    """
+    URL: /dictionary/api/<str: resource>/batch
+    Creates, updates and deletes user's languages, words, hints or translations given in the JSON body
+    as `create` and `update` lists of objects and a `delete` list of ids, up to `API_BATCH_MAX_ITEMS` in total.
+    The batch is saved in one transaction, and a result is returned for every item.
+    """
+
+    if resource not in BATCHES:
+        return error_response("Not found.", 404)
+
+    try:
+        operations = json.loads(request.body)
+
+    except ValueError:
+        return error_response("Request body is not valid JSON.", 400)
+
+    if not isinstance(operations, dict) or set(operations) - set(OPERATIONS) or not all(isinstance(operations.get(operation, []), list) for operation in OPERATIONS):
+        return error_response(f"Request body must be an object of { ', '.join(OPERATIONS) } lists.", 400)
+
+    if sum(len(items) for items in operations.values()) > stg.API_BATCH_MAX_ITEMS:
+        return error_response(f"Batches cannot have more than { stg.API_BATCH_MAX_ITEMS } items.", 400)
+
+    return JsonResponse(BATCHES[resource](request.user).run(**operations))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DictionaryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dictionary'
+
+    def ready(self):
+        # Keeps cached dictionary summaries and versions up to date
+        from . import signals
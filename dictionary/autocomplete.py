@@ -0,0 +1,107 @@
+from bisect import bisect_left, insort
+
+from django.conf import settings as stg
+
+from .models import Word
+from .utils import UserIndexRegistry
+
+import threading
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index of user's words.
+
+    Words are kept in a list of `(lowercased word, id)` pairs sorted once, so completions of a prefix
+    are a contiguous slice of the list, found by binary search. Words are changed in place as they
+    are edited, completions and changes of one index hold its `lock`.
+    """
+
+    def __init__(self, words: list = ()):
+        self._words = {word_id: word for word_id, word in words}
+        self._keys = sorted((word.lower(), word_id) for word_id, word in self._words.items())
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def set_word(self, word_id: int, word: str):
+        """Indexes the word provided, replacing its older spelling"""
+
+        self.remove_word(word_id)
+
+        self._words[word_id] = word
+        insort(self._keys, (word.lower(), word_id))
+
+    def remove_word(self, word_id: int):
+        """Removes the word provided from the index"""
+
+        word = self._words.pop(word_id, None)
+
+        if word is None:
+            return
+
+        key = (word.lower(), word_id)
+        position = bisect_left(self._keys, key)
+
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def complete(self, prefix: str, limit: int) -> list:
+        """Returns up to `limit` pairs of id and word that start with the prefix, in alphabetical order"""
+
+        prefix = prefix.strip().lower()
+
+        if not prefix:
+            return []
+
+        results = []
+        start = bisect_left(self._keys, (prefix,))
+
+        # Keys are read by position from the one found, neither copying nor skipping the rest of the list
+        for position in range(start, min(start + limit, len(self._keys))):
+            key, word_id = self._keys[position]
+
+            if not key.startswith(prefix):
+                break
+
+            results.append((word_id, self._words[word_id]))
+
+        return results
+
+
+def build_index(user) -> PrefixIndex:
+    """Builds the prefix index of the user's words"""
+
+    return PrefixIndex(Word.objects.filter(user=user).values_list('id', 'word').iterator())
+
+
+indexes = UserIndexRegistry(build_index, 'AUTOCOMPLETE_INDEX_TIMEOUT', 'AUTOCOMPLETE_INDEX_MAX_USERS')
+
+
+def complete(user, prefix: str) -> list:
+    """Returns up to `AUTOCOMPLETE_RESULTS` pairs of id and word of the user's words that start with the prefix"""
+
+    index = indexes.get(user)
+
+    # Completions of other users do not wait for this one
+    with index.lock:
+        return index.complete(prefix, stg.AUTOCOMPLETE_RESULTS)
+
+
+def index_word(word: Word):
+    """Updates the word in the user's index, if the index is built"""
+
+    indexes.update(word.user_id, lambda index: index.set_word(word.pk, word.word))
+
+
+def remove_word(user, word_id: int):
+    """Removes the word from the user's index, if the index is built"""
+
+    indexes.update(user.pk, lambda index: index.remove_word(word_id))
+
+
+def invalidate(user=None):
+    """Drops the index of the user provided, or indexes of all users, so that they are built again"""
+
+    indexes.invalidate(user)
@@ -0,0 +1,563 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import QuerySet, Value
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from . import autocomplete, counters, fuzzy, quiz, reviews, summary, versions
+from .deletion import LanguageDeleter, can_delete_in_request, delete_hints, delete_translations, delete_words
+from .models import Hint, Language, Translation, Word
+
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+INVALID = 'invalid'
+
+REQUIRED = "This field is required."
+NOT_FOUND = "Not found."
+
+
+def is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def invalid(errors: dict) -> dict:
+    return {'status': INVALID, 'errors': errors}
+
+
+def add_changes(changes: defaultdict, deltas: dict):
+    """Adds changes of language counters to the ones collected, keeping negative ones unlike `Counter`"""
+
+    for language_id, delta in deltas.items():
+        changes[language_id] += delta
+
+
+class BatchWriter:
+    """
+    Creates, updates and deletes user's instances of one model in a single transaction.
+
+    Items of an operation are validated together with a constant number of queries, then valid ones are
+    saved with bulk queries, so the number of queries does not depend on the number of items. Deletions
+    are applied first, then updates and creations. A result is returned for every item, in the order
+    they were given: its status and id, or the errors found. Invalid items do not stop the others.
+
+    Bulk queries do not send signals, so summaries, versions and indexes of the user are invalidated
+    once the batch is saved.
+    """
+
+    model = None
+    # Fields that are read and written by the API, foreign keys are given by their ids
+    fields = []
+
+    @property
+    def update_fields(self) -> list:
+        return [*self.fields, 'date_updated']
+
+    def __init__(self, user):
+        self.user = user
+
+    def run(self, create: list = (), update: list = (), delete: list = ()) -> dict:
+        """Applies the operations and returns the lists of results of their items"""
+
+        with transaction.atomic():
+            self.load()
+
+            results = {'delete': self.delete(list(delete))}
+            results['update'] = self.update(list(update))
+            results['create'] = self.create(list(create))
+
+        if any(result['status'] != INVALID for operation_results in results.values() for result in operation_results):
+            # Data derived from the previous state is not rebuilt before the batch is committed, if it runs in a transaction
+            transaction.on_commit(self.invalidate)
+
+        return results
+
+    def queryset(self) -> QuerySet:
+        return self.model.objects.filter(user=self.user)
+
+    def serialize(self, instance) -> dict:
+        """Returns the fields of the instance the way the API returns them"""
+
+        data = {'id': instance.pk}
+
+        for field in self.fields:
+            data[field] = getattr(instance, self.model._meta.get_field(field).attname)
+
+        data['date_added'] = instance.date_added
+        data['date_updated'] = instance.date_updated
+
+        return data
+
+    def load(self):
+        """Loads the data items are validated against, once per batch"""
+
+    def load_related(self, items: list, instances: list):
+        """Loads the data items of an operation and the instances they change are validated against"""
+
+    def create(self, items: list) -> list:
+        raise NotImplementedError
+
+    def update(self, items: list) -> list:
+        raise NotImplementedError
+
+    def delete(self, ids: list) -> list:
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Drops data of the user derived from the instances changed"""
+
+        summary.invalidate(self.user)
+        versions.bump(self.user.pk)
+        fuzzy.invalidate(self.user)
+        autocomplete.invalidate(self.user)
+        quiz.invalidate(self.user)
+
+    def clean_text(self, item: dict, field: str, errors: dict):
+        """Returns the text of the item's field, adding an error if it is blank or longer than the model allows"""
+
+        value = item.get(field)
+        max_length = self.model._meta.get_field(field).max_length
+
+        if not isinstance(value, str) or not value.strip():
+            errors[field] = REQUIRED
+
+        elif max_length is not None and len(value) > max_length:
+            errors[field] = f"Ensure this value has at most { max_length } characters."
+
+        return value
+
+    def clean_choice(self, item: dict, field: str, choices, errors: dict):
+        """Returns the id in the item's field, adding an error if it is not one of the choices"""
+
+        value = item.get(field)
+
+        if value is None:
+            errors[field] = REQUIRED
+
+        elif not is_id(value) or value not in choices:
+            errors[field] = NOT_FOUND
+
+        return value
+
+    def clean_fields(self, item, instance, errors: dict, partial: bool):
+        """
+        Sets the fields given in the item on the instance, collecting errors. Fields that are not given
+        are required unless the update is partial.
+        """
+
+        for field in self.fields:
+            if partial and field not in item:
+                continue
+
+            model_field = self.model._meta.get_field(field)
+
+            if model_field.is_relation:
+                value = self.clean_choice(item, field, self.choices(field), errors)
+
+            else:
+                value = self.clean_text(item, field, errors)
+
+            if field not in errors:
+                setattr(instance, model_field.attname, value)
+
+    def choices(self, field: str):
+        """Returns ids the foreign key provided can point to"""
+
+        raise NotImplementedError
+
+    def instances(self, items: list) -> tuple:
+        """
+        Returns user's instances items point to by their `id`, keyed by it, and the items' errors.
+        Items that are not objects, point to other users' instances or repeat an id get errors.
+        """
+
+        ids = [item.get('id') for item in items if isinstance(item, dict) and is_id(item.get('id'))]
+        instances = self.queryset().in_bulk(ids)
+
+        errors = []
+        seen = set()
+
+        for item in items:
+            if not isinstance(item, dict):
+                errors.append({'item': "Must be an object."})
+
+            elif not is_id(item.get('id')) or item['id'] not in instances:
+                errors.append({'id': NOT_FOUND})
+
+            elif item['id'] in seen:
+                errors.append({'id': "Is repeated in the batch."})
+
+            else:
+                seen.add(item['id'])
+                errors.append({})
+
+        return instances, errors
+
+    def new_instances(self, items: list) -> tuple:
+        """Returns unsaved instances of the items' fields and the items' errors"""
+
+        self.load_related(items, [])
+
+        instances = []
+        errors = []
+
+        for item in items:
+            instance = self.model(user=self.user)
+            item_errors = {}
+
+            if isinstance(item, dict):
+                self.clean_fields(item, instance, item_errors, partial=False)
+
+            else:
+                item_errors['item'] = "Must be an object."
+
+            instances.append(instance)
+            errors.append(item_errors)
+
+        return instances, errors
+
+    def changed_instances(self, items: list) -> tuple:
+        """Returns saved instances with the fields of the items set, their states before the change, and the items' errors"""
+
+        instances, errors = self.instances(items)
+        self.load_related(items, list(instances.values()))
+
+        now = timezone.now()
+        changed = []
+        originals = []
+
+        for item, item_errors in zip(items, errors):
+            instance = instances.get(item.get('id')) if not item_errors else None
+
+            if instance is not None:
+                originals.append({field: value for field, value in instance.__dict__.items() if not field.startswith('_')})
+                self.clean_fields(item, instance, item_errors, partial=True)
+
+                # `bulk_update` does not set `auto_now` fields
+                instance.date_updated = now
+
+            else:
+                originals.append(None)
+
+            changed.append(instance)
+
+        return changed, originals, errors
+
+    def results(self, instances: list, errors: list, status: str) -> list:
+        return [
+            invalid(item_errors) if item_errors else {'status': status, 'id': instance.pk}
+            for instance, item_errors in zip(instances, errors)
+        ]
+
+    def deleted_results(self, ids: list, deleted_ids) -> list:
+        deleted_ids = set(deleted_ids)
+
+        return [{'status': DELETED, 'id': pk} if is_id(pk) and pk in deleted_ids else invalid({'id': NOT_FOUND}) for pk in ids]
+
+
+class LanguageBatch(BatchWriter):
+    """
+    Batches of languages. Languages are deleted with their words, unless they have more than `DELETION_SYNC_LIMIT`
+    words and translations to them.
+    Deletions are not part of the batch's transaction: every language is deleted before it by `LanguageDeleter`,
+    in short transactions of its own, so that a batch does not lock the database while thousands of words are deleted.
+    """
+
+    model = Language
+    fields = ['language_name']
+
+    def load(self):
+        self.languages = self.queryset().in_bulk()
+
+        # Names are compared lowercased, the way words files are imported
+        self.names = {language.language_name.lower(): language.pk for language in self.languages.values()}
+
+    def check_name(self, language: Language, errors: dict, old_name: str = None):
+        """Adds an error if another language of the user has the name of the language provided"""
+
+        if 'language_name' in errors:
+            return
+
+        key = language.language_name.lower()
+
+        if self.names.get(key, language.pk) != language.pk:
+            errors['language_name'] = "Language with that name already exists!"
+            return
+
+        if old_name is not None and self.names.get(old_name.lower()) == language.pk:
+            del self.names[old_name.lower()]
+
+        # Languages created in the batch do not have ids yet, but take their name
+        self.names[key] = language.pk or -1
+
+    def run(self, create: list = (), update: list = (), delete: list = ()) -> dict:
+        if delete:
+            self.load()
+            delete_results = self.delete(list(delete))
+
+        # Names of the languages deleted are freed for the other operations
+        results = super().run(create, update)
+
+        if delete:
+            results['delete'] = delete_results
+
+        return results
+
+    def create(self, items: list) -> list:
+        languages, errors = self.new_instances(items)
+
+        for language, item_errors in zip(languages, errors):
+            if not item_errors:
+                self.check_name(language, item_errors)
+
+        Language.objects.bulk_create([language for language, item_errors in zip(languages, errors) if not item_errors])
+
+        return self.results(languages, errors, CREATED)
+
+    def update(self, items: list) -> list:
+        languages, originals, errors = self.changed_instances(items)
+
+        for language, original, item_errors in zip(languages, originals, errors):
+            if not item_errors:
+                self.check_name(language, item_errors, original['language_name'])
+
+        Language.objects.bulk_update([language for language, item_errors in zip(languages, errors) if not item_errors], self.update_fields)
+
+        return self.results(languages, errors, UPDATED)
+
+    def delete(self, ids: list) -> list:
+        results = []
+
+        for pk in ids:
+            language = self.languages.get(pk) if is_id(pk) else None
+
+            if language is None:
+                results.append(invalid({'id': NOT_FOUND}))
+                continue
+
+            if not can_delete_in_request(language):
+                results.append(invalid({'id': "Language has too many words and translations to be deleted in a batch!"}))
+                continue
+
+            # The user is set, so that the deleter does not load it per language
+            language.user = self.user
+            LanguageDeleter(language, pause=0).run()
+
+            del self.languages[pk]
+            results.append({'status': DELETED, 'id': pk})
+
+        return results
+
+
+class WordBatch(BatchWriter):
+    """
+    Batches of words. New words are scheduled to be reviewed, words are deleted with their hints and translations.
+    Words cannot be moved to the language of one of their translations.
+    """
+
+    model = Word
+    fields = ['word', 'word_language', 'description']
+
+    def load(self):
+        self.languages = set(Language.objects.filter(user=self.user).values_list('pk', flat=True))
+
+    def choices(self, field: str):
+        return self.languages
+
+    def existing_words(self, words: list) -> dict:
+        """
+        Returns ids of user's words spelled as the ones provided regardless of case, keyed by their language id
+        and lowercased word. Words are compared lowercased by the database, so the lookup uses `word_user_language_word_idx`.
+        """
+
+        words = Word.objects.alias(word_lower=Lower('word')).filter(user=self.user, word_lower__in=[Lower(Value(word)) for word in set(words)])
+
+        return {(language_id, word.lower()): pk for pk, language_id, word in words.values_list('pk', 'word_language_id', 'word')}
+
+    def check_duplicates(self, words: list, originals: list, errors: list):
+        """Adds errors to words that would repeat another word of the language, stored or in the batch"""
+
+        valid_words = [word for word, item_errors in zip(words, errors) if word is not None and not item_errors]
+        taken = self.existing_words([word.word for word in valid_words])
+
+        for word, original, item_errors in zip(words, originals, errors):
+            if word is None or item_errors:
+                continue
+
+            key = (word.word_language_id, word.word.lower())
+
+            if taken.get(key, word.pk) != word.pk:
+                item_errors['word'] = "That word already exists!"
+                continue
+
+            if original is not None:
+                old_key = (original['word_language_id'], original['word'].lower())
+
+                if taken.get(old_key) == word.pk:
+                    del taken[old_key]
+
+            # Words created in the batch do not have ids yet, but take their spelling
+            taken[key] = word.pk or -1
+
+    def check_languages(self, words: list, originals: list, errors: list):
+        """Adds errors to words that would be moved to the language of one of their translations"""
+
+        moved_words = [
+            word for word, original, item_errors in zip(words, originals, errors)
+            if word is not None and not item_errors and original['word_language_id'] != word.word_language_id
+        ]
+
+        translations = Translation.objects.filter(word_id__in=[word.pk for word in moved_words])
+        translation_languages = set(translations.values_list('word_id', 'translation_language_id'))
+
+        for word, item_errors in zip(words, errors):
+            if word is not None and not item_errors and (word.pk, word.word_language_id) in translation_languages:
+                item_errors['word_language'] = "Word's language and translation's language cannot be the same!"
+
+    def create(self, items: list) -> list:
+        words, errors = self.new_instances(items)
+        self.check_duplicates(words, [None] * len(words), errors)
+
+        new_words = Word.objects.bulk_create([word for word, item_errors in zip(words, errors) if not item_errors])
+
+        reviews.add_words(new_words)
+
+        word_counts = defaultdict(int)
+        for word in new_words:
+            word_counts[word.word_language_id] += 1
+
+        counters.change_counts(words=word_counts)
+
+        return self.results(words, errors, CREATED)
+
+    def update(self, items: list) -> list:
+        words, originals, errors = self.changed_instances(items)
+        self.check_duplicates(words, originals, errors)
+        self.check_languages(words, originals, errors)
+
+        changed_words = []
+        word_counts = defaultdict(int)
+
+        for word, original, item_errors in zip(words, originals, errors):
+            if not item_errors:
+                changed_words.append(word)
+                add_changes(word_counts, counters.moved(original['word_language_id'], word.word_language_id))
+
+        Word.objects.bulk_update(changed_words, self.update_fields)
+        counters.change_counts(words=word_counts)
+
+        return self.results(words, errors, UPDATED)
+
+    def delete(self, ids: list) -> list:
+        deleted_ids = delete_words(self.queryset().filter(pk__in=[pk for pk in ids if is_id(pk)]))
+
+        return self.deleted_results(ids, deleted_ids)
+
+
+class HintBatch(BatchWriter):
+    """Batches of hints of user's words"""
+
+    model = Hint
+    fields = ['word', 'hint']
+
+    def choices(self, field: str):
+        return self.words
+
+    def load_related(self, items: list, instances: list):
+        """Loads ids of user's words the items point to"""
+
+        word_ids = [item.get('word') for item in items if isinstance(item, dict) and is_id(item.get('word'))]
+
+        self.words = set(Word.objects.filter(user=self.user, pk__in=word_ids).values_list('pk', flat=True))
+
+    def create(self, items: list) -> list:
+        hints, errors = self.new_instances(items)
+
+        Hint.objects.bulk_create([hint for hint, item_errors in zip(hints, errors) if not item_errors])
+
+        return self.results(hints, errors, CREATED)
+
+    def update(self, items: list) -> list:
+        hints, _, errors = self.changed_instances(items)
+
+        Hint.objects.bulk_update([hint for hint, item_errors in zip(hints, errors) if not item_errors], self.update_fields)
+
+        return self.results(hints, errors, UPDATED)
+
+    def delete(self, ids: list) -> list:
+        deleted_ids = delete_hints(self.queryset().filter(pk__in=[pk for pk in ids if is_id(pk)]))
+
+        return self.deleted_results(ids, deleted_ids)
+
+
+class TranslationBatch(BatchWriter):
+    """Batches of translations of user's words, which cannot be translated to their own language"""
+
+    model = Translation
+    fields = ['word', 'translation_language', 'translation']
+
+    def load(self):
+        self.languages = set(Language.objects.filter(user=self.user).values_list('pk', flat=True))
+
+    def choices(self, field: str):
+        return self.words if field == 'word' else self.languages
+
+    def load_related(self, items: list, instances: list):
+        """Loads languages of user's words the items and the translations they change point to, keyed by word ids"""
+
+        word_ids = [item.get('word') for item in items if isinstance(item, dict) and is_id(item.get('word'))]
+        word_ids += [translation.word_id for translation in instances]
+
+        self.words = dict(Word.objects.filter(user=self.user, pk__in=word_ids).values_list('pk', 'word_language_id'))
+
+    def check_languages(self, translations: list, errors: list):
+        for translation, item_errors in zip(translations, errors):
+            if translation is not None and not item_errors and self.words[translation.word_id] == translation.translation_language_id:
+                item_errors['translation_language'] = "Word's language and translation's language cannot be the same!"
+
+    def create(self, items: list) -> list:
+        translations, errors = self.new_instances(items)
+        self.check_languages(translations, errors)
+
+        new_translations = Translation.objects.bulk_create([translation for translation, item_errors in zip(translations, errors) if not item_errors])
+
+        translation_counts = defaultdict(int)
+        for translation in new_translations:
+            translation_counts[translation.translation_language_id] += 1
+
+        counters.change_counts(translations=translation_counts)
+
+        return self.results(translations, errors, CREATED)
+
+    def update(self, items: list) -> list:
+        translations, originals, errors = self.changed_instances(items)
+        self.check_languages(translations, errors)
+
+        changed_translations = []
+        translation_counts = defaultdict(int)
+
+        for translation, original, item_errors in zip(translations, originals, errors):
+            if not item_errors:
+                changed_translations.append(translation)
+                add_changes(translation_counts, counters.moved(original['translation_language_id'], translation.translation_language_id))
+
+        Translation.objects.bulk_update(changed_translations, self.update_fields)
+        counters.change_counts(translations=translation_counts)
+
+        return self.results(translations, errors, UPDATED)
+
+    def delete(self, ids: list) -> list:
+        deleted_ids = delete_translations(self.queryset().filter(pk__in=[pk for pk in ids if is_id(pk)]))
+
+        return self.deleted_results(ids, deleted_ids)
+
+
+# Batch writers of the models exposed by the API, keyed by the names used in URLs
+BATCHES = {
+    'languages': LanguageBatch,
+    'words': WordBatch,
+    'hints': HintBatch,
+    'translations': TranslationBatch,
+}
@@ -0,0 +1,155 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .generators import SYLLABLES, DictionaryGenerator
+from .importers import IMPORT_COLUMNS
+from .jobs import run_import_job
+from .models import ImportJob, Language, Word
+
+import numpy as np
+import random
+import time
+
+
+# Scenarios measured for every dictionary size, in the order they are run
+SCENARIOS = ['index', 'words_list', 'search_words', 'word_detail', 'add_words_from_file', 'delete_language']
+
+# Percentiles of request latencies reported
+PERCENTILES = [50, 90, 99]
+
+# Number of rows in every file imported and of words in every language deleted
+IMPORT_ROWS = 100
+DELETED_WORDS = 100
+
+
+class Benchmark:
+    """
+    Measures latencies and numbers of queries of the dictionary views for a user with a generated dictionary.
+
+    Every scenario sends `iterations` requests through the test client. Requests are prepared outside
+    the measured time, eg. a language is created before it is deleted, and scenarios that add words
+    remove them afterwards, so the dictionary is the same for every run.
+    """
+
+    def __init__(self, user, iterations: int, seed: int = 0):
+        self.user = user
+        self.iterations = iterations
+        self.random = random.Random(seed)
+        self.generator = DictionaryGenerator(seed)
+        self.client = Client()
+        self.client.force_login(user)
+        self.word_ids = list(Word.objects.filter(user=user).values_list('pk', flat=True))
+
+    def run(self, scenarios: list = None) -> dict:
+        """Returns statistics of every scenario, keyed by the scenario's name"""
+
+        return {name: getattr(self, f'measure_{ name }')() for name in scenarios or SCENARIOS}
+
+    def measure(self, request, prepare=None) -> dict:
+        """
+        Calls `request` with the arguments returned by `prepare` for every iteration.
+        Returns latency percentiles in milliseconds and the number of queries of the slowest request.
+        """
+
+        durations = []
+        query_counts = []
+
+        for _ in range(self.iterations):
+            args = prepare() if prepare else ()
+
+            with CaptureQueriesContext(connection) as queries:
+                started_at = time.perf_counter()
+                response = request(*args)
+                durations.append((time.perf_counter() - started_at) * 1000)
+
+            if response.status_code >= 400:
+                raise RuntimeError(f"Request has failed with the status { response.status_code }")
+
+            query_counts.append(len(queries))
+
+        return {
+            **{f'p{ percentile }': round(float(value), 2) for percentile, value in zip(PERCENTILES, np.percentile(durations, PERCENTILES))},
+            'mean': round(float(np.mean(durations)), 2),
+            'queries': max(query_counts),
+        }
+
+    def measure_index(self) -> dict:
+        return self.measure(lambda: self.client.get(reverse('dictionary:index')))
+
+    def measure_words_list(self) -> dict:
+        return self.measure(lambda: self.client.get(reverse('dictionary:words_list')))
+
+    def measure_search_words(self) -> dict:
+        return self.measure(
+            lambda query: self.client.get(reverse('dictionary:words_search'), {'word': query}),
+            lambda: (self.random.choice(SYLLABLES),),
+        )
+
+    def measure_word_detail(self) -> dict:
+        return self.measure(
+            lambda word_id: self.client.get(reverse('dictionary:word_detail', args=[word_id])),
+            lambda: (self.random.choice(self.word_ids),),
+        )
+
+    def measure_add_words_from_file(self) -> dict:
+        def prepare():
+            rows = [','.join(IMPORT_COLUMNS)] + [
+                f'{ self.generator.text(1, 4) },Benchmark,{ self.generator.text(3, 6) },{ self.generator.text(2, 4) },{ self.generator.text(1, 4) },English'
+                for _ in range(IMPORT_ROWS)
+            ]
+
+            return (SimpleUploadedFile('words.csv', '\n'.join(rows).encode('utf-8')),)
+
+        def request(file):
+            # The upload and the import job are measured together
+            response = self.client.post(reverse('dictionary:add_words_from_file'), {'file': file})
+            run_import_job(ImportJob.objects.filter(user=self.user).latest('pk'))
+
+            return response
+
+        try:
+            return self.measure(request, prepare)
+
+        finally:
+            Language.objects.filter(user=self.user, language_name='Benchmark').delete()
+
+    def measure_delete_language(self) -> dict:
+        def prepare():
+            # Words are split between the language deleted and the one of their translations, removed afterwards
+            languages = [Language.objects.create(user=self.user, language_name=name) for name in ('Deleted', 'Deleted translations')]
+            self.generator.generate_batch(self.user, languages, DELETED_WORDS)
+
+            return (languages[0].pk,)
+
+        try:
+            return self.measure(lambda language_id: self.client.get(reverse('dictionary:delete_language', args=[language_id])), prepare)
+
+        finally:
+            Language.objects.filter(user=self.user, language_name='Deleted translations').delete()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compares benchmark results with the baseline ones. Returns descriptions of regressions: scenarios
+    whose median latency grew by more than `tolerance` or that make more queries.
+    """
+
+    regressions = []
+
+    for size, scenarios in results.items():
+        for name, stats in scenarios.items():
+            base = baseline.get(size, {}).get(name)
+
+            if base is None:
+                continue
+
+            if stats['p50'] > base['p50'] * (1 + tolerance):
+                regressions.append(f"{ name } ({ size } words): median latency { base['p50'] }ms -> { stats['p50'] }ms")
+
+            if stats['queries'] > base['queries']:
+                regressions.append(f"{ name } ({ size } words): { base['queries'] } -> { stats['queries'] } queries")
+
+    return regressions
@@ -0,0 +1,70 @@
+from collections import Counter
+
+from django.db.models import Case, Count, F, IntegerField, OuterRef, QuerySet, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Language, Translation, Word
+
+
+def change_counts(words: dict = None, translations: dict = None):
+    """
+    Adds the numbers provided, keyed by language ids, to the word and translation counters of the languages.
+    All counters are changed by a single query with `F()` expressions, so concurrent changes are not lost.
+    """
+
+    changes = {
+        field: {language_id: delta for language_id, delta in (deltas or {}).items() if delta}
+        for field, deltas in (('word_count', words), ('translation_count', translations))
+    }
+    changes = {field: deltas for field, deltas in changes.items() if deltas}
+
+    if not changes:
+        return
+
+    language_ids = set().union(*changes.values())
+
+    Language.objects.filter(pk__in=language_ids).update(**{
+        field: F(field) + Case(*[When(pk=language_id, then=Value(delta)) for language_id, delta in deltas.items()], default=Value(0))
+        for field, deltas in changes.items()
+    })
+
+
+def moved(old_language_id: int, new_language_id: int) -> dict:
+    """Returns the changes of counters of an instance moved from one language to another"""
+
+    return {} if old_language_id == new_language_id else {old_language_id: -1, new_language_id: 1}
+
+
+def translation_counts(translations: QuerySet) -> Counter:
+    """Returns the numbers of translations provided, keyed by their language ids"""
+
+    return Counter(dict(translations.order_by().values_list('translation_language').annotate(Count('pk'))))
+
+
+def actual_counts() -> dict:
+    """Returns subqueries that count words and translations of every language in the database"""
+
+    words = Word.objects.filter(word_language=OuterRef('pk')).order_by().values('word_language').annotate(count=Count('pk'))
+    translations = Translation.objects.filter(translation_language=OuterRef('pk')).order_by().values('translation_language').annotate(count=Count('pk'))
+
+    return {
+        'word_count': Coalesce(Subquery(words.values('count'), output_field=IntegerField()), 0),
+        'translation_count': Coalesce(Subquery(translations.values('count'), output_field=IntegerField()), 0),
+    }
+
+
+def recount(languages: QuerySet) -> int:
+    """
+    Recomputes the counters of the languages provided from the database, with one query for all of them.
+    Returns the number of languages whose counters were wrong.
+    """
+
+    counts = actual_counts()
+    wrong = languages.annotate(actual_words=counts['word_count'], actual_translations=counts['translation_count']).filter(
+        ~Q(word_count=F('actual_words')) | ~Q(translation_count=F('actual_translations'))
+    ).count()
+
+    if wrong:
+        languages.update(**counts)
+
+    return wrong
@@ -0,0 +1,187 @@
+from collections import Counter
+from typing import Callable
+
+from django.conf import settings as stg
+from django.db import transaction
+from django.db.models import QuerySet
+
+from . import autocomplete, fuzzy, quiz, summary, versions
+from .counters import change_counts, translation_counts
+from .models import Hint, Language, Review, Tombstone, Translation, Word
+
+import time
+
+
+# Models deleted along with words, from the leaves up
+WORD_DEPENDENTS = [Hint, Review, Translation]
+
+
+def add_tombstones(model, rows: list):
+    """
+    Records that instances of the model, given as pairs of id and user id, are deleted, so that sync clients
+    delete them as well. Clients delete hints and translations of words deleted themselves.
+    """
+
+    Tombstone.objects.bulk_create([Tombstone(user_id=user_id, model_name=model._meta.model_name, object_id=pk) for pk, user_id in rows])
+
+
+def delete_words(words: QuerySet) -> list:
+    """
+    Deletes the words provided with their dependents with raw DELETE queries, from the leaves up,
+    and changes counters of the languages. Returns ids of the words deleted. Must be called in a transaction.
+    """
+
+    rows = list(words.values_list('pk', 'word_language_id', 'user_id'))
+
+    if not rows:
+        return []
+
+    word_ids = [word_id for word_id, _, _ in rows]
+
+    # Translations of the words to other languages are not counted there anymore
+    deleted_translations = translation_counts(Translation.objects.filter(word_id__in=word_ids))
+
+    for model in WORD_DEPENDENTS:
+        queryset = model.objects.filter(word_id__in=word_ids)
+        queryset._raw_delete(queryset.db)
+
+    queryset = Word.objects.filter(pk__in=word_ids)
+    queryset._raw_delete(queryset.db)
+
+    change_counts(
+        words={language_id: -count for language_id, count in Counter(language_id for _, language_id, _ in rows).items()},
+        translations={language_id: -count for language_id, count in deleted_translations.items()},
+    )
+    add_tombstones(Word, [(word_id, user_id) for word_id, _, user_id in rows])
+
+    return word_ids
+
+
+def delete_translations(translations: QuerySet) -> list:
+    """
+    Deletes the translations provided with a raw DELETE query and changes counters of their languages.
+    Returns ids of the translations deleted. Must be called in a transaction.
+    """
+
+    rows = list(translations.values_list('pk', 'translation_language_id', 'user_id'))
+
+    if not rows:
+        return []
+
+    translation_ids = [translation_id for translation_id, _, _ in rows]
+
+    queryset = Translation.objects.filter(pk__in=translation_ids)
+    queryset._raw_delete(queryset.db)
+
+    change_counts(translations={language_id: -count for language_id, count in Counter(language_id for _, language_id, _ in rows).items()})
+    add_tombstones(Translation, [(translation_id, user_id) for translation_id, _, user_id in rows])
+
+    return translation_ids
+
+
+def delete_hints(hints: QuerySet) -> list:
+    """Deletes the hints provided with a raw DELETE query. Returns ids of the hints deleted. Must be called in a transaction."""
+
+    rows = list(hints.values_list('pk', 'user_id'))
+
+    if not rows:
+        return []
+
+    queryset = Hint.objects.filter(pk__in=[hint_id for hint_id, _ in rows])
+    queryset._raw_delete(queryset.db)
+
+    add_tombstones(Hint, rows)
+
+    return [hint_id for hint_id, _ in rows]
+
+
+def can_delete_in_request(language: Language) -> bool:
+    """
+    Returns whether the language is deleted while the request waits: it has at most `DELETION_SYNC_LIMIT` words
+    and translations to it, which are all rows deleted in batches along with it.
+    """
+
+    return language.word_count + language.translation_count <= stg.DELETION_SYNC_LIMIT
+
+
+class LanguageDeleter:
+    """
+    Deletes a language with its words, their hints and translations, and translations to the language.
+
+    Unlike `Language.delete()`, rows are not loaded to memory: they are removed with raw DELETE queries
+    in batches of `batch_size` words or translations, from the leaves up, each batch in its own short
+    transaction. The database is not locked for longer than a batch takes, so other users can write
+    in between, and the deletion can be stopped between batches if `is_cancelled()` returns True.
+
+    Raw deletes do not send signals, so language counters are changed with every batch, and summaries,
+    versions and indexes of the user are invalidated once the deletion stops.
+    """
+
+    def __init__(self, language: Language, batch_size: int = None, pause: float = None,
+                 on_progress: Callable[[int, int], None] = None, is_cancelled: Callable[[], bool] = None):
+        self.language = language
+        self.batch_size = batch_size or stg.DELETION_BATCH_SIZE
+        self.pause = stg.DELETION_BATCH_PAUSE if pause is None else pause
+        self.on_progress = on_progress
+        self.is_cancelled = is_cancelled
+
+        # Counters are only used to report the progress, they are not relied upon to find rows
+        self.total = language.word_count + language.translation_count
+        self.deleted = 0
+
+    def run(self) -> bool:
+        """Deletes the language. Returns True if it was deleted, False if the deletion was cancelled."""
+
+        try:
+            for delete_batch in (self._delete_words, self._delete_translations):
+                while True:
+                    if self.is_cancelled and self.is_cancelled():
+                        return False
+
+                    deleted = delete_batch()
+
+                    if not deleted:
+                        break
+
+                    self.deleted += deleted
+                    self._report_progress()
+
+                    if self.pause:
+                        time.sleep(self.pause)
+
+            # Nothing depends on the language anymore, so the collector does not load any rows
+            with transaction.atomic():
+                self.language.delete()
+
+            return True
+
+        finally:
+            # Data derived from the rows deleted is not rebuilt before they are committed, if the deleter runs in a transaction
+            transaction.on_commit(self._invalidate)
+
+    def _delete_words(self) -> int:
+        """Deletes a batch of the language's words with their dependents. Returns the number of words deleted."""
+
+        with transaction.atomic():
+            return len(delete_words(Word.objects.filter(word_language=self.language).order_by()[:self.batch_size]))
+
+    def _delete_translations(self) -> int:
+        """Deletes a batch of translations to the language. Returns the number of translations deleted."""
+
+        with transaction.atomic():
+            return len(delete_translations(Translation.objects.filter(translation_language=self.language).order_by()[:self.batch_size]))
+
+    def _report_progress(self):
+        if self.on_progress:
+            self.on_progress(self.deleted, max(self.total, self.deleted))
+
+    def _invalidate(self):
+        """Drops data of the user derived from the rows deleted"""
+
+        user = self.language.user
+
+        summary.invalidate(user)
+        versions.bump(user.pk)
+        fuzzy.invalidate(user)
+        autocomplete.invalidate(user)
+        quiz.invalidate(user)
@@ -0,0 +1,127 @@
+from collections import defaultdict
+
+from django.conf import settings as stg
+
+from .importers import IMPORT_COLUMNS, PARQUET_SUPPORTED, pa, pq
+from .models import Hint, Language, Translation, Word
+from .utils import OutputChunksStream
+
+import csv
+import io
+import json
+
+
+# Exported files can be imported back
+EXPORT_COLUMNS = IMPORT_COLUMNS
+
+# Formats words can be exported to, with their content types
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/jsonl; charset=utf-8',
+}
+
+if PARQUET_SUPPORTED:
+    EXPORT_FORMATS['parquet'] = 'application/vnd.apache.parquet'
+
+
+class WordsExporter:
+    """
+    Exports words of a single user with their hints and translations, following the `EXPORT_COLUMNS` schema.
+
+    Words are read with a server-side iterator in chunks of `chunk_size` words, and hints and translations
+    of every chunk are loaded with one query each, so the export runs in constant memory and starts
+    producing rows right away. Every hint and translation of a word is exported in a row that repeats the word,
+    which the importer adds to the word of the row above.
+    """
+
+    def __init__(self, user, chunk_size: int = None):
+        self.user = user
+        self.chunk_size = chunk_size or stg.EXPORT_CHUNK_SIZE
+
+    def batches(self):
+        """Yields lists of rows of up to `self.chunk_size` words, each row being a tuple of `EXPORT_COLUMNS` values"""
+
+        languages = dict(Language.objects.filter(user=self.user).values_list('id', 'language_name'))
+        words = Word.objects.filter(user=self.user).order_by('pk').values_list('id', 'word', 'word_language_id', 'description')
+        batch = []
+
+        for word in words.iterator(chunk_size=self.chunk_size):
+            batch.append(word)
+
+            if len(batch) == self.chunk_size:
+                yield self._join(batch, languages)
+                batch = []
+
+        if batch:
+            yield self._join(batch, languages)
+
+    def csv(self):
+        """Yields the .csv file with the header, one chunk of rows at a time"""
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+
+        for batch in self.batches():
+            writer.writerows(batch)
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+        # The header is returned even if there are no words
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def jsonl(self):
+        """Yields JSON Lines with an object per word, keyed by `EXPORT_COLUMNS`, one chunk of rows at a time"""
+
+        for batch in self.batches():
+            yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n' for row in batch)
+
+    def parquet(self):
+        """Yields the .parquet file with a row group per chunk of rows. Requires `pyarrow`."""
+
+        schema = pa.schema([(column, pa.string()) for column in EXPORT_COLUMNS])
+        stream = OutputChunksStream()
+
+        with pq.ParquetWriter(stream, schema) as writer:
+            for batch in self.batches():
+                columns = [pa.array(values, type=pa.string()) for values in zip(*batch)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+                yield stream.pop()
+
+        # Footer is written when the writer is closed
+        yield stream.pop()
+
+    def _join(self, words: list, languages: dict) -> list:
+        """
+        Returns rows of the words provided, joined with their hints and translations. A word has as many rows
+        as it has hints or translations, whichever are more, and once either of them runs out its last one is repeated.
+        """
+
+        # Words are ordered by id, so hints and translations of the chunk are selected by a range of ids
+        related = {'user': self.user, 'word_id__gte': words[0][0], 'word_id__lte': words[-1][0]}
+        hints = defaultdict(list)
+        translations = defaultdict(list)
+
+        for word_id, hint in Hint.objects.filter(**related).order_by('pk').values_list('word_id', 'hint'):
+            hints[word_id].append(hint)
+
+        for word_id, translation, language_id in Translation.objects.filter(**related).order_by('pk').values_list('word_id', 'translation', 'translation_language_id'):
+            translations[word_id].append((translation, languages.get(language_id)))
+
+        rows = []
+
+        for word_id, word, language_id, description in words:
+            word_hints = hints.get(word_id, [None])
+            word_translations = translations.get(word_id, [(None, None)])
+
+            for i in range(max(len(word_hints), len(word_translations))):
+                hint = word_hints[min(i, len(word_hints) - 1)]
+                translation = word_translations[min(i, len(word_translations) - 1)]
+
+                rows.append((word, languages.get(language_id), description, hint, *translation))
+
+        return rows
@@ -1,9 +1,15 @@
-from django.forms import CharField, ModelForm, Form, FileField
+from django.forms import BooleanField, CharField, ModelForm, Form, FileField, TextInput, TypedChoiceField
 from django.core.validators import FileExtensionValidator
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.urls import reverse_lazy
+from django.conf import settings as stg
 
 from dictionary.validators import FileSizeValidator
 
+from .importers import IMPORT_EXTENSIONS
 from .models import Word, Hint, Translation, Language
+from .reviews import GRADES
 
 
 class WordForm(ModelForm):
@@ -15,6 +21,9 @@ class WordForm(ModelForm):
     class Meta:
         model = Word
         fields = ['word', 'word_language', 'description']
+        widgets = {
+            'word': TextInput(attrs={'autocomplete': 'off', 'data-autocomplete-url': reverse_lazy('dictionary:words_autocomplete')}),
+        }
 
     def clean(self):
         """Function that validates that the user cannot create a word that already exists"""
@@ -25,12 +34,11 @@ class WordForm(ModelForm):
 
         # Only do something if field is valid so far
         if word:
-            try:
-                Word.objects.get(user=self.current_user, word__iexact=word, word_language=word_language)
-                self.add_error('word', "That word already exists!")
+            # Comparing lowercased values lets the database use `word_user_language_word_idx`
+            words = Word.objects.alias(word_lower=Lower('word'))
 
-            except Word.DoesNotExist:
-                pass
+            if words.filter(user=self.current_user, word_lower=Lower(Value(word)), word_language=word_language).exists():
+                self.add_error('word', "That word already exists!")
 
         return cleaned_data
 
@@ -68,25 +76,30 @@ class LanguageForm(ModelForm):
 
         # Only do something if field is valid so far
         if language_name:
-            try:
-                Language.objects.get(user=self.current_user, language_name__iexact=language_name)
-                self.add_error('language_name', "Language with that name already exists!")
+            # Comparing lowercased values lets the database use `language_user_name_idx`
+            languages = Language.objects.alias(language_name_lower=Lower('language_name'))
 
-            except Language.DoesNotExist:
-                pass
+            if languages.filter(user=self.current_user, language_name_lower=Lower(Value(language_name))).exists():
+                self.add_error('language_name', "Language with that name already exists!")
 
         return cleaned_data
 
 
 class DictionaryFileForm(Form):
     file = FileField(
-        help_text='You must provide a valid .csv file that is no larger than 5MB',
+        help_text=f"You must provide a valid { ' or '.join(f'.{ extension }' for extension in IMPORT_EXTENSIONS) } file "
+                  f"that is no larger than { stg.IMPORT_MAX_FILE_SIZE // 1_000_000 }MB",
         validators=[
-            FileExtensionValidator(allowed_extensions=['csv']),
-            FileSizeValidator(max_size=2_500_000),
+            FileExtensionValidator(allowed_extensions=IMPORT_EXTENSIONS),
+            FileSizeValidator(max_size=stg.IMPORT_MAX_FILE_SIZE),
         ],
     )
 
 
 class SearchForm(Form):
-    word = CharField(max_length=150)
\ No newline at end of file
+    word = CharField(max_length=150)
+    fuzzy = BooleanField(required=False)
+
+
+class ReviewForm(Form):
+    grade = TypedChoiceField(choices=GRADES, coerce=int)
@@ -0,0 +1,153 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings as stg
+
+from .models import Translation, Word
+from .utils import UserIndexRegistry
+
+import heapq
+import re
+import threading
+
+
+def trigrams(text: str) -> frozenset:
+    """Returns trigrams of every word in the text, padded with spaces the way PostgreSQL `pg_trgm` does"""
+
+    result = set()
+
+    for token in re.findall(r'\w+', text.lower()):
+        padded = f'  { token } '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    return frozenset(result)
+
+
+def similarity(first: frozenset, second: frozenset) -> float:
+    """Returns the share of trigrams the two sets have in common"""
+
+    if not first or not second:
+        return 0.0
+
+    shared = len(first & second)
+
+    return shared / (len(first) + len(second) - shared)
+
+
+class TrigramIndex:
+    """
+    In-memory trigram index of user's words and their translations.
+
+    Every trigram points to the words that contain it, so a search only scores the words that share
+    enough trigrams with the query to reach the similarity threshold instead of scanning all of them.
+    Words are changed in place as they are edited, searches and changes of one index hold its `lock`.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._texts = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._texts)
+
+    def set_word(self, word_id: int, texts: list):
+        """Indexes the word provided by its texts, eg. the word itself and its translations, replacing older ones"""
+
+        self.remove_word(word_id)
+
+        texts_trigrams = [trigrams(text) for text in texts if text]
+        self._texts[word_id] = texts_trigrams
+
+        for trigram in frozenset().union(*texts_trigrams):
+            self._postings[trigram].add(word_id)
+
+    def remove_word(self, word_id: int):
+        """Removes the word provided from the index"""
+
+        for trigram in frozenset().union(*self._texts.pop(word_id, [])):
+            word_ids = self._postings[trigram]
+            word_ids.discard(word_id)
+
+            if not word_ids:
+                del self._postings[trigram]
+
+    def search(self, query: str, limit: int, threshold: float) -> list:
+        """Returns up to `limit` pairs of word id and similarity, from the closest word, ignoring words below the threshold"""
+
+        query_trigrams = trigrams(query)
+
+        if not query_trigrams:
+            return []
+
+        shared_counts = Counter()
+
+        for trigram in query_trigrams:
+            shared_counts.update(self._postings.get(trigram, ()))
+
+        # Similarity cannot be higher than the share of query's trigrams a word has
+        min_shared = threshold * len(query_trigrams)
+
+        scores = []
+
+        for word_id, shared in shared_counts.items():
+            if shared < min_shared:
+                continue
+
+            score = max(similarity(query_trigrams, text_trigrams) for text_trigrams in self._texts[word_id])
+
+            if score >= threshold:
+                scores.append((score, word_id))
+
+        return [(word_id, score) for score, word_id in heapq.nlargest(limit, scores)]
+
+
+def build_index(user) -> TrigramIndex:
+    """Builds the trigram index of the user's words and translations"""
+
+    texts = defaultdict(list)
+
+    for word_id, word in Word.objects.filter(user=user).values_list('id', 'word').iterator():
+        texts[word_id].append(word)
+
+    for word_id, translation in Translation.objects.filter(user=user).values_list('word_id', 'translation').iterator():
+        texts[word_id].append(translation)
+
+    index = TrigramIndex()
+
+    for word_id, word_texts in texts.items():
+        index.set_word(word_id, word_texts)
+
+    return index
+
+
+indexes = UserIndexRegistry(build_index, 'FUZZY_INDEX_TIMEOUT', 'FUZZY_INDEX_MAX_USERS')
+
+
+def fuzzy_search(user, query: str) -> list:
+    """Returns ids of up to `FUZZY_SEARCH_RESULTS` user's words closest to the query, from the closest one"""
+
+    index = indexes.get(user)
+
+    # Searches of other users do not wait for this one
+    with index.lock:
+        results = index.search(query, stg.FUZZY_SEARCH_RESULTS, stg.FUZZY_SEARCH_THRESHOLD)
+
+    return [word_id for word_id, _ in results]
+
+
+def index_word(word: Word, translations: list):
+    """Updates the word in the user's index, if the index is built"""
+
+    indexes.update(word.user_id, lambda index: index.set_word(word.pk, [word.word, *translations]))
+
+
+def remove_word(user, word_id: int):
+    """Removes the word from the user's index, if the index is built"""
+
+    indexes.update(user.pk, lambda index: index.remove_word(word_id))
+
+
+def invalidate(user=None):
+    """Drops the index of the user provided, or indexes of all users, so that they are built again"""
+
+    indexes.invalidate(user)
@@ -0,0 +1,123 @@
+from django.conf import settings as stg
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .counters import change_counts
+from .reviews import add_words
+from .models import Hint, Language, Translation, Word
+
+from collections import Counter
+
+import random
+
+
+# Words are made of syllables, so that generated dictionaries can be searched like real ones
+SYLLABLES = [
+    'ba', 'be', 'bi', 'bo', 'bu', 'da', 'de', 'di', 'do', 'ka', 'ke', 'ki', 'ko', 'la', 'le', 'li', 'lo', 'lu',
+    'ma', 'me', 'mi', 'mo', 'na', 'ne', 'ni', 'no', 'pa', 'pe', 'po', 'ra', 're', 'ri', 'ro', 'sa', 'se', 'si',
+    'so', 'ta', 'te', 'ti', 'to', 'va', 've', 'vi', 'za', 'zo', 'sh', 'ch', 'st', 'tr', 'an', 'en', 'in', 'on',
+]
+
+LANGUAGE_NAMES = [
+    'English', 'Russian', 'German', 'French', 'Spanish', 'Italian', 'Portuguese', 'Polish', 'Czech', 'Dutch',
+    'Swedish', 'Norwegian', 'Finnish', 'Greek', 'Turkish', 'Japanese', 'Chinese', 'Korean', 'Arabic', 'Hebrew',
+]
+
+
+class DictionaryGenerator:
+    """
+    Generates synthetic dictionaries: languages, and words with their hints and translations,
+    the same way they are added through the forms.
+
+    Values are drawn from a random generator seeded with `seed`, so the same arguments always produce
+    the same dictionary. Instances are saved with `bulk_create` in batches of `batch_size` words,
+    each batch in its own transaction.
+    """
+
+    def __init__(self, seed: int = 0, batch_size: int = None, hints: int = 1, translations: int = 1):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size or stg.IMPORT_BATCH_SIZE
+        self.hints = hints
+        self.translations = translations
+
+    def text(self, min_syllables: int, max_syllables: int) -> str:
+        """Returns a pseudo-word of a random number of syllables"""
+
+        return ''.join(self.random.choices(SYLLABLES, k=self.random.randint(min_syllables, max_syllables)))
+
+    def generate(self, user, languages: int, words: int) -> dict:
+        """Creates the languages and the words provided for the user. Returns the numbers of instances created."""
+
+        user_languages = self.generate_languages(user, languages)
+
+        return {'languages': len(user_languages), **self.generate_words(user, user_languages, words)}
+
+    def generate_languages(self, user, count: int) -> list:
+        """Creates `count` languages for the user, at least two of them"""
+
+        # A word and its translations are always in different languages
+        names = [
+            LANGUAGE_NAMES[i] if i < len(LANGUAGE_NAMES) else f'{ self.text(2, 3).capitalize() } { i }'
+            for i in range(max(count, 2))
+        ]
+
+        with transaction.atomic():
+            return Language.objects.bulk_create([Language(user=user, language_name=name) for name in names])
+
+    def generate_words(self, user, languages: list, count: int) -> dict:
+        """Creates `count` words in the user's languages provided. Returns the numbers of instances created."""
+
+        for start in range(0, count, self.batch_size):
+            self.generate_batch(user, languages, min(self.batch_size, count - start))
+
+        return {'words': count, 'hints': count * self.hints, 'translations': count * self.translations}
+
+    def generate_batch(self, user, languages: list, size: int):
+        """Creates `size` words with their hints and translations, scheduled to be reviewed"""
+
+        new_words = []
+        translation_languages = []
+
+        for _ in range(size):
+            word_language = self.random.choice(languages)
+            other_languages = [language for language in languages if language.pk != word_language.pk]
+
+            new_words.append(Word(
+                user_id=user.pk,
+                word=self.text(1, 4).capitalize(),
+                word_language_id=word_language.pk,
+                description=' '.join(self.text(1, 3) for _ in range(self.random.randint(3, 8))).capitalize(),
+            ))
+            translation_languages.append([language.pk for language in self.random.choices(other_languages, k=self.translations)])
+
+        # Related instances are given ids rather than instances, which is noticeably faster for millions of rows
+        with transaction.atomic():
+            new_words = Word.objects.bulk_create(new_words)
+
+            Hint.objects.bulk_create([
+                Hint(word_id=word.pk, user_id=user.pk, hint=self.text(2, 5).capitalize())
+                for word in new_words for _ in range(self.hints)
+            ])
+            Translation.objects.bulk_create([
+                Translation(word_id=word.pk, user_id=user.pk, translation_language_id=language_id, translation=self.text(1, 4).capitalize())
+                for word, language_ids in zip(new_words, translation_languages)
+                for language_id in language_ids
+            ])
+            add_words(new_words)
+
+            change_counts(
+                words=Counter(word.word_language_id for word in new_words),
+                translations=Counter(language_id for language_ids in translation_languages for language_id in language_ids),
+            )
+
+
+def generate_words_chunk(user_id: int, language_ids: list, count: int, seed: int, batch_size: int, hints: int, translations: int) -> dict:
+    """
+    Creates `count` words of the user with the generator seeded with `seed`. Runs in worker processes
+    of `generate_dictionaries`, so it is given ids rather than instances.
+    """
+
+    languages = list(Language.objects.filter(pk__in=language_ids).order_by('pk'))
+    generator = DictionaryGenerator(seed, batch_size, hints, translations)
+
+    return generator.generate_words(User(pk=user_id), languages, count)
@@ -0,0 +1,341 @@
+from collections import Counter
+from typing import Callable, Iterable
+
+from django.conf import settings as stg
+from django.core.files import File
+from django.db import transaction
+
+from .counters import change_counts
+from .models import Hint, Language, Translation, Word
+from .reviews import add_words
+from .utils import UploadedFileStream
+
+import io
+import pandas as pd
+
+# Parquet files are supported if `pyarrow` is installed
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+except ImportError:
+    pa = pq = None
+
+
+# Different schemas could be added in the future
+IMPORT_COLUMNS = ['Word', 'WordLanguage', 'Description', 'Hint', 'Translation', 'TranslationLanguage']
+
+PARQUET_SUPPORTED = pq is not None
+
+# Extensions of the files words can be imported from
+IMPORT_EXTENSIONS = ['csv', 'parquet'] if PARQUET_SUPPORTED else ['csv']
+
+
+def read_csv_chunks(file: File, chunksize: int) -> Iterable[pd.DataFrame]:
+    """
+    Parses the .csv file incrementally, yielding data frames of `chunksize` rows.
+    The file is read through `file.chunks()`, so it is never loaded in memory as a whole.
+    """
+
+    stream = io.BufferedReader(UploadedFileStream(file))
+
+    # Values are read as text, so that numbers are not converted
+    with pd.read_csv(stream, dtype=str, chunksize=chunksize) as reader:
+        yield from reader
+
+
+def read_parquet_chunks(file: File, chunksize: int) -> Iterable[pd.DataFrame]:
+    """
+    Reads the .parquet file incrementally, yielding data frames of `chunksize` rows.
+    Columns are decoded by `pyarrow` as they are stored, without parsing text.
+    """
+
+    parquet_file = pq.ParquetFile(file)
+    offset = 0
+
+    for batch in parquet_file.iter_batches(batch_size=chunksize):
+        df = batch.to_pandas()
+
+        # Rows are numbered through the whole file, the same way as .csv chunks are
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+
+        yield df
+
+
+class WordsImporter:
+    """
+    Imports words, hints and translations of a single user from data frames, .csv or .parquet files
+    that follow the `IMPORT_COLUMNS` schema.
+
+    Rows are validated with vectorized passes over every chunk, languages are resolved
+    once per import with a case-insensitive map and instances are saved with batched
+    `bulk_create`, so the number of queries depends on the number of batches only.
+    """
+
+    # Columns that are stored in length-limited model fields
+    max_lengths = {
+        'Word': Word._meta.get_field('word').max_length,
+        'WordLanguage': Language._meta.get_field('language_name').max_length,
+        'Hint': Hint._meta.get_field('hint').max_length,
+        'Translation': Translation._meta.get_field('translation').max_length,
+        'TranslationLanguage': Language._meta.get_field('language_name').max_length,
+    }
+
+    def __init__(self, user, batch_size: int = None, max_reported_errors: int = 20, on_progress: Callable[[int, int], None] = None,
+                 start: int = 0):
+        self.user = user
+        self.batch_size = batch_size or stg.IMPORT_BATCH_SIZE
+        self.max_reported_errors = max_reported_errors
+        self.on_progress = on_progress
+        self.start = start
+        self.errors = []
+        self.error_count = 0
+        self.total = 0
+        self.created = start
+        self._languages = None
+        # Key of the word of the last row saved, the word, and its hints and translations
+        self._last_word = None
+
+    def run(self, df: pd.DataFrame) -> bool:
+        """
+        Validates and saves the data frame provided. Returns True if all rows were imported,
+        False otherwise. Nothing is saved if any of the rows is invalid.
+        """
+
+        return self.run_chunks(lambda: [df])
+
+    def run_csv(self, file: File) -> bool:
+        """
+        Validates and saves the .csv file provided, which is streamed through `file.chunks()`
+        and parsed in chunks of `self.batch_size` rows.
+        """
+
+        return self.run_chunks(lambda: read_csv_chunks(file, self.batch_size))
+
+    def run_parquet(self, file: File) -> bool:
+        """
+        Validates and saves the .parquet file provided, which is read in batches of `self.batch_size` rows.
+        Requires `pyarrow`.
+        """
+
+        return self.run_chunks(lambda: read_parquet_chunks(file, self.batch_size))
+
+    def run_chunks(self, read_chunks: Callable[[], Iterable[pd.DataFrame]]) -> bool:
+        """
+        Validates and saves data frames yielded by `read_chunks()`. Returns True if all rows were imported,
+        False otherwise.
+
+        `read_chunks` is called twice: the first pass validates every chunk and collects language names,
+        the second one saves them, committing every `self.batch_size` rows. Only one chunk is held in memory
+        at a time and nothing is saved if any of the rows is invalid.
+
+        Progress is reported after every chunk of both passes, and in the transaction of every batch saved,
+        so the number of rows imported it reports is always the number of rows committed. An import resumed
+        with it as `start` skips those rows instead of saving them again.
+        """
+
+        language_names = {}
+
+        for chunk in read_chunks():
+            chunk = self.validate(chunk)
+            self.total += len(chunk)
+
+            if self.error_count and self.errors[0][0] is None:
+                # Schema is invalid, there is no point in checking rows
+                break
+
+            for language_name in pd.concat([chunk['WordLanguage'], chunk['TranslationLanguage']]).dropna().unique():
+                language_names.setdefault(language_name.lower(), language_name)
+
+            self._report_progress()
+
+        if self.error_count:
+            return False
+
+        with transaction.atomic():
+            self._resolve_languages(language_names.values())
+
+        self._report_progress()
+        rows_to_skip = self.start
+
+        for chunk in read_chunks():
+            # Rows committed by an earlier run are not saved again
+            skipped_rows = min(rows_to_skip, len(chunk))
+
+            if skipped_rows and skipped_rows == rows_to_skip:
+                # The first row saved may add a hint or a translation to the word of the last row committed
+                self._last_word = self._load_word(self.normalize(chunk.iloc[[skipped_rows - 1]]).iloc[0])
+
+            chunk = chunk.iloc[skipped_rows:]
+            rows_to_skip -= skipped_rows
+
+            if chunk.empty:
+                continue
+
+            chunk = self.normalize(chunk)
+
+            for start in range(0, len(chunk), self.batch_size):
+                with transaction.atomic():
+                    self._save_batch(chunk.iloc[start:start + self.batch_size])
+                    self._report_progress()
+
+        return True
+
+    def normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Returns the data frame with values normalized the way they are stored"""
+
+        # Every value is treated as text, missing values are kept as `None`
+        df = df.astype(str).where(df.notnull(), None)
+
+        # Values are stored capitalized, the same way as they are shown
+        return df.apply(lambda column: column.str.capitalize())
+
+    def validate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Checks the schema and the values of the data frame, collecting errors in `self.errors`.
+        Returns the data frame with normalized values.
+        """
+
+        schema = list(df.columns)
+
+        if schema != IMPORT_COLUMNS:
+            self.errors = [(None, f"File schema [{ ', '.join(map(str, schema)) }] is invalid! See help for more infornation.")]
+            self.error_count = 1
+            return df
+
+        df = self.normalize(df)
+        blank = df.isnull() | df.apply(lambda column: column.str.strip().eq(''))
+
+        for column in IMPORT_COLUMNS:
+            self._add_errors(blank[column], f"'{ column }' is empty")
+
+        for column, max_length in self.max_lengths.items():
+            self._add_errors(df[column].str.len() > max_length, f"'{ column }' is longer than { max_length } characters")
+
+        same_languages = df['WordLanguage'].str.lower() == df['TranslationLanguage'].str.lower()
+        self._add_errors(same_languages & ~blank['WordLanguage'], "word's language and translation's language cannot be the same")
+
+        # Only the errors that will be reported are kept, so that a broken file cannot exhaust memory
+        self.errors = sorted(self.errors)[:self.max_reported_errors]
+
+        return df
+
+    def error_messages(self) -> list:
+        """Returns human readable error messages, limited to `self.max_reported_errors`"""
+
+        messages = [
+            f"Row { row }: { message }!" if row is not None else message
+            for row, message in self.errors
+        ]
+
+        if self.error_count > len(self.errors):
+            messages.append(f"...and { self.error_count - len(self.errors) } more errors.")
+
+        return messages
+
+    def _report_progress(self):
+        """Calls `self.on_progress` with the number of rows imported so far and the total number of rows"""
+
+        if self.on_progress is not None:
+            self.on_progress(self.created, self.total)
+
+    def _add_errors(self, mask: pd.Series, message: str):
+        """Adds an error for every row selected by the boolean mask provided"""
+
+        rows = mask[mask.fillna(False)].index
+
+        # Row numbers are counted as in a spreadsheet, where the header is the first row
+        self.errors.extend((index + 2, message) for index in rows)
+        self.error_count += len(rows)
+
+    def _resolve_languages(self, language_names: Iterable[str]):
+        """Loads the user's languages once and creates those that are missing"""
+
+        if self._languages is None:
+            self._languages = {
+                language.language_name.lower(): language
+                for language in Language.objects.filter(user=self.user)
+            }
+
+        new_languages = {}
+
+        for language_name in language_names:
+            key = language_name.lower()
+
+            if key not in self._languages and key not in new_languages:
+                new_languages[key] = Language(user=self.user, language_name=language_name)
+
+        if new_languages:
+            Language.objects.bulk_create(new_languages.values())
+            self._languages.update(new_languages)
+
+    def _load_word(self, row: pd.Series) -> tuple:
+        """Returns the word saved last for the row provided with its hints and translations, as `self._last_word` keeps them"""
+
+        key = (row['Word'], row['WordLanguage'].lower(), row['Description'])
+        word = Word.objects.filter(
+            user=self.user, word=row['Word'], word_language=self._languages[key[1]], description=row['Description'],
+        ).order_by('-pk').first()
+
+        if word is None:
+            return None
+
+        hints = set(word.hints.values_list('hint', flat=True))
+        translations = {
+            (translation, language_name.lower())
+            for translation, language_name in word.translations.values_list('translation', 'translation_language__language_name')
+        }
+
+        return key, word, hints, translations
+
+    def _save_batch(self, batch: pd.DataFrame):
+        """
+        Saves words, hints and translations of one batch with three queries, schedules the words
+        to be reviewed with the fourth one, and counts them with the fifth one.
+
+        A row that repeats the word, its language and its description of the row above adds its hint and translation
+        to that word instead, unless the word already has them, so that files exported with several hints or
+        translations per word are imported back as they were.
+        """
+
+        user = self.user
+        languages = self._languages
+        new_words = []
+        row_words = []
+
+        for word, word_language, description in zip(batch['Word'], batch['WordLanguage'], batch['Description']):
+            key = (word, word_language.lower(), description)
+
+            if self._last_word is None or self._last_word[0] != key:
+                new_word = Word(word=word, user=user, word_language=languages[word_language.lower()], description=description)
+                new_words.append(new_word)
+                self._last_word = (key, new_word, set(), set())
+
+            row_words.append(self._last_word)
+
+        Word.objects.bulk_create(new_words)
+
+        new_hints = []
+        new_translations = []
+
+        for (_, word, hints, translations), hint, translation, translation_language in zip(row_words, batch['Hint'], batch['Translation'], batch['TranslationLanguage']):
+            if hint not in hints:
+                hints.add(hint)
+                new_hints.append(Hint(word=word, user=user, hint=hint))
+
+            if (translation, translation_language.lower()) not in translations:
+                translations.add((translation, translation_language.lower()))
+                new_translations.append(Translation(word=word, user=user, translation_language=languages[translation_language.lower()], translation=translation))
+
+        Hint.objects.bulk_create(new_hints)
+        Translation.objects.bulk_create(new_translations)
+
+        add_words(new_words)
+
+        change_counts(
+            words=Counter(word.word_language_id for word in new_words),
+            translations=Counter(translation.translation_language_id for translation in new_translations),
+        )
+
+        self.created += len(batch)
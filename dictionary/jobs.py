@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+from django.conf import settings as stg
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from . import autocomplete, fuzzy, quiz, summary, versions
+from .deletion import LanguageDeleter
+from .importers import WordsImporter, pa
+from .models import DeletionJob, ImportJob
+
+import logging
+import os
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Errors raised by parsers if the file is not valid
+PARSER_ERRORS = (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) + ((pa.ArrowException,) if pa else ())
+
+
+def claim_job(model):
+    """
+    Marks the oldest pending job of the model provided, `ImportJob` or `DeletionJob`, as running and returns it,
+    or returns None if there are no pending jobs. The status is changed with a conditional update,
+    so a job is never claimed by two workers.
+
+    Running jobs that have not been reported for `JOB_HEARTBEAT_TIMEOUT` seconds are claimed again,
+    as the worker that ran them has died. Imports claimed this way resume after the rows already committed.
+    """
+
+    stale = Q(date_heartbeat__lt=stale_since()) | Q(date_heartbeat=None)
+    claimable = Q(status=model.PENDING) | Q(stale, status=model.RUNNING)
+
+    for job_id in model.objects.filter(claimable).order_by('date_added').values_list('pk', flat=True)[:10]:
+        if model.objects.filter(claimable, pk=job_id).update(status=model.RUNNING, date_heartbeat=timezone.now()):
+            return model.objects.select_related('user').get(pk=job_id)
+
+    return None
+
+
+def stale_since():
+    """Returns the time running jobs must have been reported since, older ones are considered abandoned"""
+
+    return timezone.now() - timedelta(seconds=stg.JOB_HEARTBEAT_TIMEOUT)
+
+
+def run_import_job(job: ImportJob):
+    """
+    Imports the file of the job provided, recording the progress and the result in the job.
+    A job claimed again after its worker died resumes after the rows the worker committed.
+    The file is deleted once the job is finished.
+    """
+
+    def report_progress(rows_imported: int, rows_total: int):
+        ImportJob.objects.filter(pk=job.pk).update(rows_imported=rows_imported, rows_total=rows_total, date_heartbeat=timezone.now())
+
+    start = job.rows_imported
+    importer = WordsImporter(job.user, on_progress=report_progress, start=start)
+    extension = os.path.splitext(job.file.name)[1].lower()
+
+    try:
+        with job.file.open('rb') as file:
+            imported = importer.run_parquet(file) if extension == '.parquet' else importer.run_csv(file)
+
+        job.errors = importer.error_messages()
+
+    except PARSER_ERRORS:
+        imported = False
+        job.errors = [f"File is not a valid { extension or '.csv' } file!"]
+
+    except Exception:
+        logger.exception("Import job %s has failed", job.pk)
+        imported = False
+        job.errors = ["File could not be imported because of an internal error!"]
+
+    finally:
+        # Batches committed before a failure change the dictionary as well
+        if importer.created > start:
+            fuzzy.invalidate(job.user)
+            autocomplete.invalidate(job.user)
+            quiz.invalidate(job.user)
+            summary.invalidate(job.user)
+            versions.bump(job.user.pk)
+
+    job.status = ImportJob.DONE if imported else ImportJob.FAILED
+    job.rows_total = importer.total
+    job.rows_imported = importer.created
+    job.date_finished = timezone.now()
+    job.file.delete(save=False)
+    job.save()
+
+
+def run_deletion_job(job: DeletionJob):
+    """
+    Deletes the language of the job provided in batches, recording the progress and the result in the job.
+    The deletion stops after the current batch once the job is cancelled.
+    """
+
+    def report_progress(rows_deleted: int, rows_total: int):
+        DeletionJob.objects.filter(pk=job.pk).update(rows_deleted=rows_deleted, rows_total=rows_total, date_heartbeat=timezone.now())
+
+    def is_cancelled() -> bool:
+        return DeletionJob.objects.filter(pk=job.pk, status=DeletionJob.CANCELLED).exists()
+
+    status = DeletionJob.DONE
+    rows_deleted = 0
+
+    # The language could have been deleted since the job was queued
+    if job.language_id is not None:
+        deleter = LanguageDeleter(job.language, on_progress=report_progress, is_cancelled=is_cancelled)
+
+        try:
+            status = DeletionJob.DONE if deleter.run() else DeletionJob.CANCELLED
+
+        except Exception:
+            logger.exception("Deletion job %s has failed", job.pk)
+            status = DeletionJob.FAILED
+
+        rows_deleted = deleter.deleted
+
+    # The job is not saved as a whole, its language has been set to NULL by the deletion
+    DeletionJob.objects.filter(pk=job.pk).update(status=status, rows_deleted=rows_deleted, date_finished=timezone.now())
+
+
+def run_job_in_thread(run_job, job):
+    """Runs the job with the function provided in a worker thread, which owns its database connection"""
+
+    close_old_connections()
+
+    try:
+        run_job(job)
+
+    finally:
+        connection.close()
@@ -0,0 +1,128 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from dictionary.benchmarks import SCENARIOS, Benchmark, compare
+from dictionary.generators import DictionaryGenerator
+from dictionary.models import Word
+
+import json
+import logging
+import platform
+import shutil
+import tempfile
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the dictionary views against generated dictionaries of the sizes provided, in a test database. "
+        "Results can be saved as JSON and compared with a baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000], help="Numbers of words in the dictionaries benchmarked, eg. 1000 100000 1000000.")
+        parser.add_argument('--languages', type=int, default=10, help="Number of languages in every dictionary.")
+        parser.add_argument('--iterations', type=int, default=20, help="Number of requests sent in every scenario.")
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS, help="Scenarios to run.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the generated dictionaries and requests.")
+        parser.add_argument('--output', help="Path of the JSON file the results are written to.")
+        parser.add_argument('--baseline', help="Path of the JSON file with the results to compare with.")
+        parser.add_argument('--tolerance', type=float, default=0.25, help="Share by which median latencies may grow before they are reported as regressions.")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database and the dictionaries generated for the next runs.")
+
+    def handle(self, *args, sizes: list, languages: int, iterations: int, scenarios: list, seed: int, output: str,
+               baseline: str, tolerance: float, keepdb: bool, verbosity: int, **options):
+
+        baseline_results = None
+
+        if baseline:
+            with open(baseline) as file:
+                baseline_results = json.load(file)['results']
+
+        results = self.run(sizes, languages, iterations, scenarios, seed, keepdb, verbosity)
+        report = {
+            'meta': {
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'iterations': iterations,
+                'seed': seed,
+            },
+            'results': results,
+        }
+
+        if output:
+            with open(output, 'w') as file:
+                json.dump(report, file, indent=2)
+
+        self.print_results(results, baseline_results)
+
+        if baseline_results is not None:
+            regressions = compare(results, baseline_results, tolerance)
+
+            if regressions:
+                raise CommandError("Performance has regressed:\n" + '\n'.join(regressions))
+
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def run(self, sizes: list, languages: int, iterations: int, scenarios: list, seed: int, keepdb: bool, verbosity: int) -> dict:
+        """Generates dictionaries in a test database and benchmarks them"""
+
+        media_root = tempfile.mkdtemp()
+        performance_logger = logging.getLogger('app.performance')
+        performance_level = performance_logger.level
+
+        # Requests to large dictionaries are expected to be slow, they are measured here
+        performance_logger.setLevel(logging.ERROR)
+        setup_test_environment()
+        old_config = setup_databases(verbosity, interactive=False, keepdb=keepdb)
+
+        try:
+            results = {}
+
+            with override_settings(MEDIA_ROOT=media_root):
+                for size in sizes:
+                    user = self.get_user(size, languages, seed)
+
+                    self.stdout.write(f"Benchmarking a dictionary of { size } words")
+                    results[str(size)] = Benchmark(user, iterations, seed).run(scenarios)
+
+            return results
+
+        finally:
+            teardown_databases(old_config, verbosity, keepdb=keepdb)
+            teardown_test_environment()
+            performance_logger.setLevel(performance_level)
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def get_user(self, size: int, languages: int, seed: int) -> User:
+        """Returns the user with a generated dictionary of the size provided, generating it if it does not exist"""
+
+        username = f'benchmark-{ size }-{ languages }-{ seed }'
+        user = User.objects.filter(username=username).first()
+
+        if user is not None and Word.objects.filter(user=user).count() == size:
+            return user
+
+        if user is not None:
+            user.delete()
+
+        self.stdout.write(f"Generating a dictionary of { size } words")
+
+        user = User.objects.create_user(username=username)
+        DictionaryGenerator(seed).generate(user, languages, size)
+
+        return user
+
+    def print_results(self, results: dict, baseline: dict = None):
+        """Prints a table of results, with the baseline median latencies if they are given"""
+
+        for size, scenarios in results.items():
+            self.stdout.write(f"\n{ size } words")
+            self.stdout.write(f"{ 'Scenario':<22}{ 'p50':>10}{ 'p90':>10}{ 'p99':>10}{ 'Queries':>9}{ 'Baseline p50':>14}")
+
+            for name, stats in scenarios.items():
+                base = (baseline or {}).get(size, {}).get(name)
+                base_p50 = f"{ base['p50'] }" if base else '-'
+
+                self.stdout.write(f"{ name:<22}{ stats['p50']:>10}{ stats['p90']:>10}{ stats['p99']:>10}{ stats['queries']:>9}{ base_p50:>14}")
@@ -0,0 +1,73 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings as stg
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from dictionary.generators import DictionaryGenerator, generate_words_chunk
+
+import django
+import multiprocessing
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates users with synthetic dictionaries for load testing. "
+        "The same seed always generates the same dictionaries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1, help="Number of users generated.")
+        parser.add_argument('--languages', type=int, default=5, help="Number of languages of every user.")
+        parser.add_argument('--words', type=int, default=1000, help="Number of words of every user.")
+        parser.add_argument('--hints', type=int, default=1, help="Number of hints of every word.")
+        parser.add_argument('--translations', type=int, default=1, help="Number of translations of every word.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the random generator.")
+        parser.add_argument('--batch-size', type=int, default=stg.IMPORT_BATCH_SIZE, help="Number of words saved in every transaction.")
+        parser.add_argument('--chunk-size', type=int, default=100_000, help="Number of words generated by a process at a time.")
+        parser.add_argument('--processes', type=int, default=1, help="Number of processes that generate words in parallel.")
+        parser.add_argument('--username-prefix', default='generated', help="Prefix of the usernames, followed by the user's number.")
+        parser.add_argument('--password', help="Password of the users generated. Users cannot log in if it is not given.")
+
+    def handle(self, *args, users: int, languages: int, words: int, hints: int, translations: int, seed: int, batch_size: int,
+               chunk_size: int, processes: int, username_prefix: str, password: str, **options):
+
+        if processes > 1 and connection.vendor == 'sqlite':
+            raise CommandError("SQLite allows a single writer at a time, use --processes 1.")
+
+        started_at = time.perf_counter()
+
+        # The password is hashed once, hashing it for every user would take longer than generating words
+        hashed_password = make_password(password)
+        new_users = User.objects.bulk_create([User(username=f'{ username_prefix }{ i }', password=hashed_password) for i in range(users)])
+
+        # Every chunk of words has its own seed, so the result does not depend on the order chunks are generated in
+        chunks = []
+
+        for i, user in enumerate(new_users):
+            generator = DictionaryGenerator(seed=seed * 1_000_003 + i)
+            language_ids = [language.pk for language in generator.generate_languages(user, languages)]
+
+            for start in range(0, words, chunk_size):
+                chunk_seed = generator.random.getrandbits(64)
+                chunks.append((user.pk, language_ids, min(chunk_size, words - start), chunk_seed, batch_size, hints, translations))
+
+        if processes > 1:
+            # Worker processes open their own connections
+            connections.close_all()
+
+            with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup) as executor:
+                results = list(executor.map(generate_words_chunk, *zip(*chunks)))
+
+        else:
+            results = [generate_words_chunk(*chunk) for chunk in chunks]
+
+        rows = users + users * max(languages, 2) + sum(sum(result.values()) for result in results)
+        elapsed = time.perf_counter() - started_at
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated { users } users with { rows } rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from dictionary.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes tombstones of instances deleted more than `SYNC_TOMBSTONE_RETENTION` seconds ago, eg. daily from cron. "
+        "Clients that did not sync since then get a full sync."
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted { deleted } tombstones."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from dictionary.counters import recount
+from dictionary.models import Language
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the numbers of words and translations stored in languages, eg. after rows were changed "
+        "outside the views. All languages are recounted with a single query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', nargs='+', help="Usernames of the users whose languages are recounted, all users by default.")
+
+    def handle(self, *args, users: list, **options):
+        languages = Language.objects.all()
+
+        if users:
+            languages = languages.filter(user__username__in=users)
+
+        wrong = recount(languages)
+
+        self.stdout.write(self.style.SUCCESS(f"Fixed counters of { wrong } languages."))
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings as stg
+from django.core.management.base import BaseCommand
+
+from dictionary.jobs import claim_job, run_deletion_job, run_import_job, run_job_in_thread
+from dictionary.models import DeletionJob, ImportJob
+
+import time
+
+
+class Command(BaseCommand):
+    help = "Runs the worker that imports queued words files and deletes queued languages on a local thread pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=stg.IMPORT_WORKERS, help="Number of jobs that run concurrently.")
+        parser.add_argument('--poll-interval', type=float, default=stg.IMPORT_POLL_INTERVAL, help="Seconds to wait when there are no pending jobs.")
+        parser.add_argument('--once', action='store_true', help="Exit once all pending jobs are finished.")
+
+    def handle(self, *args, workers: int, poll_interval: float, once: bool, **options):
+        running = set()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                running = {future for future in running if not future.done()}
+                job = claim_job(ImportJob) if len(running) < workers else None
+
+                if job is not None:
+                    self.stdout.write(f"Importing job #{ job.pk } of { job.user }")
+                    running.add(executor.submit(run_job_in_thread, run_import_job, job))
+                    continue
+
+                job = claim_job(DeletionJob) if len(running) < workers else None
+
+                if job is not None:
+                    self.stdout.write(f"Deleting the { job.language_name } language of { job.user } (job #{ job.pk })")
+                    running.add(executor.submit(run_job_in_thread, run_deletion_job, job))
+                    continue
+
+                if once and not running:
+                    break
+
+                time.sleep(poll_interval)
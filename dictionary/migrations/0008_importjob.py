@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-17 19:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dictionary', '0007_alter_language_language_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='imports/', verbose_name='Uploaded file')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name="Job's status")),
+                ('rows_total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Number of rows in the file')),
+                ('rows_imported', models.PositiveIntegerField(default=0, verbose_name='Number of rows imported')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Errors found in the file')),
+                ('date_added', models.DateTimeField(auto_now_add=True, verbose_name='Date and time when the job is added')),
+                ('date_finished', models.DateTimeField(blank=True, null=True, verbose_name='Date and time when the job is finished')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
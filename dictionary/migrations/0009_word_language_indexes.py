@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-17 19:19
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0008_importjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='language',
+            index=models.Index(fields=['user', '-date_added'], name='language_user_date_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='language',
+            index=models.Index(models.F('user'), django.db.models.functions.text.Lower('language_name'), name='language_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', '-date_added'], name='word_user_date_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(models.F('user'), models.F('word_language'), django.db.models.functions.text.Lower('word'), name='word_user_language_word_idx'),
+        ),
+    ]
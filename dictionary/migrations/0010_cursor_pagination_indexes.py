@@ -0,0 +1,29 @@
+# Generated by Django 4.1.7 on 2026-10-17 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0009_word_language_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='language',
+            name='language_user_date_added_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='word',
+            name='word_user_date_added_idx',
+        ),
+        migrations.AddIndex(
+            model_name='language',
+            index=models.Index(fields=['user', '-date_added', '-id'], name='language_user_date_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', '-date_added', '-id'], name='word_user_date_added_idx'),
+        ),
+    ]
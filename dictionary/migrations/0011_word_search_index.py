@@ -0,0 +1,160 @@
+from django.db import migrations
+
+
+# SQLite: FTS5 table with one row per word, its rowid being the word's id.
+# Hints and translations of a word are concatenated in their own columns.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE dictionary_word_fts USING fts5(
+        word, description, hints, translations, user_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER dictionary_word_fts_word_insert AFTER INSERT ON dictionary_word BEGIN
+        INSERT INTO dictionary_word_fts (rowid, word, description, hints, translations, user_id)
+        VALUES (NEW.id, NEW.word, NEW.description, '', '', NEW.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER dictionary_word_fts_word_update AFTER UPDATE ON dictionary_word BEGIN
+        UPDATE dictionary_word_fts SET word = NEW.word, description = NEW.description, user_id = NEW.user_id
+        WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER dictionary_word_fts_word_delete AFTER DELETE ON dictionary_word BEGIN
+        DELETE FROM dictionary_word_fts WHERE rowid = OLD.id;
+    END
+    """,
+]
+
+for table, column, fts_column in [('dictionary_hint', 'hint', 'hints'), ('dictionary_translation', 'translation', 'translations')]:
+    refresh = f"""
+        UPDATE dictionary_word_fts
+        SET { fts_column } = (SELECT coalesce(group_concat({ column }, ' '), '') FROM { table } WHERE word_id = {{row}}.word_id)
+        WHERE rowid = {{row}}.word_id;
+    """
+
+    SQLITE_FORWARD += [
+        f"CREATE TRIGGER { table }_fts_insert AFTER INSERT ON { table } BEGIN { refresh.format(row='NEW') } END",
+        f"CREATE TRIGGER { table }_fts_update AFTER UPDATE ON { table } BEGIN { refresh.format(row='OLD') } { refresh.format(row='NEW') } END",
+        f"CREATE TRIGGER { table }_fts_delete AFTER DELETE ON { table } BEGIN { refresh.format(row='OLD') } END",
+    ]
+
+SQLITE_FORWARD.append(
+    """
+    INSERT INTO dictionary_word_fts (rowid, word, description, hints, translations, user_id)
+    SELECT
+        w.id, w.word, w.description,
+        (SELECT coalesce(group_concat(hint, ' '), '') FROM dictionary_hint WHERE word_id = w.id),
+        (SELECT coalesce(group_concat(translation, ' '), '') FROM dictionary_translation WHERE word_id = w.id),
+        w.user_id
+    FROM dictionary_word w
+    """
+)
+
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER IF EXISTS { trigger }" for trigger in [
+        'dictionary_word_fts_word_insert', 'dictionary_word_fts_word_update', 'dictionary_word_fts_word_delete',
+        'dictionary_hint_fts_insert', 'dictionary_hint_fts_update', 'dictionary_hint_fts_delete',
+        'dictionary_translation_fts_insert', 'dictionary_translation_fts_update', 'dictionary_translation_fts_delete',
+    ]
+] + ["DROP TABLE IF EXISTS dictionary_word_fts"]
+
+
+# PostgreSQL: table with a weighted `tsvector` document per word and a GIN index.
+POSTGRESQL_FORWARD = [
+    """
+    CREATE TABLE dictionary_word_search (
+        word_id bigint PRIMARY KEY REFERENCES dictionary_word (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        user_id bigint NOT NULL,
+        document tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX dictionary_word_search_document_idx ON dictionary_word_search USING GIN (document)",
+    "CREATE INDEX dictionary_word_search_user_idx ON dictionary_word_search (user_id)",
+    """
+    CREATE FUNCTION dictionary_word_search_refresh(refreshed_word_id bigint) RETURNS void AS $$
+        INSERT INTO dictionary_word_search (word_id, user_id, document)
+        SELECT
+            w.id, w.user_id,
+            setweight(to_tsvector('simple', w.word), 'A')
+            || setweight(to_tsvector('simple', coalesce((SELECT string_agg(translation, ' ') FROM dictionary_translation WHERE word_id = w.id), '')), 'A')
+            || setweight(to_tsvector('simple', coalesce((SELECT string_agg(hint, ' ') FROM dictionary_hint WHERE word_id = w.id), '')), 'B')
+            || setweight(to_tsvector('simple', w.description), 'C')
+        FROM dictionary_word w
+        WHERE w.id = refreshed_word_id
+        ON CONFLICT (word_id) DO UPDATE SET user_id = EXCLUDED.user_id, document = EXCLUDED.document;
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE FUNCTION dictionary_word_search_word_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM dictionary_word_search_refresh(NEW.id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE FUNCTION dictionary_word_search_related_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM dictionary_word_search_refresh(OLD.word_id);
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM dictionary_word_search_refresh(NEW.word_id);
+        END IF;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER dictionary_word_search_word AFTER INSERT OR UPDATE ON dictionary_word
+    FOR EACH ROW EXECUTE FUNCTION dictionary_word_search_word_trigger()
+    """,
+    """
+    CREATE TRIGGER dictionary_word_search_hint AFTER INSERT OR UPDATE OR DELETE ON dictionary_hint
+    FOR EACH ROW EXECUTE FUNCTION dictionary_word_search_related_trigger()
+    """,
+    """
+    CREATE TRIGGER dictionary_word_search_translation AFTER INSERT OR UPDATE OR DELETE ON dictionary_translation
+    FOR EACH ROW EXECUTE FUNCTION dictionary_word_search_related_trigger()
+    """,
+    "SELECT dictionary_word_search_refresh(id) FROM dictionary_word",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP TRIGGER IF EXISTS dictionary_word_search_word ON dictionary_word",
+    "DROP TRIGGER IF EXISTS dictionary_word_search_hint ON dictionary_hint",
+    "DROP TRIGGER IF EXISTS dictionary_word_search_translation ON dictionary_translation",
+    "DROP FUNCTION IF EXISTS dictionary_word_search_word_trigger()",
+    "DROP FUNCTION IF EXISTS dictionary_word_search_related_trigger()",
+    "DROP FUNCTION IF EXISTS dictionary_word_search_refresh(bigint)",
+    "DROP TABLE IF EXISTS dictionary_word_search",
+]
+
+
+def run_statements(statements_by_vendor):
+    def run(apps, schema_editor):
+        # Other databases fall back to searching words with `icontains`
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0010_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run_statements({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
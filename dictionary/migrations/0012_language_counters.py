@@ -0,0 +1,42 @@
+# Generated by Django 4.1.7 on 2026-10-17 19:55
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_words(apps, schema_editor):
+    """Fills the counters of existing languages"""
+
+    Language = apps.get_model('dictionary', 'Language')
+    Word = apps.get_model('dictionary', 'Word')
+    Translation = apps.get_model('dictionary', 'Translation')
+
+    words = Word.objects.filter(word_language=OuterRef('pk')).order_by().values('word_language').annotate(count=Count('pk'))
+    translations = Translation.objects.filter(translation_language=OuterRef('pk')).order_by().values('translation_language').annotate(count=Count('pk'))
+
+    Language.objects.update(
+        word_count=Coalesce(Subquery(words.values('count'), output_field=IntegerField()), 0),
+        translation_count=Coalesce(Subquery(translations.values('count'), output_field=IntegerField()), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0011_word_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='language',
+            name='translation_count',
+            field=models.IntegerField(default=0, verbose_name='Number of translations to the language'),
+        ),
+        migrations.AddField(
+            model_name='language',
+            name='word_count',
+            field=models.IntegerField(default=0, verbose_name='Number of words in the language'),
+        ),
+        migrations.RunPython(count_words, migrations.RunPython.noop),
+    ]
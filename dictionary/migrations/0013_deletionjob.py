@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-17 19:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dictionary', '0012_language_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language_name', models.CharField(max_length=300, verbose_name='Name of the language deleted')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=10, verbose_name="Job's status")),
+                ('rows_total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Number of words and translations to delete')),
+                ('rows_deleted', models.PositiveIntegerField(default=0, verbose_name='Number of words and translations deleted')),
+                ('date_added', models.DateTimeField(auto_now_add=True, verbose_name='Date and time when the job is added')),
+                ('date_finished', models.DateTimeField(blank=True, null=True, verbose_name='Date and time when the job is finished')),
+                ('language', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to='dictionary.language')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deletion_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
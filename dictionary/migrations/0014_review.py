@@ -0,0 +1,53 @@
+# Generated by Django 4.1.7 on 2026-10-17 20:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def add_reviews(apps, schema_editor):
+    """Schedules existing words to be reviewed in the order they were added"""
+
+    Word = apps.get_model('dictionary', 'Word')
+    Review = apps.get_model('dictionary', 'Review')
+
+    last_pk = 0
+
+    # Words are read in batches by primary key, so that large dictionaries are not loaded to memory at once
+    while True:
+        words = list(Word.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'user_id', 'date_added')[:2000])
+
+        if not words:
+            break
+
+        Review.objects.bulk_create(Review(word_id=word_id, user_id=user_id, due_at=date_added) for word_id, user_id, date_added in words)
+        last_pk = words[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dictionary', '0013_deletionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ease', models.FloatField(default=2.5, verbose_name='Factor the interval is multiplied by after a successful review')),
+                ('interval', models.PositiveIntegerField(default=0, verbose_name='Days between the last review and the next one')),
+                ('repetitions', models.PositiveIntegerField(default=0, verbose_name='Number of successful reviews in a row')),
+                ('due_at', models.DateTimeField(verbose_name='Date and time when the word is due to be reviewed')),
+                ('date_reviewed', models.DateTimeField(blank=True, null=True, verbose_name='Date and time when the word was last reviewed')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to=settings.AUTH_USER_MODEL)),
+                ('word', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review', to='dictionary.word')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'due_at', 'id'], name='review_user_due_at_idx'),
+        ),
+        migrations.RunPython(add_reviews, migrations.RunPython.noop),
+    ]
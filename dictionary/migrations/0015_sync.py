@@ -0,0 +1,133 @@
+# Generated by Django 4.1.7 on 2026-10-17 20:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Triggers of the FTS5 search table as created by 0011_word_search_index
+SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER dictionary_word_fts_word_insert AFTER INSERT ON dictionary_word BEGIN
+        INSERT INTO dictionary_word_fts (rowid, word, description, hints, translations, user_id)
+        VALUES (NEW.id, NEW.word, NEW.description, '', '', NEW.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER dictionary_word_fts_word_update AFTER UPDATE ON dictionary_word BEGIN
+        UPDATE dictionary_word_fts SET word = NEW.word, description = NEW.description, user_id = NEW.user_id
+        WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER dictionary_word_fts_word_delete AFTER DELETE ON dictionary_word BEGIN
+        DELETE FROM dictionary_word_fts WHERE rowid = OLD.id;
+    END
+    """,
+]
+
+for table, column, fts_column in [('dictionary_hint', 'hint', 'hints'), ('dictionary_translation', 'translation', 'translations')]:
+    refresh = f"""
+        UPDATE dictionary_word_fts
+        SET { fts_column } = (SELECT coalesce(group_concat({ column }, ' '), '') FROM { table } WHERE word_id = {{row}}.word_id)
+        WHERE rowid = {{row}}.word_id;
+    """
+
+    SEARCH_TRIGGERS += [
+        f"CREATE TRIGGER { table }_fts_insert AFTER INSERT ON { table } BEGIN { refresh.format(row='NEW') } END",
+        f"CREATE TRIGGER { table }_fts_update AFTER UPDATE ON { table } BEGIN { refresh.format(row='OLD') } { refresh.format(row='NEW') } END",
+        f"CREATE TRIGGER { table }_fts_delete AFTER DELETE ON { table } BEGIN { refresh.format(row='OLD') } END",
+    ]
+
+DROP_SEARCH_TRIGGERS = [
+    f"DROP TRIGGER IF EXISTS { trigger }" for trigger in [
+        'dictionary_word_fts_word_insert', 'dictionary_word_fts_word_update', 'dictionary_word_fts_word_delete',
+        'dictionary_hint_fts_insert', 'dictionary_hint_fts_update', 'dictionary_hint_fts_delete',
+        'dictionary_translation_fts_insert', 'dictionary_translation_fts_update', 'dictionary_translation_fts_delete',
+    ]
+]
+
+
+def copy_dates(apps, schema_editor):
+    """Existing instances are considered changed when they were added"""
+
+    for model_name in ('Language', 'Word', 'Hint', 'Translation'):
+        apps.get_model('dictionary', model_name).objects.update(date_updated=models.F('date_added'))
+
+
+def restore_search_triggers(apps, schema_editor):
+    """SQLite drops triggers of a table when the table is remade to add or remove a column"""
+
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    for statement in DROP_SEARCH_TRIGGERS + SEARCH_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dictionary', '0014_review'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=20, verbose_name='Name of the model of the instance deleted, eg. word')),
+                ('object_id', models.BigIntegerField(verbose_name='Id of the instance deleted')),
+                ('date_deleted', models.DateTimeField(auto_now_add=True, verbose_name='Date and time when the instance is deleted')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='hint',
+            name='date_updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date and time when the hint is changed'),
+        ),
+        migrations.AddField(
+            model_name='language',
+            name='date_updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date and time when the language is changed'),
+        ),
+        migrations.AddField(
+            model_name='translation',
+            name='date_updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date and time when the translation is changed'),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='date_updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date and time when the word is changed'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.RunPython(copy_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='hint',
+            index=models.Index(fields=['user', 'date_updated', 'id'], name='hint_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='language',
+            index=models.Index(fields=['user', 'date_updated', 'id'], name='language_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translation',
+            index=models.Index(fields=['user', 'date_updated', 'id'], name='translation_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', 'date_updated', 'id'], name='word_user_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['user', 'date_deleted', 'id'], name='tombstone_user_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,100 @@
+from django.db import migrations
+
+
+# SQLite: the FTS5 table gets the owner of each word as an indexed `u<id>` token in its own column, so that
+# a search ANDs it into the MATCH expression and reads the postings of one user instead of filtering all of them.
+TRIGGERS = [
+    'dictionary_word_fts_word_insert', 'dictionary_word_fts_word_update', 'dictionary_word_fts_word_delete',
+    'dictionary_hint_fts_insert', 'dictionary_hint_fts_update', 'dictionary_hint_fts_delete',
+    'dictionary_translation_fts_insert', 'dictionary_translation_fts_update', 'dictionary_translation_fts_delete',
+]
+
+
+def sqlite_statements(user_column: str, user_value: str) -> list:
+    """
+    Returns the statements that create the FTS5 table, its triggers and its rows, with the owner of a word
+    stored in the column provided. `user_value` is an expression of the owner's id, with `{row}` for the word.
+    """
+
+    statements = [f"DROP TRIGGER IF EXISTS { trigger }" for trigger in TRIGGERS] + [
+        "DROP TABLE IF EXISTS dictionary_word_fts",
+        f"""
+        CREATE VIRTUAL TABLE dictionary_word_fts USING fts5(
+            word, description, hints, translations, { user_column },
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+    ]
+
+    user_name = user_column.split()[0]
+
+    statements += [
+        f"""
+        CREATE TRIGGER dictionary_word_fts_word_insert AFTER INSERT ON dictionary_word BEGIN
+            INSERT INTO dictionary_word_fts (rowid, word, description, hints, translations, { user_name })
+            VALUES (NEW.id, NEW.word, NEW.description, '', '', { user_value.format(row='NEW') });
+        END
+        """,
+        f"""
+        CREATE TRIGGER dictionary_word_fts_word_update AFTER UPDATE ON dictionary_word BEGIN
+            UPDATE dictionary_word_fts SET word = NEW.word, description = NEW.description, { user_name } = { user_value.format(row='NEW') }
+            WHERE rowid = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER dictionary_word_fts_word_delete AFTER DELETE ON dictionary_word BEGIN
+            DELETE FROM dictionary_word_fts WHERE rowid = OLD.id;
+        END
+        """,
+    ]
+
+    for table, column, fts_column in [('dictionary_hint', 'hint', 'hints'), ('dictionary_translation', 'translation', 'translations')]:
+        refresh = f"""
+            UPDATE dictionary_word_fts
+            SET { fts_column } = (SELECT coalesce(group_concat({ column }, ' '), '') FROM { table } WHERE word_id = {{row}}.word_id)
+            WHERE rowid = {{row}}.word_id;
+        """
+
+        statements += [
+            f"CREATE TRIGGER { table }_fts_insert AFTER INSERT ON { table } BEGIN { refresh.format(row='NEW') } END",
+            f"CREATE TRIGGER { table }_fts_update AFTER UPDATE ON { table } BEGIN { refresh.format(row='OLD') } { refresh.format(row='NEW') } END",
+            f"CREATE TRIGGER { table }_fts_delete AFTER DELETE ON { table } BEGIN { refresh.format(row='OLD') } END",
+        ]
+
+    statements.append(
+        f"""
+        INSERT INTO dictionary_word_fts (rowid, word, description, hints, translations, { user_name })
+        SELECT
+            w.id, w.word, w.description,
+            (SELECT coalesce(group_concat(hint, ' '), '') FROM dictionary_hint WHERE word_id = w.id),
+            (SELECT coalesce(group_concat(translation, ' '), '') FROM dictionary_translation WHERE word_id = w.id),
+            { user_value.format(row='w') }
+        FROM dictionary_word w
+        """
+    )
+
+    return statements
+
+
+SQLITE_FORWARD = sqlite_statements('owner', "'u' || {row}.user_id")
+SQLITE_BACKWARD = sqlite_statements('user_id UNINDEXED', '{row}.user_id')
+
+
+def run_statements(statements_by_vendor):
+    def run(apps, schema_editor):
+        # PostgreSQL combines the GIN index of documents with the index of users, and has nothing to change
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0015_sync'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_statements({'sqlite': SQLITE_FORWARD}), run_statements({'sqlite': SQLITE_BACKWARD})),
+    ]
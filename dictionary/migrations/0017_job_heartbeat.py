@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2026-10-17 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0016_word_search_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletionjob',
+            name='date_heartbeat',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Date and time when the worker running the job last reported it'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='date_heartbeat',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Date and time when the worker running the job last reported it'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 
 
@@ -8,21 +9,61 @@ class Language(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='languages')
     language_name = models.CharField(verbose_name="Language (eg. English, Russian)", max_length=300)
     date_added = models.DateTimeField(verbose_name="Date and time when the language is added", auto_now_add=True)
+    date_updated = models.DateTimeField(verbose_name="Date and time when the language is changed", auto_now=True)
+
+    # Denormalized counters maintained by `dictionary.counters`, so that lists of languages are not counted per row
+    word_count = models.IntegerField(verbose_name="Number of words in the language", default=0)
+    translation_count = models.IntegerField(verbose_name="Number of translations to the language", default=0)
+
+    class Meta:
+        indexes = [
+            # Lists of user's languages, ordered from the most recent, ids break ties for cursor pagination
+            models.Index(fields=['user', '-date_added', '-id'], name='language_user_date_added_idx'),
+            # Case-insensitive duplicate checks
+            models.Index('user', Lower('language_name'), name='language_user_name_idx'),
+            # Changes of user's languages read by sync clients
+            models.Index(fields=['user', 'date_updated', 'id'], name='language_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{ self.language_name }"
 
 
+class WordQuerySet(models.QuerySet):
+    def with_primary_translation(self):
+        """
+        Annotates words with `primary_translation`, the text of their first translation,
+        so that lists of words do not query translations per word.
+        """
+
+        translations = Translation.objects.filter(word=models.OuterRef('pk')).order_by('pk')
+
+        return self.annotate(primary_translation=models.Subquery(translations.values('translation')[:1]))
+
+
 class Word(models.Model):
     """
     Model representing a single word.
     """
 
+    objects = WordQuerySet.as_manager()
+
     word = models.CharField(verbose_name="Word", max_length=300)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='words')
     word_language = models.ForeignKey(Language, on_delete=models.CASCADE, related_name='words', verbose_name="Word's language")
     description = models.TextField(verbose_name="Word's description")
     date_added = models.DateTimeField(verbose_name="Date and time when the word is added", auto_now_add=True)
+    date_updated = models.DateTimeField(verbose_name="Date and time when the word is changed", auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Lists of user's words, ordered from the most recent, ids break ties for cursor pagination
+            models.Index(fields=['user', '-date_added', '-id'], name='word_user_date_added_idx'),
+            # Case-insensitive duplicate checks
+            models.Index('user', 'word_language', Lower('word'), name='word_user_language_word_idx'),
+            # Changes of user's words read by sync clients
+            models.Index(fields=['user', 'date_updated', 'id'], name='word_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{ self.word }"
@@ -35,6 +76,13 @@ class Hint(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='hints')
     hint = models.CharField(verbose_name="Word's hint", max_length=300)
     date_added = models.DateTimeField(verbose_name="Date and time when the hint is added", auto_now_add=True)
+    date_updated = models.DateTimeField(verbose_name="Date and time when the hint is changed", auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Changes of user's hints read by sync clients
+            models.Index(fields=['user', 'date_updated', 'id'], name='hint_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{ self.hint }"
@@ -48,6 +96,112 @@ class Translation(models.Model):
     translation_language = models.ForeignKey(Language, on_delete=models.CASCADE, verbose_name="Translation's language")
     translation = models.CharField(verbose_name="Word's translation", max_length=300)
     date_added = models.DateTimeField(verbose_name="Date and time when the translation is added", auto_now_add=True)
+    date_updated = models.DateTimeField(verbose_name="Date and time when the translation is changed", auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Changes of user's translations read by sync clients
+            models.Index(fields=['user', 'date_updated', 'id'], name='translation_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{ self.translation }"
+
+
+class Review(models.Model):
+    """Model representing the spaced repetition state of a word, scheduled by `dictionary.reviews`."""
+
+    word = models.OneToOneField(Word, on_delete=models.CASCADE, related_name='review')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews')
+    ease = models.FloatField(verbose_name="Factor the interval is multiplied by after a successful review", default=2.5)
+    interval = models.PositiveIntegerField(verbose_name="Days between the last review and the next one", default=0)
+    repetitions = models.PositiveIntegerField(verbose_name="Number of successful reviews in a row", default=0)
+    due_at = models.DateTimeField(verbose_name="Date and time when the word is due to be reviewed")
+    date_reviewed = models.DateTimeField(verbose_name="Date and time when the word was last reviewed", null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Queue of user's words due to be reviewed, ids break ties between words added at once
+            models.Index(fields=['user', 'due_at', 'id'], name='review_user_due_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{ self.word_id } (due { self.due_at })"
+
+
+class Tombstone(models.Model):
+    """Model representing a language, word, hint or translation deleted, so that sync clients delete it as well."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones')
+    model_name = models.CharField(verbose_name="Name of the model of the instance deleted, eg. word", max_length=20)
+    object_id = models.BigIntegerField(verbose_name="Id of the instance deleted")
+    date_deleted = models.DateTimeField(verbose_name="Date and time when the instance is deleted", auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Deletions of user's instances read by sync clients
+            models.Index(fields=['user', 'date_deleted', 'id'], name='tombstone_user_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{ self.model_name } { self.object_id }"
+
+
+class ImportJob(models.Model):
+    """Model representing a words file queued to be imported by the import worker."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    file = models.FileField(verbose_name="Uploaded file", upload_to='imports/')
+    status = models.CharField(verbose_name="Job's status", max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    rows_total = models.PositiveIntegerField(verbose_name="Number of rows in the file", null=True, blank=True)
+    rows_imported = models.PositiveIntegerField(verbose_name="Number of rows imported", default=0)
+    errors = models.JSONField(verbose_name="Errors found in the file", default=list, blank=True)
+    date_added = models.DateTimeField(verbose_name="Date and time when the job is added", auto_now_add=True)
+    date_finished = models.DateTimeField(verbose_name="Date and time when the job is finished", null=True, blank=True)
+    date_heartbeat = models.DateTimeField(verbose_name="Date and time when the worker running the job last reported it", null=True, blank=True)
+
+    def __str__(self):
+        return f"{ self.file.name } ({ self.status })"
+
+
+class DeletionJob(models.Model):
+    """Model representing a language queued to be deleted in batches by the worker."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+        (CANCELLED, 'Cancelled'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='deletion_jobs')
+    language = models.ForeignKey(Language, on_delete=models.SET_NULL, null=True, blank=True, related_name='deletion_jobs')
+    language_name = models.CharField(verbose_name="Name of the language deleted", max_length=300)
+    status = models.CharField(verbose_name="Job's status", max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    rows_total = models.PositiveIntegerField(verbose_name="Number of words and translations to delete", null=True, blank=True)
+    rows_deleted = models.PositiveIntegerField(verbose_name="Number of words and translations deleted", default=0)
+    date_added = models.DateTimeField(verbose_name="Date and time when the job is added", auto_now_add=True)
+    date_finished = models.DateTimeField(verbose_name="Date and time when the job is finished", null=True, blank=True)
+    date_heartbeat = models.DateTimeField(verbose_name="Date and time when the worker running the job last reported it", null=True, blank=True)
+
+    def __str__(self):
+        return f"{ self.language_name } ({ self.status })"
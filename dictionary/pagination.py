@@ -0,0 +1,169 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import QuerySet
+
+import binascii
+import json
+
+
+class CursorPage:
+    """
+    Page of objects returned by `CursorPaginator`. Instead of page numbers it provides
+    opaque `next_cursor` and `previous_cursor` tokens pointing to the neighbouring pages.
+    """
+
+    def __init__(self, object_list: list, paginator, has_next: bool, has_previous: bool):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage of { len(self) } objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> str:
+        return self.paginator.encode_cursor(CursorPaginator.NEXT, self.object_list[-1]) if self._has_next else None
+
+    @property
+    def previous_cursor(self) -> str:
+        return self.paginator.encode_cursor(CursorPaginator.PREVIOUS, self.object_list[0]) if self._has_previous else None
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over a queryset ordered by `(key, id)` in descending order. Subclasses can
+    paginate other sources by overriding `_fetch`.
+
+    Each page is fetched with a single range query that starts right after the object the cursor
+    points to, so the cost of a page does not depend on its depth. Unlike `django.core.paginator.Paginator`
+    the total number of objects is only counted if `count` is True.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset: QuerySet, per_page: int, key: str = 'date_added', count: bool = False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.key = key
+        self.count = queryset.count() if count else None
+
+    def get_page(self, cursor: str = None) -> CursorPage:
+        """
+        Returns the page the cursor points to. Returns the first page if the cursor is not given
+        or is not valid.
+        """
+
+        direction, key_value, pk = self._position(cursor)
+
+        return self._page(self._fetch(key_value, pk, forward=direction == self.NEXT), direction, key_value)
+
+    async def aget_page(self, cursor: str = None) -> CursorPage:
+        """Version of `get_page` for async views, objects are fetched with the async ORM"""
+
+        direction, key_value, pk = self._position(cursor)
+
+        return self._page(await self._afetch(key_value, pk, forward=direction == self.NEXT), direction, key_value)
+
+    async def acount(self) -> int:
+        """Counts objects with the async ORM, for paginators created with `count=False` in async views"""
+
+        self.count = await self.queryset.acount()
+
+        return self.count
+
+    def _position(self, cursor: str) -> tuple:
+        """Returns the direction, the key value and the primary key stored in the cursor, or the start of the first page"""
+
+        decoded_cursor = self.decode_cursor(cursor) if cursor else None
+
+        return decoded_cursor or (self.NEXT, None, None)
+
+    def _page(self, objects: list, direction: str, key_value) -> CursorPage:
+        """Returns the page of objects fetched from the position provided"""
+
+        if direction == self.NEXT:
+            return CursorPage(objects[:self.per_page], self, has_next=len(objects) > self.per_page, has_previous=key_value is not None)
+
+        # Objects before the cursor are read backwards
+        return CursorPage(objects[:self.per_page][::-1], self, has_next=True, has_previous=len(objects) > self.per_page)
+
+    def encode_cursor(self, direction: str, obj) -> str:
+        """Returns an opaque token that points to the page before or after the object provided"""
+
+        key_value = getattr(obj, self.key)
+
+        if isinstance(key_value, datetime):
+            key_value = key_value.isoformat()
+
+        data = json.dumps([direction, key_value, obj.pk])
+
+        # Padding is stripped to keep tokens free of characters that are special in URLs
+        return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str):
+        """Returns the direction, the key value and the primary key stored in the token, or None if it is not valid"""
+
+        try:
+            direction, key_value, pk = json.loads(urlsafe_b64decode(cursor.encode() + b'=' * (-len(cursor) % 4)))
+
+            if direction not in (self.NEXT, self.PREVIOUS) or not isinstance(pk, int):
+                return None
+
+            # Dates are stored as strings, other keys are numbers
+            if isinstance(key_value, str):
+                key_value = datetime.fromisoformat(key_value)
+
+            elif not isinstance(key_value, (int, float)):
+                return None
+
+            return direction, key_value, pk
+
+        except (binascii.Error, ValueError, TypeError, UnicodeError):
+            return None
+
+    def _queryset(self, key_value, pk: int, forward: bool) -> QuerySet:
+        """
+        Returns up to `per_page + 1` objects that go after `(key_value, pk)` in forward order, or that go
+        before it in backward order. Objects are read from the beginning if `key_value` is None.
+        """
+
+        queryset = self.queryset
+
+        if key_value is not None and forward:
+            # Objects that go after the cursor: (key, id) < (key_value, pk)
+            queryset = queryset.filter(**{f'{ self.key }__lte': key_value}).exclude(**{self.key: key_value, 'pk__gte': pk})
+
+        elif key_value is not None:
+            # Objects that go before the cursor: (key, id) > (key_value, pk)
+            queryset = queryset.filter(**{f'{ self.key }__gte': key_value}).exclude(**{self.key: key_value, 'pk__lte': pk})
+
+        prefix = '-' if forward else ''
+
+        return queryset.order_by(f'{ prefix }{ self.key }', f'{ prefix }pk')[:self.per_page + 1]
+
+    def _fetch(self, key_value, pk: int, forward: bool) -> list:
+        return list(self._queryset(key_value, pk, forward))
+
+    async def _afetch(self, key_value, pk: int, forward: bool) -> list:
+        return [obj async for obj in self._queryset(key_value, pk, forward)]
@@ -0,0 +1,224 @@
+from collections import defaultdict
+
+from django.conf import settings as stg
+
+from .models import Translation
+from .utils import UserIndexRegistry
+
+import numpy as np
+import re
+
+
+# Number of values drawn per distractor or question, so that draws almost always have enough distinct ones
+OVERSAMPLING = 4
+
+# Attempts to draw distractors that are not answers of the question, before the question is dropped
+MAX_ATTEMPTS = 10
+
+
+def normalize(text: str) -> str:
+    """Returns the text the way near-duplicates are compared: casefolded, without punctuation and extra spaces"""
+
+    return ' '.join(re.findall(r'\w+', text.casefold()))
+
+
+class LanguageChoices:
+    """
+    Translations of user's words to one language, kept in NumPy arrays.
+
+    Translations that are the same once normalized share a code, and every code has one text, so distractors
+    repeat neither the answer nor each other. Distractors of many questions are drawn at once as a matrix of codes.
+    """
+
+    def __init__(self, word_ids: list, words: list, translations: list):
+        keys = np.array([normalize(translation) for translation in translations], dtype=object)
+        _, first_rows, codes = np.unique(keys, return_index=True, return_inverse=True)
+
+        self.word_ids = np.array(word_ids, dtype=np.int64)
+        self.words = np.array(words, dtype=object)
+        self.codes = codes.astype(np.int64)
+        self.texts = np.array(translations, dtype=object)[first_rows]
+
+        # Sorted pairs of word and code of every translation, since all translations of a word are its answers
+        self.answers = np.unique(self.word_ids * len(self.texts) + self.codes)
+
+    def __len__(self):
+        return len(self.word_ids)
+
+    def questions(self, rows: np.ndarray, distractors: int, rng: np.random.Generator) -> list:
+        """
+        Returns questions asking for the translations of the rows provided, with up to `distractors` wrong options each.
+        Questions that have no distractors are dropped.
+        """
+
+        distractors = min(distractors, len(self.texts) - 1)
+
+        if distractors < 1 or not len(rows):
+            return []
+
+        picks, found = self._distractors(rows, distractors, rng)
+        options = rng.permuted(np.column_stack([self.codes[rows], picks]), axis=1)
+
+        return [
+            {'word_id': int(self.word_ids[row]), 'word': self.words[row], 'options': list(self.texts[row_options])}
+            for row, row_options in zip(rows[found], options[found])
+        ]
+
+    def _distractors(self, rows: np.ndarray, count: int, rng: np.random.Generator) -> tuple:
+        """
+        Returns a matrix of `count` distinct distractor codes per row, and a mask of rows they were found for.
+        Codes are drawn for all rows at once, and only rows that drew an answer of their word are drawn again.
+        """
+
+        size = len(self.texts)
+        picks = np.zeros((len(rows), count), dtype=np.int64)
+        found = np.zeros(len(rows), dtype=bool)
+        pending = np.arange(len(rows))
+
+        for _ in range(MAX_ATTEMPTS):
+            sampled, distinct = self._sample(len(pending), count, rng)
+
+            # Codes from the answer's one up are shifted, so the answer itself is never drawn
+            sampled += sampled >= self.codes[rows[pending]][:, None]
+
+            answers = np.isin(self.word_ids[rows[pending]][:, None] * size + sampled, self.answers).any(axis=1)
+            valid = distinct & ~answers
+
+            picks[pending[valid]] = sampled[valid]
+            found[pending[valid]] = True
+            pending = pending[~valid]
+
+            if not len(pending):
+                break
+
+        return picks, found
+
+    def _sample(self, rows: int, count: int, rng: np.random.Generator) -> tuple:
+        """
+        Returns a matrix of `count` distinct codes per row drawn from all codes but the last one,
+        and a mask of rows that drew enough distinct codes.
+        """
+
+        population = len(self.texts) - 1
+
+        # Small pools are shuffled whole, large ones are drawn with replacement and deduplicated
+        if population <= OVERSAMPLING * count:
+            return np.argsort(rng.random((rows, population)), axis=1)[:, :count], np.ones(rows, dtype=bool)
+
+        draws = np.sort(rng.integers(0, population, size=(rows, OVERSAMPLING * count)), axis=1)
+
+        first = np.ones(draws.shape, dtype=bool)
+        first[:, 1:] = draws[:, 1:] != draws[:, :-1]
+        ranks = np.cumsum(first, axis=1)
+
+        distinct = ranks[:, -1] >= count
+        sampled = np.zeros((rows, count), dtype=np.int64)
+        sampled[distinct] = draws[distinct][(first & (ranks <= count))[distinct]].reshape(-1, count)
+
+        return sampled, distinct
+
+
+class QuizIndex:
+    """
+    In-memory index of user's translations grouped by their language, to build multiple choice quizzes.
+    Questions are drawn from all translations at once, and then every language draws distractors of its questions at once.
+    """
+
+    def __init__(self, translations=()):
+        columns = defaultdict(lambda: ([], [], []))
+
+        for language_id, word_id, word, translation in translations:
+            language_columns = columns[language_id]
+            language_columns[0].append(word_id)
+            language_columns[1].append(word)
+            language_columns[2].append(translation)
+
+        self.languages = {language_id: LanguageChoices(*language_columns) for language_id, language_columns in columns.items()}
+
+    def __len__(self):
+        return sum(len(choices) for choices in self.languages.values())
+
+    def quiz(self, size: int, options: int, rng: np.random.Generator, language_id: int = None) -> list:
+        """
+        Returns up to `size` questions with up to `options` options each, asking for translations to the language provided
+        or to any language. Every question is a dict of `word_id`, `word` and shuffled `options`, one of which is an answer.
+        Words are asked once, whatever the number of their translations.
+        """
+
+        languages = [
+            choices for choice_language_id, choices in self.languages.items()
+            if len(choices.texts) > 1 and language_id in (None, choice_language_id)
+        ]
+
+        sizes = np.array([len(choices) for choices in languages], dtype=np.int64)
+        ends = np.cumsum(sizes)
+
+        if not len(languages) or not ends[-1]:
+            return []
+
+        # Rows are numbered across languages, so questions are drawn uniformly from all translations.
+        # Words with several translations have several rows, so more rows are drawn and the first one of every word is kept
+        picks = rng.choice(ends[-1], size=min(OVERSAMPLING * size, ends[-1]), replace=False)
+        picked_languages = np.searchsorted(ends, picks, side='right')
+        rows = picks - (ends - sizes)[picked_languages]
+
+        word_ids = np.zeros(len(picks), dtype=np.int64)
+
+        for index, choices in enumerate(languages):
+            language_picks = picked_languages == index
+            word_ids[language_picks] = choices.word_ids[rows[language_picks]]
+
+        _, first_picks = np.unique(word_ids, return_index=True)
+        kept = np.sort(first_picks)[:size]
+        rows, picked_languages = rows[kept], picked_languages[kept]
+
+        questions = []
+
+        for index, choices in enumerate(languages):
+            questions.extend(choices.questions(rows[picked_languages == index], options - 1, rng))
+
+        return [questions[index] for index in rng.permutation(len(questions))]
+
+
+def build_index(user) -> QuizIndex:
+    """Builds the quiz index of the user's translations"""
+
+    translations = Translation.objects.filter(user=user).values_list('translation_language_id', 'word_id', 'word__word', 'translation')
+
+    return QuizIndex(translations.iterator())
+
+
+indexes = UserIndexRegistry(build_index, 'QUIZ_INDEX_TIMEOUT', 'QUIZ_INDEX_MAX_USERS')
+
+
+def make_quiz(user, language_id: int = None, seed: int = None) -> list:
+    """
+    Returns a quiz of up to `QUIZ_QUESTIONS` questions on the user's translations, each with up to `QUIZ_OPTIONS` options.
+    Random values are drawn from a generator seeded with `seed`, so the same index always gives the same quiz for it.
+    """
+
+    index = indexes.get(user)
+    rng = np.random.default_rng(seed)
+
+    # Indexes are replaced on changes, never changed in place, so quizzes are drawn without a lock
+    return index.quiz(stg.QUIZ_QUESTIONS, stg.QUIZ_OPTIONS, rng, language_id)
+
+
+def check_answers(user, answers: dict) -> dict:
+    """
+    Returns whether the answers provided, keyed by word ids, are translations of their words.
+    Answers are compared normalized, the same way near-duplicates are, with a single query.
+    """
+
+    translations = defaultdict(set)
+
+    for word_id, translation in Translation.objects.filter(user=user, word_id__in=answers).values_list('word_id', 'translation'):
+        translations[word_id].add(normalize(translation))
+
+    return {word_id: normalize(answer) in translations[word_id] for word_id, answer in answers.items()}
+
+
+def invalidate(user=None):
+    """Drops the index of the user provided, or indexes of all users, so that they are built again"""
+
+    indexes.invalidate(user)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings as stg
+from django.db.models import OuterRef, QuerySet, Subquery
+from django.utils import timezone
+
+from .models import Review, Translation
+
+
+# Grades of a review, from a forgotten word to one recalled without effort
+AGAIN = 1
+HARD = 2
+GOOD = 3
+EASY = 4
+
+GRADES = [
+    (AGAIN, 'Again'),
+    (HARD, 'Hard'),
+    (GOOD, 'Good'),
+    (EASY, 'Easy'),
+]
+
+MIN_EASE = 1.3
+EASE_CHANGES = {AGAIN: -0.2, HARD: -0.15, GOOD: 0, EASY: 0.15}
+
+# Days until the first review after a word is recalled for the first time
+FIRST_INTERVALS = {HARD: 1, GOOD: 1, EASY: 4}
+
+
+def add_words(words: list):
+    """Schedules saved words to be reviewed right away, creating their review states with a single query"""
+
+    now = timezone.now()
+
+    Review.objects.bulk_create([Review(word_id=word.pk, user_id=word.user_id, due_at=now) for word in words])
+
+
+def due_reviews(user, now: datetime = None) -> QuerySet:
+    """
+    Returns the user's reviews due by now, from the most overdue. Reviews are read from `review_user_due_at_idx`
+    as a range, so a batch of them is fetched without scanning the user's other words, however many there are.
+    Words are joined by primary key and annotated with `primary_translation`, the answer shown on their cards.
+    """
+
+    translations = Translation.objects.filter(word=OuterRef('word_id')).order_by('pk')
+
+    return (
+        Review.objects
+        .filter(user=user, due_at__lte=now or timezone.now())
+        .select_related('word', 'word__word_language')
+        .annotate(primary_translation=Subquery(translations.values('translation')[:1]))
+        .order_by('due_at', 'id')
+    )
+
+
+def schedule(review: Review, grade: int, now: datetime = None):
+    """
+    Changes the review state after the word is graded, following the SM-2 algorithm with four grades.
+    Forgotten words are shown again after `REVIEW_RELEARN_DELAY` seconds and start over, while intervals
+    of recalled words are multiplied by their ease, which grows for easy words and shrinks for hard ones.
+    """
+
+    now = now or timezone.now()
+
+    review.ease = max(MIN_EASE, review.ease + EASE_CHANGES[grade])
+    review.date_reviewed = now
+
+    if grade == AGAIN:
+        review.repetitions = 0
+        review.interval = 0
+        review.due_at = now + timedelta(seconds=stg.REVIEW_RELEARN_DELAY)
+        return
+
+    if review.repetitions == 0:
+        interval = FIRST_INTERVALS[grade]
+    else:
+        factors = {HARD: 1.2, GOOD: review.ease, EASY: review.ease * 1.3}
+        interval = max(round(review.interval * factors[grade]), review.interval + 1)
+
+    review.repetitions += 1
+    review.interval = interval
+    review.due_at = now + timedelta(days=interval)
@@ -0,0 +1,129 @@
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+from .models import Word
+from .pagination import CursorPaginator
+
+import re
+
+
+# Relative weights of the word, description, hints and translations columns in SQLite ranking,
+# the owner's token matches every word of the user and does not count
+SQLITE_WEIGHTS = (10.0, 1.0, 2.0, 5.0, 0.0)
+
+SQLITE_SEARCH = f"""
+    SELECT id, search_rank FROM (
+        SELECT rowid AS id, bm25(dictionary_word_fts, { ', '.join(map(str, SQLITE_WEIGHTS)) }) AS search_rank
+        FROM dictionary_word_fts
+        WHERE dictionary_word_fts MATCH %s
+    )
+"""
+
+SQLITE_COUNT = "SELECT count(*) FROM dictionary_word_fts WHERE dictionary_word_fts MATCH %s"
+
+# Ranks are negated, so that on both backends a lower rank means a better match
+POSTGRESQL_SEARCH = """
+    SELECT id, search_rank FROM (
+        SELECT word_id AS id, -ts_rank(document, to_tsquery('simple', %s)) AS search_rank
+        FROM dictionary_word_search
+        WHERE document @@ to_tsquery('simple', %s) AND user_id = %s
+    ) AS matches
+"""
+
+POSTGRESQL_COUNT = "SELECT count(*) FROM dictionary_word_search WHERE document @@ to_tsquery('simple', %s) AND user_id = %s"
+
+
+def is_search_index_supported() -> bool:
+    """Returns True if the database has a full-text search index of words, created by the migrations"""
+
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def search_terms(query: str) -> list:
+    """Splits the search query to terms, dropping characters that have a special meaning in search syntax"""
+
+    return re.findall(r'\w+', query.lower())
+
+
+class WordSearchPaginator(CursorPaginator):
+    """
+    Paginates user's words that match the search query, from the best match to the worst one.
+
+    Words are looked up in the full-text search index that covers words, descriptions, hints and
+    translations. Pages are fetched by keyset on `(search_rank, id)`, with the rank computed by the
+    database (`bm25` on SQLite, `ts_rank` on PostgreSQL).
+    """
+
+    def __init__(self, user, query: str, per_page: int, count: bool = False):
+        self.user = user
+        self.per_page = per_page
+        self.key = 'search_rank'
+        self.terms = search_terms(query)
+        self.count = self._count() if count else None
+
+    def _match_params(self) -> list:
+        """Returns the parameters of the search query that select matching words of the user"""
+
+        # Every term is matched as a prefix, so that incomplete words are found as well
+        if connection.vendor == 'postgresql':
+            tsquery = ' & '.join(f'{ term }:*' for term in self.terms)
+
+            return [tsquery, tsquery, self.user.pk]
+
+        # The owner's token selects the postings of the user, terms are matched in the other columns only
+        terms = ' '.join(f'"{ term }"*' for term in self.terms)
+
+        return [f'owner : u{ self.user.pk } AND {{word description hints translations}} : ({ terms })']
+
+    def _count(self) -> int:
+        if not self.terms:
+            return 0
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(POSTGRESQL_COUNT, self._match_params()[-2:])
+
+            else:
+                cursor.execute(SQLITE_COUNT, self._match_params())
+
+            return cursor.fetchone()[0]
+
+    async def acount(self) -> int:
+        # Raw queries have no async interface, they are made in a worker thread
+        self.count = await sync_to_async(self._count)()
+
+        return self.count
+
+    async def _afetch(self, key_value, pk: int, forward: bool) -> list:
+        return await sync_to_async(self._fetch)(key_value, pk, forward)
+
+    def _fetch(self, key_value, pk: int, forward: bool) -> list:
+        if not self.terms:
+            return []
+
+        sql = POSTGRESQL_SEARCH if connection.vendor == 'postgresql' else SQLITE_SEARCH
+        params = self._match_params()
+
+        if key_value is not None and forward:
+            sql += " WHERE search_rank > %s OR (search_rank = %s AND id > %s)"
+            params += [key_value, key_value, pk]
+
+        elif key_value is not None:
+            sql += " WHERE search_rank < %s OR (search_rank = %s AND id < %s)"
+            params += [key_value, key_value, pk]
+
+        order = 'ASC' if forward else 'DESC'
+        sql += f" ORDER BY search_rank { order }, id { order } LIMIT %s"
+        params.append(self.per_page + 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            ranks = dict(cursor.fetchall())
+
+        words = Word.objects.filter(user=self.user, pk__in=ranks).with_primary_translation().in_bulk()
+
+        for word in words.values():
+            word.search_rank = ranks[word.pk]
+
+        # Words are returned in the order of their ranks
+        return [words[word_id] for word_id in ranks if word_id in words]
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import versions
+from .deletion import add_tombstones
+from .models import Hint, Language, Translation, Word
+from .summary import cache_key
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+@receiver(post_save, sender=Word)
+@receiver(post_delete, sender=Word)
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+@receiver(post_save, sender=Hint)
+@receiver(post_delete, sender=Hint)
+def summary_changed(sender, instance, **kwargs):
+    # Counters are not updated in place, as concurrent changes would overwrite each other's updates. The summary
+    # is dropped once the change is committed, so that a reader in between does not cache it from the old rows
+    transaction.on_commit(lambda: cache.delete(cache_key(instance.user_id)))
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+@receiver(post_save, sender=Word)
+@receiver(post_delete, sender=Word)
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+@receiver(post_save, sender=Hint)
+@receiver(post_delete, sender=Hint)
+def dictionary_changed(sender, instance, **kwargs):
+    # Pages rendered from the previous version of the dictionary are not used anymore. The version is bumped once
+    # the change is committed, so that a page read in between is not cached with the old rows for the new version
+    transaction.on_commit(lambda: versions.bump(instance.user_id))
+
+
+@receiver(post_delete, sender=Language)
+@receiver(post_delete, sender=Word)
+@receiver(post_delete, sender=Translation)
+@receiver(post_delete, sender=Hint)
+def instance_deleted(sender, instance, origin=None, **kwargs):
+    # Instances deleted along with their user are not synced anymore, and tombstones cannot point to the user
+    if not isinstance(origin, User):
+        add_tombstones(sender, [(instance.pk, instance.user_id)])
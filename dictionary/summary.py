@@ -0,0 +1,109 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings as stg
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import Hint, Language, Translation, Word
+
+
+class DictionarySummary:
+    """
+    Numbers of user's languages, words, translations and hints, and the time of the last change.
+
+    Summaries are kept in the cache as plain dicts, built from the database and dropped by
+    the signal receivers in `dictionary.signals` on every change, to be built again on the next read.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    @property
+    def languages(self) -> list:
+        """Returns user's languages with their numbers of words and translations, from the most recent one"""
+
+        return sorted(self.data['languages'].values(), key=lambda language: (language['date_added'], language['id']), reverse=True)
+
+    @property
+    def words(self) -> int:
+        return self.data['words']
+
+    @property
+    def translations(self) -> int:
+        return self.data['translations']
+
+    @property
+    def hints(self) -> int:
+        return self.data['hints']
+
+    @property
+    def last_activity(self):
+        return self.data['last_activity']
+
+
+def cache_key(user_id: int) -> str:
+    return f'dictionary:summary:{ user_id }'
+
+
+def build_summary(user) -> dict:
+    """Counts user's languages, words, translations and hints in the database"""
+
+    languages = {
+        language['id']: {**language, 'words': 0, 'translations': 0}
+        for language in Language.objects.filter(user=user).values('id', 'language_name', 'date_added')
+    }
+
+    activity = [language['date_added'] for language in languages.values()]
+    words = translations = 0
+
+    for language_id, count, last_added in Word.objects.filter(user=user).values_list('word_language').annotate(Count('id'), Max('date_added')):
+        languages[language_id]['words'] = count
+        words += count
+        activity.append(last_added)
+
+    for language_id, count, last_added in Translation.objects.filter(user=user).values_list('translation_language').annotate(Count('id'), Max('date_added')):
+        languages[language_id]['translations'] = count
+        translations += count
+        activity.append(last_added)
+
+    hints = Hint.objects.filter(user=user).aggregate(count=Count('id'), last_added=Max('date_added'))
+
+    if hints['last_added']:
+        activity.append(hints['last_added'])
+
+    return {
+        'languages': languages,
+        'words': words,
+        'translations': translations,
+        'hints': hints['count'],
+        'last_activity': max(activity, default=None),
+    }
+
+
+def get_summary(user) -> DictionarySummary:
+    """Returns the summary of the user's dictionary, building it if it is not cached"""
+
+    data = cache.get(cache_key(user.pk))
+
+    if data is None:
+        data = build_summary(user)
+        cache.set(cache_key(user.pk), data, stg.SUMMARY_CACHE_TIMEOUT)
+
+    return DictionarySummary(data)
+
+
+async def aget_summary(user) -> DictionarySummary:
+    """Version of `get_summary` for async views, summaries that are not cached are built in a worker thread"""
+
+    data = await cache.aget(cache_key(user.pk))
+
+    if data is None:
+        data = await sync_to_async(build_summary)(user)
+        await cache.aset(cache_key(user.pk), data, stg.SUMMARY_CACHE_TIMEOUT)
+
+    return DictionarySummary(data)
+
+
+def invalidate(user):
+    """Drops the cached summary of the user, so that it is built again on the next read"""
+
+    cache.delete(cache_key(user.pk))
@@ -0,0 +1,163 @@
+"""
+Delta sync of user's languages, words, hints and translations.
+
+A sync reads the instances changed in the window `[since, until)` of `date_updated`, and the tombstones
+of the instances deleted in it, stream by stream with keyset pagination on `(date, id)`. `until` is fixed
+when a sync starts, so instances changed while its pages are read are sent by the next sync. The cursor
+of the last page starts the next sync `SYNC_OVERLAP` seconds before `until`, so that instances saved
+by transactions that committed late are not missed. Clients receive them again and apply them as they are.
+
+Tombstones are kept for `SYNC_TOMBSTONE_RETENTION` seconds and then pruned by the `prune_tombstones` command.
+Clients that did not sync for longer get a full sync instead, flagged by `full`, and drop the instances it lacks.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings as stg
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .batches import BATCHES
+from .models import Tombstone
+
+import binascii
+import json
+
+
+# Streams of changed instances, then the one of tombstones
+RESOURCES = ['languages', 'words', 'hints', 'translations']
+TOMBSTONES = len(RESOURCES)
+
+# Resources by names of their models, which tombstones store
+MODEL_RESOURCES = {BATCHES[resource].model._meta.model_name: resource for resource in RESOURCES}
+
+
+def encode_cursor(since: datetime, until: datetime = None, stream: int = 0, position: tuple = (None, None)) -> str:
+    """Returns an opaque token that points to a position in a sync, or to the start of the next one if `until` is None"""
+
+    dates = [date.isoformat() if date else None for date in (since, until, position[0])]
+    data = json.dumps([dates[0], dates[1], stream, dates[2], position[1]])
+
+    # Padding is stripped to keep tokens free of characters that are special in URLs
+    return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """Returns `since`, `until`, the stream and the position stored in the token, or None if it is not valid"""
+
+    try:
+        since, until, stream, date, pk = json.loads(urlsafe_b64decode(cursor.encode() + b'=' * (-len(cursor) % 4)))
+
+        # `since` is None while a full sync is read, and `until` once it is over
+        if since is None and until is None or not isinstance(stream, int) or not 0 <= stream <= TOMBSTONES:
+            return None
+
+        if (date is None) != (pk is None) or pk is not None and not isinstance(pk, int) or date is not None and until is None:
+            return None
+
+        since, until, date = [datetime.fromisoformat(value) if value is not None else None for value in (since, until, date)]
+
+        return since, until, stream, (date, pk)
+
+    except (binascii.Error, ValueError, TypeError, UnicodeError):
+        return None
+
+
+def stream_queryset(user, stream: int, since: datetime, until: datetime) -> tuple:
+    """Returns the queryset of the stream's instances changed in the window and the name of the date they are ordered by"""
+
+    if stream == TOMBSTONES:
+        queryset, key = Tombstone.objects.filter(user=user), 'date_deleted'
+
+    else:
+        queryset, key = BATCHES[RESOURCES[stream]](user).queryset(), 'date_updated'
+
+    queryset = queryset.filter(**{f'{ key }__lt': until})
+
+    if since is not None:
+        queryset = queryset.filter(**{f'{ key }__gte': since})
+
+    return queryset, key
+
+
+def read_stream(queryset: QuerySet, key: str, position: tuple, limit: int) -> list:
+    """Returns up to `limit` instances of the queryset that go after the position: (key, id) > (date, pk)"""
+
+    date, pk = position
+
+    if date is not None:
+        queryset = queryset.filter(**{f'{ key }__gte': date}).exclude(**{key: date, 'pk__lte': pk})
+
+    return list(queryset.order_by(key, 'pk')[:limit])
+
+
+def retention_start() -> datetime:
+    """Returns the time tombstones are kept since, syncs since an earlier time may miss deletions"""
+
+    return timezone.now() - timedelta(seconds=stg.SYNC_TOMBSTONE_RETENTION)
+
+
+def prune_tombstones() -> int:
+    """Deletes tombstones older than the retention window, returns their number"""
+
+    deleted, _ = Tombstone.objects.filter(date_deleted__lt=retention_start()).delete()
+
+    return deleted
+
+
+def get_changes(user, cursor: str = None) -> dict:
+    """
+    Returns a page of up to `SYNC_PAGE_SIZE` instances changed and deleted since the sync the cursor was returned by,
+    with the cursor of the next page, or of the next sync if `has_more` is False. All instances are returned without
+    a cursor, if it is not valid, or if its sync started before the retention window of tombstones, and no tombstones
+    then: the client drops the instances that are not returned instead.
+    """
+
+    since, until, stream, position = (decode_cursor(cursor) if cursor else None) or (None, None, 0, (None, None))
+
+    # Deletions since then may be pruned already, they are not known anymore
+    if since is not None and since < retention_start():
+        since, until, stream, position = None, None, 0, (None, None)
+
+    if until is None:
+        until = timezone.now()
+
+    changes = {resource: [] for resource in RESOURCES}
+    changes['deleted'] = {resource: [] for resource in RESOURCES}
+    changes['full'] = since is None
+    remaining = stg.SYNC_PAGE_SIZE
+
+    while stream < TOMBSTONES or stream == TOMBSTONES and since is not None:
+        queryset, key = stream_queryset(user, stream, since, until)
+
+        # An extra instance tells whether the stream goes on after the page
+        instances = read_stream(queryset, key, position, remaining + 1)
+        page = instances[:remaining]
+
+        if stream == TOMBSTONES:
+            for tombstone in page:
+                changes['deleted'][MODEL_RESOURCES[tombstone.model_name]].append(tombstone.object_id)
+
+        else:
+            writer = BATCHES[RESOURCES[stream]](user)
+            changes[RESOURCES[stream]] = [writer.serialize(instance) for instance in page]
+
+        remaining -= len(page)
+
+        if len(instances) > len(page):
+            # The page may be full before the stream starts
+            if page:
+                position = (getattr(page[-1], key), page[-1].pk)
+
+            changes['cursor'] = encode_cursor(since, until, stream, position)
+            changes['has_more'] = True
+
+            return changes
+
+        stream, position = stream + 1, (None, None)
+
+    changes['cursor'] = encode_cursor(until - timedelta(seconds=stg.SYNC_OVERLAP))
+    changes['has_more'] = False
+
+    return changes
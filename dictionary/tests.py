@@ -1,12 +1,66 @@
+from asgiref.sync import sync_to_async
 from django.test import Client, TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
-from django.core.paginator import Paginator, Page
-from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Lower
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from django.conf import settings as stg
 
-from dictionary.models import Hint, Language, Translation, Word
+from app.middleware import ENCODINGS, brotli, negotiate_encoding
+from dictionary import autocomplete, counters, fuzzy, quiz, reviews, summary, sync, versions
+from dictionary.benchmarks import SCENARIOS, Benchmark, compare
+from dictionary.deletion import LanguageDeleter
+from dictionary.generators import DictionaryGenerator
+from dictionary.importers import IMPORT_COLUMNS, PARQUET_SUPPORTED, WordsImporter
+from dictionary.jobs import claim_job, run_deletion_job, run_import_job
+from dictionary.models import DeletionJob, Hint, ImportJob, Language, Review, Tombstone, Translation, Word
+from dictionary.pagination import CursorPage, CursorPaginator
+from dictionary.search import is_search_index_supported
+from dictionary.utils import UserIndexRegistry
+
+from unittest import skipUnless
+
+import gzip
+import io
+import json
+import numpy as np
+import pandas as pd
+import shutil
+import tempfile
+import threading
+import time
+
+
+class QueryCountTestMixin:
+    """Helpers that check the number of queries made by views"""
+
+    def assertConstantQueriesPerPage(self, url: str, page_sizes=(1, 5)):
+        """Asserts that the page is rendered with the same number of queries regardless of the page size"""
+
+        query_counts = []
+
+        # Caches are warmed up first, so that every page size is measured the same way.
+        # Rendered fragments are not cached, otherwise pages would not be queried at all
+        with override_settings(FRAGMENT_CACHE_TIMEOUT=0):
+            self.client.get(url)
+
+        for page_size in page_sizes:
+            with override_settings(PAGINATOR_PER_PAGE=page_size, RECENT_WORD_COUNT=page_size, FRAGMENT_CACHE_TIMEOUT=0):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts)), 1, f"Number of queries depends on the page size: { query_counts }")
 
 
 @override_settings(RECENT_WORD_COUNT=3)
@@ -43,8 +97,9 @@ class IndexTests(TestCase):
                                 )
 
     def setUp(self):
-        """Login before each test start"""
+        """Login before each test start and drop summaries cached by other tests"""
         self.client.force_login(user=self.user1)
+        cache.clear()
 
     @override_settings(LOGIN_URL='/login/')
     def test_logout_redirects(self):
@@ -81,7 +136,7 @@ class IndexTests(TestCase):
         response_users_languages = response.context['languages']
 
         self.assertQuerysetEqual(response_recent_words, recent_words)
-        self.assertQuerysetEqual(response_users_languages, users_languages)
+        self.assertEqual([language['id'] for language in response_users_languages], [language.pk for language in users_languages])
 
 
 @override_settings(PAGINATOR_PER_PAGE=3)
@@ -118,8 +173,9 @@ class WordsListTests(TestCase):
                                 )
 
     def setUp(self):
-        """Login before each test start"""
+        """Login before each test start and drop fragments cached by other tests"""
         self.client.force_login(user=self.user1)
+        cache.clear()
 
     @override_settings(LOGIN_URL='/login/')
     def test_logout_redirects(self):
@@ -149,20 +205,97 @@ class WordsListTests(TestCase):
 
         response = self.client.get(reverse('dictionary:words_list'))
 
-        all_words = Word.objects.filter(user=self.user1).order_by('-date_added')
-        paginator = Paginator(all_words, stg.PAGINATOR_PER_PAGE)
-        page_obj = paginator.get_page(1)
+        all_words = Word.objects.filter(user=self.user1).order_by('-date_added', '-pk')
 
         response_words_page_object = response.context['words']
 
         # Test if `words` is a page object
-        self.assertIsInstance(response_words_page_object, Page)
-        self.assertQuerysetEqual(response_words_page_object.object_list, page_obj.object_list)
+        self.assertIsInstance(response_words_page_object, CursorPage)
         self.assertTrue(response_words_page_object.has_other_pages())
-        self.assertEqual(response_words_page_object.next_page_number(), 2)
+        self.assertFalse(response_words_page_object.has_previous())
+        self.assertIsNotNone(response_words_page_object.next_cursor)
 
         self.assertQuerysetEqual(all_words[:3], response_words_page_object.object_list)
 
+    def test_pages(self):
+        """Test if next and previous cursors point to the neighbouring pages"""
+
+        # Words added at the same time are ordered by their ids
+        Word.objects.filter(user=self.user1).update(date_added=timezone.now())
+        all_words = list(Word.objects.filter(user=self.user1).order_by('-date_added', '-pk'))
+
+        first_page = self.client.get(reverse('dictionary:words_list')).context['words']
+        second_page = self.client.get(reverse('dictionary:words_list'), {'cursor': first_page.next_cursor}).context['words']
+
+        self.assertEqual(second_page.object_list, all_words[3:])
+        self.assertFalse(second_page.has_next())
+        self.assertTrue(second_page.has_previous())
+
+        previous_page = self.client.get(reverse('dictionary:words_list'), {'cursor': second_page.previous_cursor}).context['words']
+
+        self.assertEqual(previous_page.object_list, all_words[:3])
+        self.assertFalse(previous_page.has_previous())
+
+    def test_invalid_cursor(self):
+        """Test if the first page is returned if the cursor is not valid"""
+
+        response = self.client.get(reverse('dictionary:words_list'), {'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['words'].has_previous())
+
+
+class WordListsQueriesTests(QueryCountTestMixin, TestCase):
+    """
+    Tests that pages with lists of words load translations in bulk
+    URL: /dictionary/, /dictionary/words/, /dictionary/words/search
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+
+        for i in range(5):
+            word = Word.objects.create(word=f"Word{ i }", user=cls.user1, word_language=cls.language1, description=f'Word\'s{ i } description')
+
+            Translation.objects.create(word=word, user=cls.user1, translation_language=cls.language2, translation=f'Translation{ i }')
+            Translation.objects.create(word=word, user=cls.user1, translation_language=cls.language2, translation=f'Other translation{ i }')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start and drop pages cached by other tests"""
+        self.client.force_login(user=self.user1)
+        cache.clear()
+
+    def test_primary_translation(self):
+        """Test if the first translation of each word is shown"""
+
+        response = self.client.get(reverse('dictionary:words_list'))
+
+        self.assertContains(response, 'Word4 (Translation4)')
+        self.assertNotContains(response, 'Other translation4')
+
+    def test_index_queries(self):
+        """Test if the number of queries does not depend on the number of recent words"""
+
+        self.assertConstantQueriesPerPage(reverse('dictionary:index'))
+
+    def test_words_list_queries(self):
+        """Test if the number of queries does not depend on the page size"""
+
+        self.assertConstantQueriesPerPage(reverse('dictionary:words_list'))
+
+    def test_search_words_queries(self):
+        """Test if the number of queries does not depend on the page size"""
+
+        self.assertConstantQueriesPerPage(f"{ reverse('dictionary:words_search') }?word=word")
+
 
 @override_settings(PAGINATOR_PER_PAGE=1)
 class LanguagesListTests(TestCase):
@@ -229,17 +362,15 @@ class LanguagesListTests(TestCase):
 
         response = self.client.get(reverse('dictionary:languages_list'))
 
-        all_languages = Language.objects.filter(user=self.user1).order_by('-date_added')
-        paginator = Paginator(all_languages, stg.PAGINATOR_PER_PAGE)
-        page_obj = paginator.get_page(1)
+        all_languages = Language.objects.filter(user=self.user1).order_by('-date_added', '-pk')
 
         response_languages_page_object = response.context['languages']
 
-        # Test if `words` is a page object
-        self.assertIsInstance(response_languages_page_object, Page)
-        self.assertQuerysetEqual(response_languages_page_object.object_list, page_obj.object_list)
+        # Test if `languages` is a page object
+        self.assertIsInstance(response_languages_page_object, CursorPage)
         self.assertTrue(response_languages_page_object.has_other_pages())
-        self.assertEqual(response_languages_page_object.next_page_number(), 2)
+        self.assertFalse(response_languages_page_object.has_previous())
+        self.assertIsNotNone(response_languages_page_object.next_cursor)
 
         self.assertQuerysetEqual(all_languages[:1], response_languages_page_object.object_list)
 
@@ -316,11 +447,23 @@ class WordDetailTests(TestCase):
 
         self.assertEqual(response.status_code, 404)
 
-    def test_raises_permission_denied_if_word_created_by_other_user(self):
-        """Test if a `PermissionDenied` error is raised if the word is created by another user"""
+    def test_raises_404_if_word_created_by_other_user(self):
+        """Test if a 404 error is raised if the word is created by another user, so that other users' words are not disclosed"""
 
         response = self.client.get(reverse('dictionary:word_detail', args=[2,]))
-        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.status_code, 404)
+
+    def test_number_of_queries(self):
+        """Test if the word is fetched with its language, translations and hints in a constant number of queries"""
+
+        Translation.objects.bulk_create([self.translation1, self.translation2, self.translation3])
+        Hint.objects.bulk_create([self.hint1, self.hint2])
+
+        # Session, user, the word with its language, its translations with their languages, its hints
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('dictionary:word_detail', args=[1,]))
+
+        self.assertContains(response, 'testtranslation3 (Russian)')
 
     def test_template(self):
         """Test if a required template is used"""
@@ -419,11 +562,11 @@ class LanguageDetailTests(TestCase):
 
         self.assertEqual(response.status_code, 404)
 
-    def test_raises_permission_denied_if_word_created_by_other_user(self):
-        """Test if a `PermissionDenied` error is raised if the element is created by another user"""
+    def test_raises_404_if_language_created_by_other_user(self):
+        """Test if a 404 error is raised if the language is created by another user"""
 
         response = self.client.get(reverse('dictionary:language_detail', args=[3,]))
-        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.status_code, 404)
 
     def test_template(self):
         """Test if a required template is used"""
@@ -542,6 +685,441 @@ class WordAddTests(TestCase):
         self.assertTemplateUsed(response, 'dictionary/add_word.html')
 
 
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class WordsFromFileAddTests(TestCase):
+    """
+    Tests `add_words_from_file` view and the import job it queues
+    URL: words/add/from_file/
+    """
+
+    header = 'Word,WordLanguage,Description,Hint,Translation,TranslationLanguage\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='english')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='Russian')
+
+        cls.client.force_login(user=cls.user1)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files"""
+
+        shutil.rmtree(stg.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def upload(self, content: str):
+        """Posts a .csv file with the content provided"""
+
+        file = SimpleUploadedFile('words.csv', content.encode('utf-8'), content_type='text/csv')
+
+        return self.client.post(reverse('dictionary:add_words_from_file'), {'file': file})
+
+    def import_file(self, content: str) -> ImportJob:
+        """Uploads a .csv file with the content provided and runs the job queued"""
+
+        self.upload(content)
+        job = ImportJob.objects.latest('pk')
+        run_import_job(job)
+
+        return ImportJob.objects.get(pk=job.pk)
+
+    @override_settings(LOGIN_URL='/login/')
+    def test_logout_redirects(self):
+        """Test if unauthorized user is redirected to the login page"""
+
+        self.client.logout()
+        response = self.client.get(reverse('dictionary:add_words_from_file'))
+
+        self.assertRedirects(response, f'/login/?next={ reverse("dictionary:add_words_from_file") }', target_status_code=200)
+
+    def test_template(self):
+        """Test if a required template is used"""
+
+        response = self.client.get(reverse('dictionary:add_words_from_file'))
+
+        self.assertTemplateUsed(response, 'dictionary/add_words_from_file.html')
+
+    def test_upload_queues_job(self):
+        """Test if an upload is queued as a job instead of being imported in the request"""
+
+        response = self.upload(self.header + 'bus,English,vehicle,big,автобус,russian\n')
+        job = ImportJob.objects.get(user=self.user1)
+
+        self.assertRedirects(response, f'{ reverse("dictionary:add_words_from_file") }?job={ job.pk }', target_status_code=200)
+        self.assertEqual(job.status, ImportJob.PENDING)
+        self.assertFalse(Word.objects.filter(user=self.user1).exists())
+
+        response = self.client.get(f'{ reverse("dictionary:add_words_from_file") }?job={ job.pk }')
+
+        self.assertEqual(response.context['job'], job)
+
+    def test_add_elements_with_correct_values(self):
+        """Test if elements are added correctly and languages are matched case-insensitively"""
+
+        job = self.import_file(self.header + 'bus,English,vehicle,big,автобус,russian\ncat,ENGLISH,animal,meow,кошка,Russian\n')
+
+        self.assertEqual(job.status, ImportJob.DONE)
+        self.assertEqual(job.rows_imported, 2)
+        self.assertFalse(job.file)
+
+        self.assertEqual(Language.objects.filter(user=self.user1).count(), 2)
+        russian = Language.objects.get(user=self.user1, language_name='Russian')
+
+        word = Word.objects.get(user=self.user1, word='Bus', word_language=self.language1, description='Vehicle')
+        self.assertTrue(Hint.objects.filter(word=word, user=self.user1, hint='Big').exists())
+        self.assertTrue(Translation.objects.filter(word=word, user=self.user1, translation_language=russian, translation='Автобус').exists())
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 2)
+
+    def test_number_of_queries_does_not_depend_on_rows(self):
+        """Test if a batch of rows is saved with a constant number of queries"""
+
+        rows = ''.join(f'word{ i },English,description,hint,translation{ i },Russian\n' for i in range(10))
+        file = SimpleUploadedFile('words.csv', (self.header + rows).encode('utf-8'))
+
+        # Languages lookup and creation, words, hints, translations, reviews and counters, each batch in a savepoint
+        with self.assertNumQueries(11):
+            WordsImporter(self.user1, batch_size=10).run_csv(file)
+
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 10)
+
+    def test_reports_invalid_rows(self):
+        """Test if invalid rows are reported with their numbers and nothing is saved"""
+
+        job = self.import_file(self.header + 'bus,English,vehicle,big,автобус,Russian\ncat,English,,meow,кошка,Russian\ndog,English,animal,woof,hund,english\n')
+
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertIn("Row 3: 'Description' is empty!", job.errors)
+        self.assertIn("Row 4: word's language and translation's language cannot be the same!", job.errors)
+        self.assertFalse(Word.objects.filter(user=self.user1).exists())
+        self.assertFalse(Language.objects.filter(user=self.user1, language_name='Russian').exists())
+
+    @override_settings(IMPORT_BATCH_SIZE=2)
+    def test_file_is_imported_in_chunks(self):
+        """Test if a file that spans several chunks is imported and its rows are numbered across chunks"""
+
+        rows = ''.join(f'word{ i },English,description,hint,translation{ i },Russian\n' for i in range(5))
+
+        job = self.import_file(self.header + rows)
+
+        self.assertEqual(job.status, ImportJob.DONE)
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 5)
+        self.assertEqual(Translation.objects.filter(user=self.user1, translation_language__language_name='Russian').count(), 5)
+
+        job = self.import_file(self.header + rows + 'word5,English,description,,translation5,Russian\n')
+
+        self.assertIn("Row 7: 'Hint' is empty!", job.errors)
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 5)
+
+    @override_settings(IMPORT_BATCH_SIZE=2)
+    def test_claimed_job_resumes(self):
+        """Test if a job claimed again after its worker died skips the rows the worker committed"""
+
+        rows = ''.join(f'word{ i },English,description,hint,translation{ i },Russian\n' for i in range(5))
+        self.upload(self.header + rows)
+        job = ImportJob.objects.latest('pk')
+
+        # The first worker committed the first batch of three rows before it died
+        WordsImporter(self.user1, batch_size=3).run(pd.read_csv(io.StringIO(self.header + rows), dtype=str).iloc[:3])
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJob.RUNNING, rows_imported=3, date_heartbeat=None)
+
+        run_import_job(claim_job(ImportJob))
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.rows_imported, job.rows_total), (ImportJob.DONE, 5, 5))
+        self.assertEqual(sorted(Word.objects.filter(user=self.user1).values_list('word', flat=True)), [f'Word{ i }' for i in range(5)])
+        self.assertEqual(Language.objects.get(user=self.user1, language_name='english').word_count, 5)
+
+    def test_progress_is_reported_while_validating(self):
+        """Test if progress is reported for every chunk validated, so that a long validation keeps the job claimed"""
+
+        rows = ''.join(f'word{ i },English,description,hint,translation{ i },Russian\n' for i in range(3))
+        reports = []
+
+        WordsImporter(self.user1, batch_size=1, on_progress=lambda *args: reports.append(args)).run_csv(SimpleUploadedFile('words.csv', (self.header + rows).encode()))
+
+        self.assertEqual(reports[:3], [(0, 1), (0, 2), (0, 3)])
+        self.assertEqual(reports[-1], (3, 3))
+
+    def test_reports_invalid_schema(self):
+        """Test if a file with unknown columns is rejected"""
+
+        job = self.import_file('Word,Language\nbus,English\n')
+
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertEqual(len(job.errors), 1)
+        self.assertFalse(Word.objects.filter(user=self.user1).exists())
+
+    @skipUnless(PARQUET_SUPPORTED, "pyarrow is not installed")
+    def test_parquet_file(self):
+        """Test if a .parquet file is imported and invalid ones are reported"""
+
+        df = pd.read_csv(io.StringIO(self.header + 'bus,English,vehicle,big,автобус,russian\ncat,English,animal,,кошка,Russian\n'), dtype=str)
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+
+        self.client.post(reverse('dictionary:add_words_from_file'), {'file': SimpleUploadedFile('words.parquet', buffer.getvalue())})
+        job = ImportJob.objects.latest('pk')
+        run_import_job(job)
+        job.refresh_from_db()
+
+        self.assertEqual(job.errors, ["Row 3: 'Hint' is empty!"])
+
+        df.loc[1, 'Hint'] = 'meow'
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+
+        self.client.post(reverse('dictionary:add_words_from_file'), {'file': SimpleUploadedFile('words.parquet', buffer.getvalue())})
+        job = ImportJob.objects.latest('pk')
+        run_import_job(job)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, ImportJob.DONE)
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 2)
+
+        self.client.post(reverse('dictionary:add_words_from_file'), {'file': SimpleUploadedFile('words.parquet', b'not a parquet file')})
+        job = ImportJob.objects.latest('pk')
+        run_import_job(job)
+        job.refresh_from_db()
+
+        self.assertEqual(job.errors, ["File is not a valid .parquet file!"])
+
+    @skipUnless(not PARQUET_SUPPORTED, "pyarrow is installed")
+    def test_parquet_file_requires_pyarrow(self):
+        """Test if .parquet files are rejected if pyarrow is not installed"""
+
+        response = self.client.post(reverse('dictionary:add_words_from_file'), {'file': SimpleUploadedFile('words.parquet', b'PAR1')})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['dictionary_file_form'].has_error('file'))
+        self.assertFalse(ImportJob.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImportJobDetailTests(TestCase):
+    """
+    Tests `import_job_detail` view
+    URL: words/add/from_file/<int:job_id>/
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.job1 = ImportJob.objects.create(user=cls.user1, file=SimpleUploadedFile('words.csv', b''), rows_total=10, rows_imported=4, status=ImportJob.RUNNING)
+        cls.job2 = ImportJob.objects.create(user=cls.user2, file=SimpleUploadedFile('words.csv', b''))
+
+        cls.client.force_login(user=cls.user1)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files"""
+
+        shutil.rmtree(stg.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def test_response(self):
+        """Test if the progress of the job is returned"""
+
+        response = self.client.get(reverse('dictionary:import_job_detail', args=[self.job1.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], ImportJob.RUNNING)
+        self.assertEqual(response.json()['rows_total'], 10)
+        self.assertEqual(response.json()['rows_imported'], 4)
+
+    def test_raises_404_if_job_does_not_exist(self):
+        """Test if a 404 error is raised if the job does not exist"""
+
+        response = self.client.get(reverse('dictionary:import_job_detail', args=[999]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_raises_404_if_job_created_by_other_user(self):
+        """Test if a 404 error is raised if the job is created by another user"""
+
+        response = self.client.get(reverse('dictionary:import_job_detail', args=[self.job2.pk]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class WordsExportTests(TestCase):
+    """
+    Tests `export_words` view
+    URL: words/export
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        for word, translation in [('Bus', 'Автобус'), ('Cat', 'Кот'), ('Dog', 'Собака')]:
+            new_word = Word.objects.create(word=word, user=cls.user1, word_language=cls.language1, description=f'{ word }, "quoted"')
+
+            Hint.objects.create(word=new_word, user=cls.user1, hint=f'{ word } hint')
+            Translation.objects.create(word=new_word, user=cls.user1, translation_language=cls.language2, translation=translation)
+            Translation.objects.create(word=new_word, user=cls.user1, translation_language=cls.language2, translation='Other')
+
+        Word.objects.create(word='Tree', user=cls.user1, word_language=cls.language1, description='Plant')
+        Word.objects.create(word='Fox', user=cls.user2, word_language=cls.language3, description='Animal')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def export(self, export_format: str) -> str:
+        """Returns the content of the file exported in the format provided"""
+
+        response = self.client.get(reverse('dictionary:export_words'), {'format': export_format})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn(f'dictionary.{ export_format }', response['Content-Disposition'])
+
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv(self):
+        """Test if words are exported with a row per translation in the import schema"""
+
+        df = pd.read_csv(io.StringIO(self.export('csv')), dtype=str)
+
+        self.assertEqual(list(df.columns), IMPORT_COLUMNS)
+        self.assertEqual(list(df['Word']), ['Bus', 'Bus', 'Cat', 'Cat', 'Dog', 'Dog', 'Tree'])
+        self.assertEqual(list(df['Translation'].fillna('')), ['Автобус', 'Other', 'Кот', 'Other', 'Собака', 'Other', ''])
+        self.assertEqual(list(df.iloc[0]), ['Bus', 'English', 'Bus, "quoted"', 'Bus hint', 'Автобус', 'Russian'])
+        self.assertEqual(list(df.iloc[1]), ['Bus', 'English', 'Bus, "quoted"', 'Bus hint', 'Other', 'Russian'])
+
+    def test_jsonl(self):
+        """Test if every word is exported as a JSON object keyed by the import schema"""
+
+        rows = [json.loads(line) for line in self.export('jsonl').splitlines()]
+
+        self.assertEqual([row['Word'] for row in rows], ['Bus', 'Bus', 'Cat', 'Cat', 'Dog', 'Dog', 'Tree'])
+        self.assertEqual(rows[2], {
+            'Word': 'Cat', 'WordLanguage': 'English', 'Description': 'Cat, "quoted"',
+            'Hint': 'Cat hint', 'Translation': 'Кот', 'TranslationLanguage': 'Russian',
+        })
+        self.assertIsNone(rows[6]['Translation'])
+
+    def test_exported_file_can_be_imported(self):
+        """Test if the exported .csv file is a valid import file"""
+
+        importer = WordsImporter(self.user2)
+
+        self.assertFalse(importer.run_csv(SimpleUploadedFile('words.csv', self.export('csv').encode('utf-8'))))
+        self.assertEqual(importer.error_messages(), ["Row 8: 'Hint' is empty!", "Row 8: 'Translation' is empty!", "Row 8: 'TranslationLanguage' is empty!"])
+
+        Word.objects.filter(word='Tree').delete()
+
+        self.assertTrue(WordsImporter(self.user2).run_csv(SimpleUploadedFile('words.csv', self.export('csv').encode('utf-8'))))
+        self.assertEqual(Word.objects.filter(user=self.user2).count(), 4)
+        self.assertEqual(Hint.objects.filter(user=self.user2).count(), 3)
+        self.assertEqual(Translation.objects.filter(user=self.user2).count(), 6)
+
+    def test_all_hints_and_translations_are_exported(self):
+        """Test if a word with several hints and translations is imported back with all of them"""
+
+        Word.objects.filter(user=self.user1).delete()
+        language3 = Language.objects.create(user=self.user1, language_name='German')
+        word = Word.objects.create(word='Car', user=self.user1, word_language=self.language1, description='Vehicle')
+
+        for hint in ('Wheels', 'Engine'):
+            Hint.objects.create(word=word, user=self.user1, hint=hint)
+
+        for translation, language in [('Машина', self.language2), ('Автомобиль', self.language2), ('Auto', language3)]:
+            Translation.objects.create(word=word, user=self.user1, translation_language=language, translation=translation)
+
+        content = self.export('csv')
+        df = pd.read_csv(io.StringIO(content), dtype=str)
+
+        self.assertEqual(list(df['Hint']), ['Wheels', 'Engine', 'Engine'])
+        self.assertEqual(list(df['Translation']), ['Машина', 'Автомобиль', 'Auto'])
+
+        # Every row of the word is saved in its own batch
+        self.assertTrue(WordsImporter(self.user2, batch_size=1).run_csv(SimpleUploadedFile('words.csv', content.encode('utf-8'))))
+
+        # An import resumed after the first row adds the other ones to the word it committed
+        user3 = User.objects.create_user(username='usrnm3', password='psswd3')
+        self.assertTrue(WordsImporter(user3).run(df.iloc[:1]))
+        self.assertTrue(WordsImporter(user3, start=1).run_csv(SimpleUploadedFile('words.csv', content.encode('utf-8'))))
+
+        for user in (self.user2, user3):
+            imported = Word.objects.get(user=user, word='Car')
+
+            self.assertEqual(sorted(imported.hints.values_list('hint', flat=True)), ['Engine', 'Wheels'])
+            self.assertEqual(
+                sorted(imported.translations.values_list('translation', 'translation_language__language_name')),
+                [('Auto', 'German'), ('Автомобиль', 'Russian'), ('Машина', 'Russian')],
+            )
+
+    def test_queries_per_chunk(self):
+        """Test if hints and translations are loaded once per chunk rather than per word"""
+
+        with CaptureQueriesContext(connection) as queries:
+            self.export('csv')
+
+        # Session, user, languages, then words and their hints and translations for each of 2 chunks
+        self.assertEqual(len(queries), 3 + 1 + 2 * 2)
+
+    def test_empty_dictionary(self):
+        """Test if only the header is exported if there are no words"""
+
+        self.client.force_login(user=User.objects.create_user(username='usrnm3', password='psswd3'))
+
+        self.assertEqual(self.export('csv').strip(), ','.join(IMPORT_COLUMNS))
+        self.assertEqual(self.export('jsonl'), '')
+
+    @skipUnless(PARQUET_SUPPORTED, "pyarrow is not installed")
+    def test_parquet(self):
+        """Test if words are exported to a .parquet file that can be imported back"""
+
+        content = b''.join(self.client.get(reverse('dictionary:export_words'), {'format': 'parquet'}).streaming_content)
+        df = pd.read_parquet(io.BytesIO(content))
+
+        self.assertEqual(list(df.columns), IMPORT_COLUMNS)
+        self.assertEqual(list(df['Word']), ['Bus', 'Bus', 'Cat', 'Cat', 'Dog', 'Dog', 'Tree'])
+        self.assertEqual(list(df.iloc[0]), ['Bus', 'English', 'Bus, "quoted"', 'Bus hint', 'Автобус', 'Russian'])
+
+        Word.objects.filter(word='Tree').delete()
+        content = b''.join(self.client.get(reverse('dictionary:export_words'), {'format': 'parquet'}).streaming_content)
+
+        self.assertTrue(WordsImporter(self.user2).run_parquet(SimpleUploadedFile('words.parquet', content)))
+        self.assertEqual(Word.objects.filter(user=self.user2).count(), 4)
+
+    def test_invalid_format(self):
+        """Test if a 400 error is returned if the format is not supported"""
+
+        response = self.client.get(reverse('dictionary:export_words'), {'format': 'xml'})
+
+        self.assertEqual(response.status_code, 400)
+
+
 class LanguageAddTests(TestCase):
     """
     Tests `add_language` view
@@ -608,6 +1186,15 @@ class LanguageAddTests(TestCase):
 
         self.assertIsNotNone(created_language)
 
+    def test_add_duplicate_element(self):
+        """Test if a language with the same name in other case is not added"""
+
+        response = self.client.post(reverse('dictionary:add_language'), data={'language_name': 'ENGLISH'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['language_form'].has_error('language_name'))
+        self.assertEqual(Language.objects.filter(user=self.user1).count(), 2)
+
     def test_template(self):
         """Test if a required template is used"""
 
@@ -715,14 +1302,43 @@ class WordEditTests(TestCase):
 
         self.assertTemplateUsed(response, 'dictionary/add_word.html')
 
+    def test_word_without_hint_and_translation(self):
+        """Test if the first hint and translation are created for words added without them, eg. by the API"""
 
-class LanguageEditTests(TestCase):
-    """
-    Tests `edit_language` view
-    URL: languages/edit/<int:language_id>
-    """
+        word = Word.objects.get(id=3)
 
-    @classmethod
+        self.assertEqual(self.client.get(reverse('dictionary:edit_word', args=[word.pk])).status_code, 200)
+
+        data = {'word': 'new_word', 'word_language': self.language1.pk, 'description': 'Description', 'hint': 'new_hint', 'translation': 'new_translation', 'translation_language': self.language2.pk}
+        response = self.client.post(reverse('dictionary:edit_word', args=[word.pk]), data)
+
+        self.assertRedirects(response, reverse('dictionary:word_detail', args=[word.pk]), target_status_code=200)
+        self.assertEqual(list(word.hints.values_list('hint', flat=True)), ['new_hint'])
+        self.assertEqual(list(word.translations.values_list('translation', flat=True)), ['new_translation'])
+        self.assertEqual(Language.objects.get(pk=self.language2.pk).translation_count, 1)
+
+    def test_word_with_many_translations(self):
+        """Test if the first translation is edited when the word has several ones"""
+
+        word = Word.objects.get(id=1)
+        second = Translation.objects.create(word=word, user=self.user1, translation_language=self.language2, translation='second')
+
+        self.assertEqual(self.client.get(reverse('dictionary:edit_word', args=[word.pk])).status_code, 200)
+
+        data = {'word': 'new_word', 'word_language': self.language1.pk, 'description': 'Description', 'hint': 'new_hint', 'translation': 'new_translation', 'translation_language': self.language2.pk}
+        self.client.post(reverse('dictionary:edit_word', args=[word.pk]), data)
+
+        self.assertEqual(Translation.objects.get(pk=self.translation1.pk).translation, 'new_translation')
+        self.assertEqual(Translation.objects.get(pk=second.pk).translation, 'second')
+
+
+class LanguageEditTests(TestCase):
+    """
+    Tests `edit_language` view
+    URL: languages/edit/<int:language_id>
+    """
+
+    @classmethod
     def setUpTestData(cls):
         """Setting up test data"""
 
@@ -841,7 +1457,8 @@ class WordDeleteTests(TestCase):
         """Test if invalid user tries to delete some users word"""
         
         response = self.client.get(reverse('dictionary:delete_word', args=[2,]))
-        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Word.objects.filter(pk=2).exists())
 
     def test_add_element_with_correct_values(self):
         """Test if a an element is added correctly"""
@@ -892,7 +1509,8 @@ class LanguageDeleteTests(TestCase):
         """Test if invalid user tries to delete some users word"""
         
         response = self.client.get(reverse('dictionary:delete_language', args=[3,]))
-        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Language.objects.filter(pk=3).exists())
 
     def test_add_element_with_correct_values(self):
         """Test if a an element is added correctly"""
@@ -902,3 +1520,2199 @@ class LanguageDeleteTests(TestCase):
         self.assertRedirects(response, reverse("dictionary:languages_list"), target_status_code=200)
 
         self.assertRaises(Language.DoesNotExist, Language.objects.get, id=2)
+
+
+@skipUnless(is_search_index_supported(), "Database has no full-text search index")
+@override_settings(PAGINATOR_PER_PAGE=2)
+class WordSearchTests(TestCase):
+    """
+    Tests `search_words` view
+    URL: words/search
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Big vehicle')
+        cls.car = Word.objects.create(word='Car', user=cls.user1, word_language=cls.language1, description='Small vehicle, not a bus')
+        cls.cat = Word.objects.create(word='Cat', user=cls.user1, word_language=cls.language1, description='Animal')
+        cls.other_bus = Word.objects.create(word='Bus', user=cls.user2, word_language=cls.language3, description='Vehicle')
+
+        Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+        Hint.objects.create(word=cls.cat, user=cls.user1, hint='Says meow')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def search(self, query: str, **params) -> list:
+        """Returns words found by the query provided"""
+
+        response = self.client.get(reverse('dictionary:words_search'), {'word': query, **params})
+
+        self.assertEqual(response.status_code, 200)
+
+        return list(response.context['words'])
+
+    def test_template(self):
+        """Test if a required template is used"""
+
+        response = self.client.get(reverse('dictionary:words_search'), {'word': 'bus'})
+
+        self.assertTemplateUsed(response, 'dictionary/word_search.html')
+
+    def test_searches_all_fields(self):
+        """Test if descriptions, hints and translations are searched along with words"""
+
+        self.assertEqual(self.search('автобус'), [self.bus])
+        self.assertEqual(self.search('meow'), [self.cat])
+        self.assertEqual(self.search('anim'), [self.cat])
+        self.assertEqual(self.search('small vehicle'), [self.car])
+
+    def test_results_are_ranked(self):
+        """Test if a match in the word ranks higher than a match in the description"""
+
+        self.assertEqual(self.search('bus'), [self.bus, self.car])
+
+    def test_index_is_updated(self):
+        """Test if edited and deleted words are found by their new values"""
+
+        Word.objects.filter(pk=self.car.pk).update(word='Automobile')
+        Hint.objects.create(word=self.car, user=self.user1, hint='Drives fast')
+        self.cat.delete()
+
+        self.assertEqual(self.search('automobile'), [self.car])
+        self.assertEqual(self.search('drives'), [self.car])
+        self.assertEqual(self.search('meow'), [])
+
+    @override_settings(PAGINATOR_PER_PAGE=1)
+    def test_pages(self):
+        """Test if ranked results are split to pages by cursors"""
+
+        first_page = self.client.get(reverse('dictionary:words_search'), {'word': 'bus'}).context['words']
+
+        self.assertEqual(list(first_page), [self.bus])
+        self.assertTrue(first_page.has_next())
+
+        second_page = self.client.get(reverse('dictionary:words_search'), {'word': 'bus', 'cursor': first_page.next_cursor}).context['words']
+
+        self.assertEqual(list(second_page), [self.car])
+        self.assertFalse(second_page.has_next())
+
+        previous_page = self.search('bus', cursor=second_page.previous_cursor)
+
+        self.assertEqual(previous_page, [self.bus])
+
+    def test_query_syntax_is_escaped(self):
+        """Test if characters that have a special meaning in search syntax do not break the search"""
+
+        self.assertEqual(self.search('"bus* (car'), [self.car])
+
+    def test_owner_is_not_searched(self):
+        """Test if words of other users are not found, and the token of the owner is not matched by terms"""
+
+        self.assertEqual(self.search(f'u{ self.user1.pk }'), [])
+        self.assertEqual(self.search('u'), [])
+
+        self.client.force_login(user=self.user2)
+
+        self.assertEqual(self.search('bus'), [self.other_bus])
+
+
+class FuzzyWordSearchTests(TestCase):
+    """
+    Tests `search_words` view in the fuzzy mode
+    URL: words/search?fuzzy=on
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.necessary = Word.objects.create(word='Necessary', user=cls.user1, word_language=cls.language1, description='Needed')
+        cls.other_necessary = Word.objects.create(word='Necessary', user=cls.user2, word_language=cls.language3, description='Needed')
+
+        Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start and drop indexes built by other tests"""
+
+        self.client.force_login(user=self.user1)
+        fuzzy.invalidate()
+
+    def search(self, query: str) -> list:
+        """Returns words found by the query provided"""
+
+        response = self.client.get(reverse('dictionary:words_search'), {'word': query, 'fuzzy': 'on'})
+
+        self.assertEqual(response.status_code, 200)
+
+        return response.context['words']
+
+    def test_finds_misspelled_words(self):
+        """Test if words and translations are found despite typos"""
+
+        self.assertEqual(self.search('neccesary'), [self.necessary])
+        self.assertEqual(self.search('автобс'), [self.bus])
+
+    def test_ignores_different_words(self):
+        """Test if words that are not similar to the query are not found"""
+
+        self.assertEqual(self.search('elephant'), [])
+
+    def test_index_is_updated(self):
+        """Test if words added and deleted through views are reflected in the built index"""
+
+        self.search('bus')
+
+        self.client.post(reverse('dictionary:add_word'), data={
+            'word': 'Elephant',
+            'word_language': self.language1.pk,
+            'description': 'Animal',
+            'hint': 'Big',
+            'translation_language': self.language2.pk,
+            'translation': 'Слон',
+        })
+        self.client.get(reverse('dictionary:delete_word', args=[self.necessary.pk]))
+
+        self.assertEqual([word.word for word in self.search('elefant')], ['Elephant'])
+        self.assertEqual(self.search('neccesary'), [])
+
+    def test_trigram_index_narrows_candidates(self):
+        """Test if the index returns the closest words first and respects the limit"""
+
+        index = fuzzy.TrigramIndex()
+        index.set_word(1, ['colour'])
+        index.set_word(2, ['color', 'hue'])
+        index.set_word(3, ['cat'])
+
+        self.assertEqual([word_id for word_id, _ in index.search('colr', limit=5, threshold=0.2)], [2, 1])
+        self.assertEqual([word_id for word_id, _ in index.search('colr', limit=1, threshold=0.2)], [2])
+
+        index.remove_word(2)
+
+        self.assertEqual([word_id for word_id, _ in index.search('colr', limit=5, threshold=0.2)], [1])
+
+    def bump_elsewhere(self):
+        """Bumps the version of the first user's dictionary the way another process does"""
+
+        thread = threading.Thread(target=versions.bump, args=[self.user1.pk])
+        thread.start()
+        thread.join()
+
+    def test_index_follows_version(self):
+        """Test if the index is built again once another process changes the dictionary"""
+
+        self.search('bus')
+        Word.objects.create(word='Elephant', user=self.user1, word_language=self.language1, description='Animal')
+        self.bump_elsewhere()
+
+        self.assertEqual([word.word for word in self.search('elefant')], ['Elephant'])
+
+    def test_own_changes_are_applied_in_place(self):
+        """Test if changes of the current thread keep the index, and changes made elsewhere in between drop it"""
+
+        index = fuzzy.indexes.get(self.user1)
+        versions.bump(self.user1.pk)
+        fuzzy.remove_word(self.user1, self.necessary.pk)
+
+        self.assertIs(fuzzy.indexes.get(self.user1), index)
+        self.assertEqual(self.search('neccesary'), [])
+
+        self.bump_elsewhere()
+        versions.bump(self.user1.pk)
+        fuzzy.index_word(self.necessary, [])
+
+        with fuzzy.indexes.lock:
+            self.assertIsNone(fuzzy.indexes.peek(self.user1.pk))
+
+    def test_build_is_discarded_after_invalidation(self):
+        """Test if an index invalidated while it is built is returned, but not stored"""
+
+        def build(user):
+            registry.invalidate(user)
+            return fuzzy.TrigramIndex()
+
+        registry = UserIndexRegistry(build, 'FUZZY_INDEX_TIMEOUT', 'FUZZY_INDEX_MAX_USERS')
+
+        self.assertIsNotNone(registry.get(self.user1))
+
+        with registry.lock:
+            self.assertIsNone(registry.peek(self.user1.pk))
+
+
+class AutocompleteWordsTests(TestCase):
+    """
+    Tests `autocomplete_words` view
+    URL: words/autocomplete
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.business = Word.objects.create(word='Business', user=cls.user1, word_language=cls.language1, description='Trade')
+        cls.cat = Word.objects.create(word='Cat', user=cls.user1, word_language=cls.language1, description='Animal')
+        cls.other_bus = Word.objects.create(word='Bush', user=cls.user2, word_language=cls.language3, description='Plant')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start and drop indexes built by other tests"""
+
+        self.client.force_login(user=self.user1)
+        autocomplete.invalidate()
+
+    def complete(self, term: str) -> list:
+        """Returns words that complete the term provided"""
+
+        response = self.client.get(reverse('dictionary:words_autocomplete'), {'term': term})
+
+        self.assertEqual(response.status_code, 200)
+
+        return [result['word'] for result in response.json()['results']]
+
+    def test_completes_prefix(self):
+        """Test if user's words that start with the term are returned in alphabetical order"""
+
+        self.assertEqual(self.complete('bu'), ['Bus', 'Business'])
+        self.assertEqual(self.complete('BUSI'), ['Business'])
+        self.assertEqual(self.complete('dog'), [])
+        self.assertEqual(self.complete(''), [])
+
+    @override_settings(AUTOCOMPLETE_RESULTS=1)
+    def test_limit(self):
+        """Test if no more than `AUTOCOMPLETE_RESULTS` words are returned"""
+
+        self.assertEqual(self.complete('bu'), ['Bus'])
+
+    def test_words_are_not_queried_again(self):
+        """Test if keystrokes are answered from the built index without querying words"""
+
+        self.complete('b')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.complete('bus'), ['Bus', 'Business'])
+
+        self.assertFalse([query for query in queries.captured_queries if 'dictionary_word' in query['sql']])
+
+    def test_words_imported_elsewhere_are_completed(self):
+        """Test if words imported by the job worker are completed once it bumps the dictionary's version"""
+
+        self.complete('b')
+
+        Word.objects.create(word='Bicycle', user=self.user1, word_language=self.language1, description='Vehicle')
+        thread = threading.Thread(target=versions.bump, args=[self.user1.pk])
+        thread.start()
+        thread.join()
+
+        self.assertEqual(self.complete('bi'), ['Bicycle'])
+
+    def test_index_is_updated(self):
+        """Test if words added, edited and deleted through views are reflected in the built index"""
+
+        self.complete('b')
+
+        self.client.post(reverse('dictionary:add_word'), data={
+            'word': 'Bicycle',
+            'word_language': self.language1.pk,
+            'description': 'Vehicle',
+            'hint': 'Two wheels',
+            'translation_language': self.language2.pk,
+            'translation': 'Велосипед',
+        })
+        self.client.get(reverse('dictionary:delete_word', args=[self.business.pk]))
+
+        self.assertEqual(self.complete('b'), ['Bicycle', 'Bus'])
+
+    def test_login_required(self):
+        """Test if anonymous users are redirected to the login page"""
+
+        self.client.logout()
+        response = self.client.get(reverse('dictionary:words_autocomplete'), {'term': 'bu'})
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_prefix_index(self):
+        """Test if the index keeps words sorted when they are changed"""
+
+        index = autocomplete.PrefixIndex([(1, 'Cat'), (2, 'car'), (3, 'Dog')])
+
+        self.assertEqual(index.complete('ca', limit=5), [(2, 'car'), (1, 'Cat')])
+
+        index.set_word(2, 'Dot')
+        index.remove_word(1)
+
+        self.assertEqual(index.complete('ca', limit=5), [])
+        self.assertEqual(index.complete('do', limit=5), [(3, 'Dog'), (2, 'Dot')])
+        self.assertEqual(len(index), 2)
+
+
+class DictionarySummaryTests(TestCase):
+    """
+    Tests the cached summary of user's dictionary
+    URL: /dictionary/, /dictionary/languages/<int: language_id>
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.cat = Word.objects.create(word='Cat', user=cls.user1, word_language=cls.language1, description='Animal')
+        Word.objects.create(word='Dog', user=cls.user2, word_language=cls.language3, description='Animal')
+
+        Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+        Hint.objects.create(word=cls.bus, user=cls.user1, hint='Big')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start and drop summaries cached by other tests"""
+
+        self.client.force_login(user=self.user1)
+        cache.clear()
+
+    def assertSummaryEqual(self, expected: dict):
+        """Asserts that the cached summary of the first user matches the one built from the database"""
+
+        cached = summary.get_summary(self.user1).data
+        built = summary.build_summary(self.user1)
+
+        for data in (cached, built):
+            self.assertEqual({key: data[key] for key in ('words', 'translations', 'hints')}, expected['totals'])
+            self.assertEqual(
+                {language_id: (language['words'], language['translations']) for language_id, language in data['languages'].items()},
+                expected['languages']
+            )
+
+    def test_summary(self):
+        """Test if user's languages, words, translations and hints are counted"""
+
+        self.assertSummaryEqual({
+            'totals': {'words': 2, 'translations': 1, 'hints': 1},
+            'languages': {self.language1.pk: (2, 0), self.language2.pk: (0, 1)},
+        })
+
+    def test_pages_read_summary_from_cache(self):
+        """Test if the dashboard does not count words once the summary is cached"""
+
+        response = self.client.get(reverse('dictionary:index'))
+
+        self.assertEqual(response.context['summary'].words, 2)
+        self.assertContains(response, '2 words, 0 translations')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('dictionary:index'))
+
+        self.assertFalse([query for query in queries.captured_queries if 'COUNT(' in query['sql'].upper()])
+
+    def test_summary_is_updated(self):
+        """Test if the cached summary follows changes of the dictionary"""
+
+        before = summary.get_summary(self.user1).last_activity
+
+        with self.captureOnCommitCallbacks(execute=True):
+            language = Language.objects.create(user=self.user1, language_name='German')
+            word = Word.objects.create(word='Hund', user=self.user1, word_language=language, description='Animal')
+            Translation.objects.create(word=word, user=self.user1, translation_language=self.language1, translation='Dog')
+            Hint.objects.create(word=word, user=self.user1, hint='Barks')
+            self.cat.delete()
+
+        self.assertSummaryEqual({
+            'totals': {'words': 2, 'translations': 2, 'hints': 2},
+            'languages': {self.language1.pk: (1, 1), self.language2.pk: (0, 1), language.pk: (1, 0)},
+        })
+        self.assertGreater(summary.get_summary(self.user1).last_activity, before)
+
+        self.bus.word_language = self.language2
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bus.save()
+            self.language1.delete()
+
+        self.assertSummaryEqual({
+            'totals': {'words': 2, 'translations': 1, 'hints': 2},
+            'languages': {self.language2.pk: (1, 1), language.pk: (1, 0)},
+        })
+
+    def test_summary_is_dropped_on_commit(self):
+        """
+        Test if changes drop the cached summary instead of updating it, so that concurrent changes are not lost,
+        once they are committed, so that it is not built again from the old rows in between
+        """
+
+        summary.get_summary(self.user1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Hint.objects.create(word=self.cat, user=self.user1, hint='Meows')
+
+            self.assertIsNotNone(cache.get(summary.cache_key(self.user1.pk)))
+
+        self.assertIsNone(cache.get(summary.cache_key(self.user1.pk)))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class LanguageCountersTests(QueryCountTestMixin, TestCase):
+    """
+    Tests the numbers of words and translations stored in languages
+    URL: /dictionary/languages/, /dictionary/languages/<int: language_id>
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user1, language_name='German')
+        cls.language4 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.client.force_login(user=cls.user1)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files"""
+
+        shutil.rmtree(stg.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def add_word(self, word: str, word_language: Language, translation_language: Language) -> Word:
+        """Adds a word with a translation through the view"""
+
+        self.client.post(reverse('dictionary:add_word'), {
+            'word': word,
+            'word_language': word_language.pk,
+            'description': 'Description',
+            'hint': 'Hint',
+            'translation_language': translation_language.pk,
+            'translation': f'{ word } translation',
+        })
+
+        return Word.objects.get(user=self.user1, word=word)
+
+    def assertCountersEqual(self, expected: dict):
+        """Asserts that the counters of languages are the expected ones and match the rows in the database"""
+
+        for language in Language.objects.filter(user=self.user1):
+            words = Word.objects.filter(word_language=language).count()
+            translations = Translation.objects.filter(translation_language=language).count()
+
+            self.assertEqual((language.word_count, language.translation_count), (words, translations), language.language_name)
+            self.assertEqual((words, translations), expected.get(language.pk, (0, 0)), language.language_name)
+
+    def test_words_added_and_deleted(self):
+        """Test if counters follow words added, edited and deleted through views"""
+
+        bus = self.add_word('Bus', self.language1, self.language2)
+        cat = self.add_word('Cat', self.language1, self.language3)
+
+        self.assertCountersEqual({self.language1.pk: (2, 0), self.language2.pk: (0, 1), self.language3.pk: (0, 1)})
+
+        self.client.post(reverse('dictionary:edit_word', args=[cat.pk]), {
+            'word': 'Cat',
+            'word_language': self.language2.pk,
+            'description': 'Description',
+            'hint': 'Hint',
+            'translation_language': self.language1.pk,
+            'translation': 'Cat translation',
+        })
+
+        self.assertCountersEqual({self.language1.pk: (1, 1), self.language2.pk: (1, 1)})
+
+        self.client.get(reverse('dictionary:delete_word', args=[bus.pk]))
+
+        self.assertCountersEqual({self.language2.pk: (1, 0), self.language1.pk: (0, 1)})
+
+    def test_language_deleted(self):
+        """Test if translations of the words of a deleted language are not counted anymore"""
+
+        self.add_word('Bus', self.language1, self.language2)
+        self.add_word('Cat', self.language1, self.language3)
+        self.add_word('Hund', self.language3, self.language1)
+
+        self.client.get(reverse('dictionary:delete_language', args=[self.language1.pk]))
+
+        self.assertCountersEqual({self.language3.pk: (1, 0)})
+
+    def test_words_imported(self):
+        """Test if words imported from a file are counted"""
+
+        file = SimpleUploadedFile('words.csv', (
+            'Word,WordLanguage,Description,Hint,Translation,TranslationLanguage\n'
+            'Bus,English,Vehicle,Big,Автобус,Russian\n'
+            'Cat,English,Animal,Meows,Кошка,Russian\n'
+            'Hund,German,Animal,Barks,Dog,English\n'
+        ).encode())
+        run_import_job(ImportJob.objects.create(user=self.user1, file=file))
+
+        self.assertCountersEqual({self.language1.pk: (2, 1), self.language2.pk: (0, 2), self.language3.pk: (1, 0)})
+
+    def test_pages_show_counters(self):
+        """Test if counters are shown without counting words per language"""
+
+        self.add_word('Bus', self.language1, self.language2)
+
+        response = self.client.get(reverse('dictionary:language_detail', args=[self.language1.pk]))
+        self.assertContains(response, 'Words: 1')
+
+        response = self.client.get(reverse('dictionary:languages_list'))
+        self.assertContains(response, '(1 words, 0 translations)')
+
+        self.assertConstantQueriesPerPage(reverse('dictionary:languages_list'))
+
+    def test_recount_command(self):
+        """Test if the command fixes counters of languages changed outside the views"""
+
+        self.add_word('Bus', self.language1, self.language2)
+        Word.objects.create(word='Cat', user=self.user1, word_language=self.language1, description='Animal')
+        Language.objects.filter(pk=self.language4.pk).update(word_count=5)
+
+        output = io.StringIO()
+        call_command('recount_languages', users=['usrnm'], stdout=output)
+
+        self.assertIn('Fixed counters of 1 languages', output.getvalue())
+        self.assertCountersEqual({self.language1.pk: (2, 0), self.language2.pk: (0, 1)})
+        self.assertEqual(Language.objects.get(pk=self.language4.pk).word_count, 5)
+
+        output = io.StringIO()
+        call_command('recount_languages', stdout=output)
+
+        self.assertIn('Fixed counters of 1 languages', output.getvalue())
+        self.assertEqual(Language.objects.get(pk=self.language4.pk).word_count, 0)
+
+
+@override_settings(DELETION_BATCH_PAUSE=0)
+class LanguageDeletionTests(TestCase):
+    """
+    Tests `LanguageDeleter`, deletion jobs and `cancel_deletion_job` view
+    URL: /dictionary/languages/delete/<int: language_id>, /dictionary/languages/delete/jobs/<int: job_id>/cancel
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        for i in range(5):
+            word = Word.objects.create(word=f'Word{ i }', user=cls.user1, word_language=cls.language1, description='Description')
+            Hint.objects.create(word=word, user=cls.user1, hint='Hint')
+            Translation.objects.create(word=word, user=cls.user1, translation=f'Слово{ i }', translation_language=cls.language2)
+            Review.objects.create(word=word, user=cls.user1, due_at=timezone.now())
+
+        for i in range(3):
+            word = Word.objects.create(word=f'Слово{ i + 5 }', user=cls.user1, word_language=cls.language2, description='Description')
+            Translation.objects.create(word=word, user=cls.user1, translation=f'Word{ i + 5 }', translation_language=cls.language1)
+
+        word = Word.objects.create(word='Dog', user=cls.user2, word_language=cls.language3, description='Animal')
+        Hint.objects.create(word=word, user=cls.user2, hint='Barks')
+
+        counters.recount(Language.objects.all())
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def test_deletes_language_in_batches(self):
+        """Test if the language is deleted with its words, their dependents and translations to it"""
+
+        progress = []
+        deleter = LanguageDeleter(Language.objects.get(pk=self.language1.pk), batch_size=2, on_progress=lambda *args: progress.append(args))
+
+        self.assertTrue(deleter.run())
+
+        self.assertFalse(Language.objects.filter(pk=self.language1.pk).exists())
+        self.assertFalse(Word.objects.filter(word_language_id=self.language1.pk).exists())
+        self.assertFalse(Translation.objects.filter(translation_language_id=self.language1.pk).exists())
+        self.assertEqual(Hint.objects.filter(word__user=self.user1).count(), 0)
+        self.assertFalse(Review.objects.filter(word__word_language_id=self.language1.pk).exists())
+        self.assertEqual(Translation.objects.count(), 0)
+        self.assertEqual(progress, [(2, 8), (4, 8), (5, 8), (7, 8), (8, 8)])
+
+        # Other languages keep their words, but not translations to them from the language deleted
+        language2 = Language.objects.get(pk=self.language2.pk)
+        self.assertEqual((language2.word_count, language2.translation_count), (3, 0))
+        self.assertTrue(Hint.objects.filter(word__user=self.user2).exists())
+        self.assertTrue(Language.objects.filter(pk=self.language3.pk).exists())
+
+    def test_queries_do_not_depend_on_batch_size(self):
+        """Test if a batch is deleted with the same number of queries, however many rows it has"""
+
+        def count_queries(batch_size: int) -> int:
+            deleter = LanguageDeleter(Language.objects.get(pk=self.language1.pk), batch_size=batch_size)
+
+            with CaptureQueriesContext(connection) as queries:
+                deleter._delete_words()
+
+            return len(queries)
+
+        self.assertEqual(count_queries(1), count_queries(4))
+
+    def test_cancelled_deletion_keeps_language(self):
+        """Test if the deletion stops between batches once it is cancelled"""
+
+        batches = []
+        deleter = LanguageDeleter(
+            Language.objects.get(pk=self.language1.pk), batch_size=2,
+            on_progress=lambda *args: batches.append(args), is_cancelled=lambda: len(batches) == 2,
+        )
+
+        self.assertFalse(deleter.run())
+
+        language1 = Language.objects.get(pk=self.language1.pk)
+        self.assertEqual(deleter.deleted, 4)
+        self.assertEqual((language1.word_count, language1.translation_count), (1, 3))
+        self.assertEqual(Word.objects.filter(word_language=language1).count(), 1)
+        self.assertEqual(Language.objects.get(pk=self.language2.pk).translation_count, 1)
+
+    @override_settings(DELETION_SYNC_LIMIT=3)
+    def test_large_language_is_queued(self):
+        """Test if a language with more words than the limit is deleted by a job"""
+
+        response = self.client.get(reverse('dictionary:delete_language', args=[self.language1.pk]))
+        job = DeletionJob.objects.get(language=self.language1)
+
+        self.assertRedirects(response, f"{ reverse('dictionary:languages_list') }?job={ job.pk }", target_status_code=200)
+        self.assertEqual((job.status, job.language_name), (DeletionJob.PENDING, 'English'))
+        self.assertTrue(Language.objects.filter(pk=self.language1.pk).exists())
+
+        # The language is not queued twice
+        self.client.get(reverse('dictionary:delete_language', args=[self.language1.pk]))
+        self.assertEqual(DeletionJob.objects.count(), 1)
+
+        response = self.client.get(reverse('dictionary:languages_list'), {'job': job.pk})
+        self.assertContains(response, 'The English language is being deleted')
+
+        run_deletion_job(job)
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.rows_deleted, job.language), (DeletionJob.DONE, 8, None))
+        self.assertFalse(Language.objects.filter(pk=self.language1.pk).exists())
+
+        response = self.client.get(reverse('dictionary:languages_list'), {'job': job.pk})
+        self.assertContains(response, 'The English language was deleted!')
+
+    @override_settings(DELETION_SYNC_LIMIT=6)
+    def test_translations_count_towards_limit(self):
+        """Test if translations to a language count towards the limit, as they are deleted along with its words"""
+
+        # 5 words and 3 translations to the language
+        response = self.client.get(reverse('dictionary:delete_language', args=[self.language1.pk]))
+        job = DeletionJob.objects.get(language=self.language1)
+
+        self.assertRedirects(response, f"{ reverse('dictionary:languages_list') }?job={ job.pk }", target_status_code=200)
+
+        url = reverse('dictionary:api_batch', args=['languages'])
+        results = self.client.post(url, json.dumps({'delete': [self.language1.pk]}), content_type='application/json').json()['delete']
+
+        self.assertEqual(results[0]['status'], 'invalid')
+        self.assertTrue(Language.objects.filter(pk=self.language1.pk).exists())
+
+    @override_settings(DELETION_BATCH_SIZE=1, DELETION_BATCH_PAUSE=10)
+    def test_request_does_not_pause(self):
+        """Test if a language deleted in the request is not paused between batches, unlike in the job"""
+
+        started = time.monotonic()
+        self.client.get(reverse('dictionary:delete_language', args=[self.language1.pk]))
+
+        self.assertFalse(Language.objects.filter(pk=self.language1.pk).exists())
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_cancel_job(self):
+        """Test if a queued deletion is cancelled by its owner only"""
+
+        job = DeletionJob.objects.create(user=self.user1, language=self.language1, language_name='English')
+        response = self.client.get(reverse('dictionary:cancel_deletion_job', args=[job.pk]))
+
+        self.assertRedirects(response, f"{ reverse('dictionary:languages_list') }?job={ job.pk }", target_status_code=200)
+
+        run_deletion_job(DeletionJob.objects.get(pk=job.pk))
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.rows_deleted), (DeletionJob.CANCELLED, 0))
+        self.assertTrue(Language.objects.filter(pk=self.language1.pk).exists())
+
+        self.client.force_login(user=self.user2)
+        job = DeletionJob.objects.create(user=self.user1, language=self.language2, language_name='Russian')
+        response = self.client.get(reverse('dictionary:cancel_deletion_job', args=[job.pk]))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(DeletionJob.objects.get(pk=job.pk).status, DeletionJob.PENDING)
+
+    def test_stale_job_is_claimed_again(self):
+        """Test if a running job that has not been reported for too long is claimed again, and a reported one is not"""
+
+        job = DeletionJob.objects.create(user=self.user1, language=self.language1, language_name='English')
+
+        self.assertEqual(claim_job(DeletionJob), job)
+        self.assertIsNone(claim_job(DeletionJob))
+
+        DeletionJob.objects.filter(pk=job.pk).update(date_heartbeat=timezone.now() - timezone.timedelta(seconds=stg.JOB_HEARTBEAT_TIMEOUT + 1))
+        claimed = claim_job(DeletionJob)
+
+        self.assertEqual((claimed, claimed.status), (job, DeletionJob.RUNNING))
+        self.assertGreater(claimed.date_heartbeat, timezone.now() - timezone.timedelta(minutes=1))
+        self.assertIsNone(claim_job(DeletionJob))
+
+
+class ReviewTests(TestCase):
+    """
+    Tests spaced repetition reviews, `review_words` and `review_word` views
+    URL: /dictionary/review/, /dictionary/review/<int: word_id>
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.cat = Word.objects.create(word='Cat', user=cls.user1, word_language=cls.language1, description='Animal')
+        cls.dog = Word.objects.create(word='Dog', user=cls.user2, word_language=cls.language3, description='Animal')
+        Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+
+        now = timezone.now()
+        Review.objects.create(word=cls.bus, user=cls.user1, due_at=now - timezone.timedelta(days=2))
+        Review.objects.create(word=cls.cat, user=cls.user1, due_at=now + timezone.timedelta(days=2))
+        Review.objects.create(word=cls.dog, user=cls.user2, due_at=now - timezone.timedelta(days=3))
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    @override_settings(LOGIN_URL='/login/')
+    def test_logout_redirects(self):
+        """Test if unauthorized user is redirected to the login page"""
+
+        self.client.logout()
+        response = self.client.get(reverse('dictionary:review_words'))
+
+        self.assertRedirects(response, f'/login/?next={ reverse("dictionary:review_words") }', target_status_code=200)
+
+    def test_words_added_are_due(self):
+        """Test if words added through the view are due to be reviewed right away"""
+
+        self.client.post(reverse('dictionary:add_word'), {
+            'word': 'Tree',
+            'word_language': self.language1.pk,
+            'description': 'Plant',
+            'hint': 'Green',
+            'translation_language': self.language2.pk,
+            'translation': 'Дерево',
+        })
+
+        review = Review.objects.get(word__word='Tree')
+
+        self.assertEqual(review.user, self.user1)
+        self.assertLessEqual(review.due_at, timezone.now())
+
+    def test_due_queue(self):
+        """Test if only user's words due are queued, from the most overdue, with a single query"""
+
+        Review.objects.filter(word=self.cat).update(due_at=timezone.now() - timezone.timedelta(days=5))
+
+        with self.assertNumQueries(1):
+            due = [(review.word.word, review.word.word_language.language_name, review.primary_translation) for review in reviews.due_reviews(self.user1)[:50]]
+
+        self.assertEqual(due, [('Cat', 'English', None), ('Bus', 'English', 'Автобус')])
+
+    def test_review_page(self):
+        """Test if the page shows the word due first and the number of words due"""
+
+        response = self.client.get(reverse('dictionary:review_words'))
+
+        self.assertEqual(response.context['review'].word, self.bus)
+        self.assertEqual(response.context['due_count'], 1)
+        self.assertContains(response, 'Автобус')
+
+        Review.objects.filter(word=self.bus).update(due_at=timezone.now() + timezone.timedelta(days=1))
+        response = self.client.get(reverse('dictionary:review_words'))
+
+        self.assertContains(response, 'There are no words due to be reviewed')
+
+    def test_schedule(self):
+        """Test if intervals grow with successful reviews and forgotten words start over"""
+
+        now = timezone.now()
+        review = Review(word=self.bus, user=self.user1, due_at=now)
+
+        intervals = []
+        for grade in (reviews.GOOD, reviews.GOOD, reviews.GOOD, reviews.EASY):
+            reviews.schedule(review, grade, now)
+            intervals.append(review.interval)
+
+        self.assertEqual(intervals, [1, 2, 5, 17])
+        self.assertEqual(review.due_at, now + timezone.timedelta(days=17))
+        self.assertAlmostEqual(review.ease, 2.65)
+
+        reviews.schedule(review, reviews.AGAIN, now)
+
+        self.assertEqual((review.repetitions, review.interval), (0, 0))
+        self.assertEqual(review.due_at, now + timezone.timedelta(seconds=stg.REVIEW_RELEARN_DELAY))
+        self.assertAlmostEqual(review.ease, 2.45)
+
+        for _ in range(10):
+            reviews.schedule(review, reviews.HARD, now)
+
+        self.assertEqual(review.ease, reviews.MIN_EASE)
+
+    def test_grade_word(self):
+        """Test if a graded word is scheduled to be reviewed later"""
+
+        response = self.client.post(reverse('dictionary:review_word', args=[self.bus.pk]), {'grade': reviews.GOOD})
+
+        self.assertRedirects(response, reverse('dictionary:review_words'), target_status_code=200)
+
+        review = Review.objects.get(word=self.bus)
+
+        self.assertEqual((review.repetitions, review.interval), (1, 1))
+        self.assertGreater(review.due_at, timezone.now())
+        self.assertIsNotNone(review.date_reviewed)
+
+    def test_grade_invalid(self):
+        """Test if invalid grades, other users' words and GET requests are rejected"""
+
+        response = self.client.post(reverse('dictionary:review_word', args=[self.bus.pk]), {'grade': 7})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(reverse('dictionary:review_word', args=[self.dog.pk]), {'grade': reviews.GOOD})
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(reverse('dictionary:review_word', args=[self.bus.pk]))
+        self.assertEqual(response.status_code, 405)
+
+        self.assertEqual(Review.objects.get(word=self.bus).repetitions, 0)
+        self.assertEqual(Review.objects.get(word=self.dog).repetitions, 0)
+
+
+@override_settings(QUIZ_QUESTIONS=10, QUIZ_OPTIONS=3)
+class QuizTests(TestCase):
+    """
+    Tests the quiz index and `quiz_words` view
+    URL: /dictionary/quiz/
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user1, language_name='German')
+        cls.language4 = Language.objects.create(user=cls.user2, language_name='Russian')
+
+        translations = [('Bus', 'Автобус'), ('Cat', 'Кошка'), ('Dog', 'Собака'), ('Car', 'Машина'), ('Tree', 'Дерево')]
+
+        for word, translation in translations:
+            new_word = Word.objects.create(word=word, user=cls.user1, word_language=cls.language1, description='Description')
+            Translation.objects.create(word=new_word, user=cls.user1, translation_language=cls.language2, translation=translation)
+
+        cls.cat = Word.objects.get(word='Cat')
+        Translation.objects.create(word=cls.cat, user=cls.user1, translation_language=cls.language2, translation='Кот')
+        Translation.objects.create(word=cls.cat, user=cls.user1, translation_language=cls.language3, translation='Katze')
+
+        dog = Word.objects.create(word='Dog', user=cls.user2, word_language=cls.language4, description='Animal')
+        Translation.objects.create(word=dog, user=cls.user2, translation_language=cls.language4, translation='Пёс')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+
+        quiz.invalidate()
+        self.client.force_login(user=self.user1)
+
+    def test_index_follows_version(self):
+        """Test if words deleted by another process, eg. the job worker, are not asked once it bumps the version"""
+
+        self.assertEqual(len(quiz.make_quiz(self.user1, seed=0)), 5)
+
+        Word.objects.filter(user=self.user1, word='Tree').delete()
+        thread = threading.Thread(target=versions.bump, args=[self.user1.pk])
+        thread.start()
+        thread.join()
+
+        questions = quiz.make_quiz(self.user1, seed=0)
+
+        self.assertEqual(len(questions), 4)
+        self.assertNotIn('Tree', [question['word'] for question in questions])
+
+    def test_distractors(self):
+        """Test if options are distinct translations to the same language and only one of them is an answer"""
+
+        answers = {
+            word_id: set(Translation.objects.filter(word_id=word_id).values_list('translation', flat=True))
+            for word_id in Word.objects.filter(user=self.user1).values_list('pk', flat=True)
+        }
+
+        for seed in range(20):
+            questions = quiz.make_quiz(self.user1, seed=seed)
+
+            # Cat is asked once, although it has two translations to Russian
+            self.assertEqual(len(questions), 5)
+            self.assertEqual(len({question['word_id'] for question in questions}), 5)
+
+            for question in questions:
+                options = question['options']
+
+                self.assertEqual(len(options), 3)
+                self.assertEqual(len(set(options)), 3)
+                self.assertEqual(len(answers[question['word_id']] & set(options)), 1, question)
+                self.assertTrue(set(options) <= {'Автобус', 'Кошка', 'Кот', 'Собака', 'Машина', 'Дерево'})
+
+    def test_near_duplicates(self):
+        """Test if translations that only differ in case and punctuation are not both options"""
+
+        index = quiz.QuizIndex([(1, 1, 'Bus', 'Автобус'), (1, 2, 'Coach', 'автобус!'), (1, 3, 'Cat', 'Кошка')])
+
+        questions = index.quiz(10, 4, np.random.default_rng(0))
+
+        self.assertEqual(len(questions), 3)
+        self.assertTrue(all(len(question['options']) == 2 for question in questions))
+        self.assertTrue(all({option.lower() for option in question['options']} == {'автобус', 'кошка'} for question in questions))
+
+    def test_large_pool(self):
+        """Test if distractors drawn from a pool larger than the oversampled draws are distinct and not answers"""
+
+        index = quiz.QuizIndex((1, word_id, f'Word{ word_id }', f'Translation{ word_id }') for word_id in range(1000))
+        questions = index.quiz(100, 4, np.random.default_rng(0))
+
+        self.assertEqual(len(questions), 100)
+        self.assertEqual(len({question['word_id'] for question in questions}), 100)
+
+        for question in questions:
+            self.assertEqual(len(set(question['options'])), 4)
+            self.assertEqual(question['options'].count(f"Translation{ question['word_id'] }"), 1)
+
+    def test_words_are_asked_once(self):
+        """Test if words translated to several languages are asked once, so that their answers are not mixed up"""
+
+        rows = [(language_id, word_id, f'Word{ word_id }', f'Translation{ word_id }-{ language_id }') for word_id in range(10) for language_id in (1, 2)]
+        index = quiz.QuizIndex(rows)
+
+        for seed in range(20):
+            questions = index.quiz(20, 4, np.random.default_rng(seed))
+
+            self.assertEqual(sorted(question['word_id'] for question in questions), list(range(10)))
+
+    def test_language_filter(self):
+        """Test if questions are limited to the language provided, and languages without distractors are skipped"""
+
+        questions = quiz.make_quiz(self.user1, language_id=self.language3.pk, seed=0)
+        self.assertEqual(questions, [])
+
+        questions = quiz.make_quiz(self.user1, language_id=self.language2.pk, seed=0)
+        self.assertEqual(len(questions), 5)
+
+    def test_index_is_cached(self):
+        """Test if the index is built with a single query and invalidated when words change"""
+
+        with self.assertNumQueries(1):
+            quiz.make_quiz(self.user1)
+
+        with self.assertNumQueries(0):
+            quiz.make_quiz(self.user1)
+
+        self.client.get(reverse('dictionary:delete_word', args=[self.cat.pk]))
+
+        with self.assertNumQueries(1):
+            questions = quiz.make_quiz(self.user1, seed=0)
+
+        self.assertEqual(len(questions), 4)
+
+    def test_quiz_page(self):
+        """Test if the quiz is rendered and answers posted are checked"""
+
+        response = self.client.get(reverse('dictionary:quiz_words'), {'language': self.language2.pk})
+
+        self.assertEqual(len(response.context['questions']), 5)
+        self.assertContains(response, 'name="answer-')
+
+        bus = Word.objects.get(word='Bus')
+        response = self.client.post(reverse('dictionary:quiz_words'), {
+            'word': [bus.pk, self.cat.pk, 999],
+            f'answer-{ bus.pk }': 'автобус',
+            f'answer-{ self.cat.pk }': 'Собака',
+        })
+
+        self.assertEqual(response.context['score'], 1)
+        self.assertEqual([result['correct'] for result in response.context['results']], [True, False, False])
+        self.assertContains(response, 'You answered 1 of 3 questions correctly')
+
+
+class ApiTests(TestCase):
+    """
+    Tests the JSON API and batches of changes
+    URL: /dictionary/api/<str: resource>/, /dictionary/api/<str: resource>/batch
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='German')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.hint = Hint.objects.create(word=cls.bus, user=cls.user1, hint='Big')
+        cls.translation = Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+        cls.hund = Word.objects.create(word='Hund', user=cls.user2, word_language=cls.language3, description='Animal')
+
+        counters.recount(Language.objects.all())
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def post_batch(self, resource: str, operations: dict):
+        """Posts the batch and returns the results of its items"""
+
+        response = self.client.post(reverse('dictionary:api_batch', args=[resource]), json.dumps(operations), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        return response.json()
+
+    def words(self, count: int, start: int = 0) -> list:
+        return [
+            {'word': f'Word{ i }', 'word_language': self.language1.pk, 'description': f'Description{ i }'}
+            for i in range(start, start + count)
+        ]
+
+    def assertCounters(self, language: Language, word_count: int, translation_count: int):
+        language = Language.objects.get(pk=language.pk)
+        self.assertEqual((language.word_count, language.translation_count), (word_count, translation_count))
+
+    def test_anonymous_and_invalid_requests(self):
+        """Test if anonymous users, unknown resources and invalid bodies are rejected"""
+
+        url = reverse('dictionary:api_batch', args=['words'])
+
+        self.assertEqual(self.client.post(url, 'not json', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(url, '{"insert": []}', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(url, '{"create": {}}', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertEqual(self.client.get(reverse('dictionary:api_list', args=['users'])).status_code, 404)
+
+        with override_settings(API_BATCH_MAX_ITEMS=2):
+            self.assertEqual(self.client.post(url, json.dumps({'create': self.words(3)}), content_type='application/json').status_code, 400)
+
+        self.client.logout()
+
+        self.assertEqual(self.client.post(url, '{}', content_type='application/json').status_code, 401)
+        self.assertEqual(self.client.get(reverse('dictionary:api_list', args=['words'])).status_code, 401)
+
+    @override_settings(API_PAGE_SIZE=2)
+    def test_list(self):
+        """Test if user's instances are listed in pages linked by cursors"""
+
+        self.post_batch('languages', {'create': [{'language_name': 'French'}, {'language_name': 'Spanish'}]})
+
+        response = self.client.get(reverse('dictionary:api_list', args=['languages'])).json()
+
+        self.assertEqual([language['language_name'] for language in response['results']], ['Spanish', 'French'])
+        self.assertIsNone(response['previous'])
+
+        response = self.client.get(reverse('dictionary:api_list', args=['languages']), {'cursor': response['next']}).json()
+
+        self.assertEqual([language['language_name'] for language in response['results']], ['Russian', 'English'])
+        self.assertIsNone(response['next'])
+
+        response = self.client.get(reverse('dictionary:api_list', args=['translations'])).json()
+
+        self.assertEqual(response['results'][0]['word'], self.bus.pk)
+        self.assertEqual(response['results'][0]['translation_language'], self.language2.pk)
+
+    def test_create_words(self):
+        """Test if words are created with a number of queries that does not depend on their number"""
+
+        with CaptureQueriesContext(connection) as queries:
+            self.post_batch('words', {'create': self.words(5)})
+
+        with self.assertNumQueries(len(queries)):
+            self.post_batch('words', {'create': self.words(50, start=5)})
+
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 56)
+        self.assertEqual(Review.objects.filter(user=self.user1).count(), 55)
+        self.assertCounters(self.language1, 56, 0)
+
+    def test_create_words_results(self):
+        """Test if a result is returned for every item and invalid items do not stop the others"""
+
+        results = self.post_batch('words', {'create': [
+            {'word': 'Cat', 'word_language': self.language1.pk, 'description': 'Animal'},
+            {'word': 'bus', 'word_language': self.language1.pk, 'description': 'Duplicate'},
+            {'word': 'CAT', 'word_language': self.language1.pk, 'description': 'Duplicate in the batch'},
+            {'word': 'Cat', 'word_language': self.language2.pk, 'description': 'Other language'},
+            {'word': 'Hund', 'word_language': self.language3.pk, 'description': "Other user's language"},
+            {'word': '', 'description': 'x' * 10},
+            'word',
+        ]})['create']
+
+        cat = Word.objects.get(word='Cat', word_language=self.language1)
+
+        self.assertEqual(results[0], {'status': 'created', 'id': cat.pk})
+        self.assertEqual(results[1]['errors'], {'word': 'That word already exists!'})
+        self.assertEqual(results[2]['errors'], {'word': 'That word already exists!'})
+        self.assertEqual(results[3]['status'], 'created')
+        self.assertEqual(results[4]['errors'], {'word_language': 'Not found.'})
+        self.assertEqual(results[5]['errors'], {'word': 'This field is required.', 'word_language': 'This field is required.'})
+        self.assertEqual(results[6]['errors'], {'item': 'Must be an object.'})
+        self.assertCounters(self.language1, 2, 0)
+        self.assertCounters(self.language2, 1, 1)
+
+    def test_update_and_delete_words(self):
+        """Test if words are updated partially, moved between languages and deleted with their dependents"""
+
+        language4 = Language.objects.create(user=self.user1, language_name='German')
+
+        results = self.post_batch('words', {
+            'update': [
+                {'id': self.bus.pk, 'word_language': language4.pk, 'description': 'Big vehicle'},
+                {'id': self.hund.pk, 'word': 'Dog'},
+            ],
+        })['update']
+
+        self.assertEqual(results[0], {'status': 'updated', 'id': self.bus.pk})
+        self.assertEqual(results[1]['errors'], {'id': 'Not found.'})
+
+        bus = Word.objects.get(pk=self.bus.pk)
+
+        self.assertEqual((bus.word, bus.word_language, bus.description), ('Bus', language4, 'Big vehicle'))
+        self.assertEqual(Word.objects.get(pk=self.hund.pk).word, 'Hund')
+        self.assertCounters(self.language1, 0, 0)
+        self.assertCounters(language4, 1, 0)
+
+        results = self.post_batch('words', {'delete': [self.bus.pk, self.hund.pk]})['delete']
+
+        self.assertEqual(results, [{'status': 'deleted', 'id': self.bus.pk}, {'status': 'invalid', 'errors': {'id': 'Not found.'}}])
+        self.assertFalse(Hint.objects.filter(pk=self.hint.pk).exists())
+        self.assertFalse(Translation.objects.filter(pk=self.translation.pk).exists())
+        self.assertTrue(Word.objects.filter(pk=self.hund.pk).exists())
+        self.assertCounters(language4, 0, 0)
+        self.assertCounters(self.language2, 0, 0)
+
+    def test_word_moved_to_translation_language(self):
+        """Test if a word cannot be moved to the language of one of its translations"""
+
+        results = self.post_batch('words', {'update': [{'id': self.bus.pk, 'word_language': self.language2.pk}]})['update']
+
+        self.assertEqual(results[0]['errors'], {'word_language': "Word's language and translation's language cannot be the same!"})
+        self.assertEqual(Word.objects.get(pk=self.bus.pk).word_language, self.language1)
+        self.assertCounters(self.language2, 0, 1)
+
+    def test_translations(self):
+        """Test if translations are checked against the languages of their words and counted"""
+
+        results = self.post_batch('translations', {
+            'create': [
+                {'word': self.bus.pk, 'translation_language': self.language1.pk, 'translation': 'Bus'},
+                {'word': self.hund.pk, 'translation_language': self.language2.pk, 'translation': 'Собака'},
+                {'word': self.bus.pk, 'translation_language': self.language2.pk, 'translation': 'Автобус 2'},
+            ],
+            'update': [{'id': self.translation.pk, 'translation': 'Автобусик'}],
+        })
+
+        self.assertEqual(results['create'][0]['errors'], {'translation_language': "Word's language and translation's language cannot be the same!"})
+        self.assertEqual(results['create'][1]['errors'], {'word': 'Not found.'})
+        self.assertEqual(results['create'][2]['status'], 'created')
+        self.assertEqual(results['update'][0]['status'], 'updated')
+        self.assertEqual(Translation.objects.get(pk=self.translation.pk).translation, 'Автобусик')
+        self.assertCounters(self.language2, 0, 2)
+
+        self.post_batch('translations', {'delete': [self.translation.pk]})
+
+        self.assertCounters(self.language2, 0, 1)
+
+    def test_hints_and_languages(self):
+        """Test if hints and languages are created, updated and deleted"""
+
+        results = self.post_batch('hints', {
+            'create': [{'word': self.bus.pk, 'hint': 'Yellow'}, {'word': self.hund.pk, 'hint': 'Barks'}],
+            'update': [{'id': self.hint.pk, 'hint': 'Long'}],
+        })
+
+        self.assertEqual([result['status'] for result in results['create']], ['created', 'invalid'])
+        self.assertEqual(sorted(Hint.objects.filter(word=self.bus).values_list('hint', flat=True)), ['Long', 'Yellow'])
+
+        self.post_batch('hints', {'delete': [self.hint.pk]})
+        self.assertFalse(Hint.objects.filter(pk=self.hint.pk).exists())
+
+        results = self.post_batch('languages', {
+            'create': [{'language_name': 'english'}, {'language_name': 'German'}],
+            'update': [{'id': self.language2.pk, 'language_name': 'Russian (Russia)'}],
+            'delete': [self.language1.pk],
+        })
+
+        # The language deleted first frees its name
+        self.assertEqual([result['status'] for result in results['create']], ['created', 'created'])
+        self.assertEqual(results['update'][0]['status'], 'updated')
+        self.assertEqual(results['delete'][0]['status'], 'deleted')
+        self.assertFalse(Word.objects.filter(pk=self.bus.pk).exists())
+        self.assertEqual(
+            sorted(Language.objects.filter(user=self.user1).values_list('language_name', flat=True)),
+            ['German', 'Russian (Russia)', 'english'],
+        )
+
+        results = self.post_batch('languages', {'create': [{'language_name': 'GERMAN'}]})
+        self.assertEqual(results['create'][0]['errors'], {'language_name': 'Language with that name already exists!'})
+
+    def test_duplicate_languages_in_batch(self):
+        """Test if a batch does not create two languages with the same name, whatever their case"""
+
+        results = self.post_batch('languages', {'create': [{'language_name': 'French'}, {'language_name': 'french'}]})
+
+        self.assertEqual([result['status'] for result in results['create']], ['created', 'invalid'])
+        self.assertEqual(results['create'][1]['errors'], {'language_name': 'Language with that name already exists!'})
+        self.assertEqual(Language.objects.filter(user=self.user1, language_name__iexact='french').count(), 1)
+
+        # Updates are applied first, so a language renamed in the batch takes the name from a new one
+        results = self.post_batch('languages', {
+            'create': [{'language_name': 'Spanish'}],
+            'update': [{'id': self.language2.pk, 'language_name': 'SPANISH'}],
+        })
+
+        self.assertEqual((results['update'][0]['status'], results['create'][0]['status']), ('updated', 'invalid'))
+
+    def test_batch_invalidates_derived_data(self):
+        """Test if summaries and indexes are invalidated after a batch, which does not send signals"""
+
+        self.assertEqual(summary.get_summary(self.user1).words, 1)
+        fuzzy.indexes.get(self.user1)
+
+        # Data is invalidated once the batch is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_batch('words', {'create': self.words(3)})
+
+        self.assertEqual(summary.get_summary(self.user1).words, 4)
+        self.assertIsNone(fuzzy.indexes.peek(self.user1.pk))
+
+    def test_language_deletion_invalidates_on_commit(self):
+        """Test if languages deleted by a batch invalidate derived data once the deletion is committed"""
+
+        fuzzy.indexes.get(self.user1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            results = self.post_batch('languages', {'delete': [self.language1.pk]})
+
+        self.assertEqual(results['delete'][0]['status'], 'deleted')
+        self.assertIsNotNone(fuzzy.indexes.peek(self.user1.pk))
+
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(fuzzy.indexes.peek(self.user1.pk))
+
+
+class SyncTests(TestCase):
+    """
+    Tests delta sync of changed and deleted instances
+    URL: /dictionary/api/sync
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='German')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.car = Word.objects.create(word='Car', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.hint = Hint.objects.create(word=cls.bus, user=cls.user1, hint='Big')
+        cls.translation1 = Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+        cls.translation2 = Translation.objects.create(word=cls.car, user=cls.user1, translation_language=cls.language2, translation='Машина')
+        cls.hund = Word.objects.create(word='Hund', user=cls.user2, word_language=cls.language3, description='Animal')
+
+        counters.recount(Language.objects.all())
+
+        # Instances were changed long before the first sync
+        an_hour_ago = timezone.now() - timezone.timedelta(hours=1)
+
+        for model in (Language, Word, Hint, Translation):
+            model.objects.update(date_updated=an_hour_ago)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    def sync(self, cursor: str = None) -> dict:
+        """Returns a page of the sync after the cursor"""
+
+        response = self.client.get(reverse('dictionary:api_sync'), {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+
+        return response.json()
+
+    def read_sync(self, cursor: str = None) -> tuple:
+        """Reads all pages of the sync after the cursor. Returns ids of the instances changed and deleted, and the next cursor"""
+
+        changed, deleted = {resource: set() for resource in sync.RESOURCES}, {resource: set() for resource in sync.RESOURCES}
+
+        while True:
+            page = self.sync(cursor)
+            cursor = page['cursor']
+
+            for resource in sync.RESOURCES:
+                changed[resource] |= {instance['id'] for instance in page[resource]}
+                deleted[resource] |= set(page['deleted'][resource])
+
+            if not page['has_more']:
+                return changed, deleted, cursor
+
+    def test_anonymous_user(self):
+        """Test if anonymous users get 401 Unauthorized"""
+
+        self.client.logout()
+
+        response = self.client.get(reverse('dictionary:api_sync'))
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_full_sync(self):
+        """Test if all user's instances are returned over pages without a cursor"""
+
+        changed, deleted, _ = self.read_sync()
+
+        self.assertEqual(changed['languages'], {self.language1.pk, self.language2.pk})
+        self.assertEqual(changed['words'], {self.bus.pk, self.car.pk})
+        self.assertEqual(changed['hints'], {self.hint.pk})
+        self.assertEqual(changed['translations'], {self.translation1.pk, self.translation2.pk})
+        self.assertFalse(any(deleted.values()))
+
+        page = self.sync()
+        self.assertEqual(len(page['languages']), 2)
+        self.assertEqual(page['words'], [])
+        self.assertTrue(page['has_more'])
+        self.assertTrue(page['full'])
+
+    def test_invalid_cursor(self):
+        """Test if a full sync is returned when the cursor is not valid"""
+
+        page = self.sync('not-a-cursor')
+
+        self.assertEqual({word['id'] for word in page['words']}, {self.bus.pk, self.car.pk})
+        self.assertFalse(page['has_more'])
+
+    def test_incremental_sync(self):
+        """Test if only instances changed since the last sync are returned, with ids of the deleted ones"""
+
+        _, _, cursor = self.read_sync()
+
+        self.client.post(reverse('dictionary:api_batch', args=['words']), json.dumps({'update': [{'id': self.car.pk, 'description': 'Small vehicle'}]}), content_type='application/json')
+        self.client.post(reverse('dictionary:delete_word', args=[self.bus.pk]))
+
+        changed, deleted, cursor = self.read_sync(cursor)
+
+        self.assertEqual(changed['words'], {self.car.pk})
+        self.assertFalse(changed['languages'] | changed['hints'] | changed['translations'])
+        self.assertEqual(deleted['words'], {self.bus.pk})
+        self.assertEqual(deleted['hints'], {self.hint.pk})
+        self.assertEqual(deleted['translations'], {self.translation1.pk})
+        self.assertFalse(deleted['languages'])
+
+    @override_settings(SYNC_OVERLAP=0)
+    def test_nothing_changed(self):
+        """Test if a sync returns nothing when no instance changed since the last one"""
+
+        _, _, cursor = self.read_sync()
+
+        changed, deleted, _ = self.read_sync(cursor)
+
+        self.assertFalse(any(changed.values()))
+        self.assertFalse(any(deleted.values()))
+
+    def test_batch_changes(self):
+        """Test if instances changed and deleted by batches are synced"""
+
+        _, _, cursor = self.read_sync()
+
+        self.client.post(
+            reverse('dictionary:api_batch', args=['translations']),
+            json.dumps({'update': [{'id': self.translation2.pk, 'translation': 'Автомобиль'}], 'delete': [self.translation1.pk]}),
+            content_type='application/json',
+        )
+        self.client.post(reverse('dictionary:api_batch', args=['hints']), json.dumps({'delete': [self.hint.pk]}), content_type='application/json')
+
+        self.translation2.refresh_from_db()
+        self.assertGreater(self.translation2.date_updated, timezone.now() - timezone.timedelta(minutes=1))
+
+        changed, deleted, _ = self.read_sync(cursor)
+
+        self.assertEqual(changed['translations'], {self.translation2.pk})
+        self.assertEqual(deleted['translations'], {self.translation1.pk})
+        self.assertEqual(deleted['hints'], {self.hint.pk})
+
+    def test_language_deletion(self):
+        """Test if a language deleted in batches leaves tombstones of its words and translations"""
+
+        _, _, cursor = self.read_sync()
+
+        self.client.post(reverse('dictionary:delete_language', args=[self.language2.pk]))
+
+        _, deleted, _ = self.read_sync(cursor)
+
+        self.assertEqual(deleted['languages'], {self.language2.pk})
+        self.assertEqual(deleted['translations'], {self.translation1.pk, self.translation2.pk})
+        self.assertFalse(deleted['words'])
+
+    def test_user_deletion(self):
+        """Test if instances deleted with their user do not leave tombstones"""
+
+        self.user1.delete()
+
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_query_count(self):
+        """Test if a page is read with a query per stream, whatever the number of instances"""
+
+        _, _, cursor = self.read_sync()
+
+        with self.assertNumQueries(5):
+            sync.get_changes(self.user1, cursor)
+
+        Word.objects.bulk_create([Word(word=f'Word{ i }', user=self.user1, word_language=self.language1) for i in range(50)])
+
+        with self.assertNumQueries(5):
+            page = sync.get_changes(self.user1, cursor)
+
+        self.assertEqual(len(page['words']), 50)
+
+    def test_expired_cursor(self):
+        """Test if a full sync is returned for a cursor older than the retention of tombstones"""
+
+        _, _, cursor = self.read_sync()
+
+        self.assertFalse(self.sync(cursor)['full'])
+
+        with override_settings(SYNC_TOMBSTONE_RETENTION=0):
+            page = self.sync(cursor)
+
+        self.assertTrue(page['full'])
+        self.assertEqual({word['id'] for word in page['words']}, {self.bus.pk, self.car.pk})
+
+    def test_prune_tombstones(self):
+        """Test if tombstones older than the retention window are deleted by the command"""
+
+        self.client.post(reverse('dictionary:delete_word', args=[self.bus.pk]))
+        Tombstone.objects.filter(model_name='hint').update(date_deleted=timezone.now() - timezone.timedelta(days=60))
+
+        output = io.StringIO()
+        call_command('prune_tombstones', stdout=output)
+
+        self.assertIn("Deleted 1 tombstones.", output.getvalue())
+        self.assertEqual(set(Tombstone.objects.values_list('model_name', flat=True)), {'word', 'translation'})
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), WORKER_PROCESSES=1)
+class PageCachingTests(TestCase):
+    """
+    Tests fragments of pages cached for the version of user's dictionary, and conditional requests
+    URL: /dictionary/, /dictionary/words/
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        Word.objects.create(word='Dog', user=cls.user2, word_language=cls.language3, description='Animal')
+
+        cls.client.force_login(user=cls.user1)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files"""
+
+        shutil.rmtree(stg.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """Login before each test start and drop fragments cached by other tests"""
+
+        self.client.force_login(user=self.user1)
+        cache.clear()
+
+    def test_fragments_are_cached(self):
+        """Test if words are not queried again until the dictionary is changed"""
+
+        for url in (reverse('dictionary:index'), reverse('dictionary:words_list')):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+
+                with CaptureQueriesContext(connection) as queries:
+                    second = self.client.get(url)
+
+                self.assertFalse([query for query in queries.captured_queries if 'dictionary_word' in query['sql']])
+                self.assertEqual(first.content, second.content)
+
+    def test_changes_are_shown(self):
+        """Test if pages are rendered again once a word is added, edited or deleted"""
+
+        url = reverse('dictionary:words_list')
+        self.client.get(url)
+
+        # Versions are bumped once changes are committed
+        with self.captureOnCommitCallbacks(execute=True):
+            cat = Word.objects.create(word='Cat', user=self.user1, word_language=self.language1, description='Animal')
+
+        self.assertContains(self.client.get(url), 'Cat')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Translation.objects.create(word=cat, user=self.user1, translation_language=self.language2, translation='Кошка')
+
+        self.assertContains(self.client.get(url), 'Cat (Кошка)')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cat.delete()
+
+        self.assertNotContains(self.client.get(url), 'Cat')
+
+    def test_fragments_are_cached_per_user(self):
+        """Test if users do not see fragments cached for each other"""
+
+        self.client.get(reverse('dictionary:words_list'))
+        self.client.force_login(user=self.user2)
+
+        response = self.client.get(reverse('dictionary:words_list'))
+
+        self.assertContains(response, 'Dog')
+        self.assertNotContains(response, 'Bus')
+
+    def test_not_modified(self):
+        """Test if pages are not sent again to browsers that have the current version"""
+
+        for url in (reverse('dictionary:index'), reverse('dictionary:words_list')):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                self.assertIn('private', response['Cache-Control'])
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+                self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.bus.save()
+
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_etags_differ_between_users(self):
+        """Test if a page cached by the browser for a user is not shown to another one"""
+
+        etag = self.client.get(reverse('dictionary:words_list'))['ETag']
+        self.client.force_login(user=self.user2)
+
+        response = self.client.get(reverse('dictionary:words_list'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_import_changes_version(self):
+        """Test if pages are rendered again once words are imported from a file"""
+
+        url = reverse('dictionary:words_list')
+        etag = self.client.get(url)['ETag']
+
+        file = SimpleUploadedFile('words.csv', 'Word,WordLanguage,Description,Hint,Translation,TranslationLanguage\nTrain,English,Vehicle,Long,Поезд,Russian'.encode())
+        run_import_job(ImportJob.objects.create(user=self.user1, file=file))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Train')
+
+    def test_version_is_incremented(self):
+        """Test if every change increments the version, and a version evicted starts again from a greater one"""
+
+        version, _ = versions.get_version(self.user1.pk)
+
+        versions.bump(self.user1.pk)
+        versions.bump(self.user1.pk)
+
+        self.assertEqual(versions.get_version(self.user1.pk)[0], version + 2)
+
+        cache.delete(versions.cache_key(self.user1.pk))
+        versions.bump(self.user1.pk)
+
+        self.assertGreater(versions.get_version(self.user1.pk)[0], version + 2)
+
+    def test_version_is_bumped_on_commit(self):
+        """Test if a change bumps the version once it is committed, not while a reader could still see the old rows"""
+
+        version, _ = versions.get_version(self.user1.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bus.save()
+
+            self.assertEqual(versions.get_version(self.user1.pk)[0], version)
+
+        self.assertEqual(versions.get_version(self.user1.pk)[0], version + 1)
+
+    def test_version_expires(self):
+        """Test if versions are cached for `VERSION_CACHE_TIMEOUT` seconds only"""
+
+        with override_settings(VERSION_CACHE_TIMEOUT=0):
+            version, _ = versions.get_version(self.user1.pk)
+
+        self.assertIsNone(cache.get(versions.cache_key(self.user1.pk)))
+        self.assertNotEqual(versions.get_version(self.user1.pk)[0], version)
+
+    @override_settings(WORKER_PROCESSES=2)
+    def test_local_cache_of_several_processes(self):
+        """Test if pages are neither cached nor revalidated when processes keep versions in their own memory"""
+
+        for url in (reverse('dictionary:index'), reverse('dictionary:words_list')):
+            with self.subTest(url=url):
+                self.client.get(url)
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+
+                self.assertTrue([query for query in queries.captured_queries if 'dictionary_word' in query['sql']])
+                self.assertFalse(response.has_header('ETag'))
+                self.assertFalse(response.has_header('Last-Modified'))
+
+
+class QueryTimingMiddlewareTests(TestCase):
+    """Tests that requests to the dictionary views are measured by `QueryTimingMiddleware`"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        """Test if the number of queries and timings are added to the response"""
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dictionary:languages_list'))
+
+        metrics = dict(metric.split(';', 1) for metric in response['Server-Timing'].split(', '))
+
+        self.assertEqual(set(metrics), {'db', 'view', 'render', 'total'})
+        self.assertIn(f'desc="{ len(queries) } queries"', metrics['db'])
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_header_disabled(self):
+        """Test if timings are not exposed if `SERVER_TIMING` is False"""
+
+        response = self.client.get(reverse('dictionary:languages_list'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_requests_are_logged(self):
+        """Test if every request is logged with its metrics"""
+
+        with self.assertLogs('app.performance', level='INFO') as logs:
+            self.client.get(reverse('dictionary:languages_list'))
+
+        record = logs.records[0].performance
+
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        self.assertEqual(record['view'], 'dictionary:languages_list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['render_ms'], 0)
+        self.assertEqual(record['flags'], [])
+
+    def test_queries_are_recorded_during_requests_only(self):
+        """Test if execute wrappers are removed from the connection once the request is measured"""
+
+        with self.assertLogs('app.performance', level='INFO'):
+            self.client.get(reverse('dictionary:languages_list'))
+
+        self.assertEqual(connection.execute_wrappers, [])
+
+    @override_settings(PERFORMANCE_MAX_QUERIES=1)
+    def test_requests_over_thresholds_are_flagged(self):
+        """Test if requests that make too many queries are logged as warnings"""
+
+        with self.assertLogs('app.performance', level='WARNING') as logs:
+            self.client.get(reverse('dictionary:languages_list'))
+
+        self.assertEqual(logs.records[0].performance['flags'], ['too_many_queries'])
+
+    def test_write_views_are_not_flagged(self):
+        """Test if words are added and deleted with fewer queries than the views set with `max_queries`"""
+
+        language2 = Language.objects.create(user=self.user1, language_name='Russian')
+        data = {'word': 'Bus', 'word_language': self.language1.pk, 'description': 'Vehicle', 'hint': 'Big', 'translation': 'Автобус', 'translation_language': language2.pk}
+
+        with self.assertLogs('app.performance', level='INFO') as logs:
+            self.client.post(reverse('dictionary:add_word'), data)
+            self.client.post(reverse('dictionary:delete_word', args=[Word.objects.get(word='Bus').pk]))
+            self.client.post(reverse('dictionary:delete_language', args=[language2.pk]))
+
+        self.assertEqual([record.performance['flags'] for record in logs.records], [[], [], []])
+
+    def test_read_views_make_few_queries(self):
+        """Test if read views are flagged after `PERFORMANCE_MAX_QUERIES` queries, and make fewer"""
+
+        with self.assertLogs('app.performance', level='INFO') as logs:
+            self.client.get(reverse('dictionary:languages_list'))
+
+        self.assertEqual(logs.records[0].performance['flags'], [])
+
+        with override_settings(PERFORMANCE_MAX_QUERIES=1), self.assertLogs('app.performance', level='INFO') as logs:
+            self.client.post(reverse('dictionary:delete_word', args=[Word.objects.create(word='Bus', user=self.user1, word_language=self.language1).pk]))
+            self.client.get(reverse('dictionary:languages_list'))
+
+        self.assertEqual([record.performance['flags'] for record in logs.records], [[], ['too_many_queries']])
+
+    @override_settings(PERFORMANCE_MAX_QUERIES=1)
+    def test_bulk_views_are_not_flagged(self):
+        """Test if batches of the API are not flagged for queries, as their number depends on the batch"""
+
+        words = [{'word': f'Word{ i }', 'word_language': self.language1.pk, 'description': f'Description{ i }'} for i in range(20)]
+
+        with self.assertLogs('app.performance', level='INFO') as logs:
+            self.client.post(reverse('dictionary:api_batch', args=['words']), json.dumps({'create': words}), content_type='application/json')
+
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 20)
+        self.assertEqual(logs.records[0].performance['flags'], [])
+
+
+@override_settings(WORKER_PROCESSES=1)
+class CompressionMiddlewareTests(TestCase):
+    """Tests that responses are compressed by `CompressionMiddleware`, and revalidated with strong ETags"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.client = Client()
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+
+        for i in range(20):
+            Word.objects.create(word=f'Word{ i }', user=cls.user1, word_language=cls.language1, description='Description')
+
+        cls.client.force_login(user=cls.user1)
+
+    def setUp(self):
+        """Login before each test start"""
+        self.client.force_login(user=self.user1)
+        self.async_client.force_login(user=self.user1)
+
+    def test_negotiate_encoding(self):
+        """Test if the accepted coding with the highest weight is chosen"""
+
+        self.assertEqual(negotiate_encoding('gzip, deflate'), 'gzip')
+        self.assertEqual(negotiate_encoding('deflate;q=1, gzip;q=0.5'), 'gzip')
+        self.assertEqual(negotiate_encoding('*'), next(iter(ENCODINGS)))
+        self.assertIsNone(negotiate_encoding(''))
+        self.assertIsNone(negotiate_encoding('gzip;q=0, deflate'))
+        self.assertIsNone(negotiate_encoding('*;q=0'))
+        self.assertIsNone(negotiate_encoding('gzip;q=invalid'))
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_negotiate_brotli(self):
+        """Test if brotli is preferred to gzip, unless the client prefers gzip"""
+
+        self.assertEqual(negotiate_encoding('gzip, deflate, br'), 'br')
+        self.assertEqual(negotiate_encoding('gzip, br;q=0.5'), 'gzip')
+
+    def test_gzip(self):
+        """Test if pages are compressed with gzip, and their ETags stay strong"""
+
+        uncompressed = self.client.get(reverse('dictionary:words_list'))
+        response = self.client.get(reverse('dictionary:words_list'), HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(uncompressed.content) / 4)
+        self.assertEqual(gzip.decompress(response.content), uncompressed.content)
+        self.assertEqual(response['ETag'], f'{ uncompressed["ETag"][:-1] }-gzip"')
+
+    def test_not_compressed(self):
+        """Test if responses are sent as they are without an accepted coding, and small ones always"""
+
+        response = self.client.get(reverse('dictionary:words_list'))
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        response = self.client.get(reverse('dictionary:words_list'), HTTP_ACCEPT_ENCODING='identity')
+        self.assertNotIn('Content-Encoding', response)
+
+        with self.settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            response = self.client.get(reverse('dictionary:words_list'), HTTP_ACCEPT_ENCODING='gzip')
+            self.assertNotIn('Content-Encoding', response)
+
+    def test_not_modified(self):
+        """Test if compressed pages are revalidated with their ETag until the dictionary changes"""
+
+        for url in [reverse('dictionary:words_list'), reverse('dictionary:api_list', args=['words'])]:
+            with self.subTest(url=url):
+                etag = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0')['ETag']
+                self.assertTrue(etag.endswith('-gzip"'))
+
+                response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Word.objects.create(word='Bus', user=self.user1, word_language=self.language1, description='Vehicle')
+
+        response = self.client.get(reverse('dictionary:words_list'), HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    async def test_async_requests(self):
+        """Test if responses of async views are compressed as well"""
+
+        # Headers of async requests are named the way they are sent
+        response = await self.async_client.get(reverse('dictionary:words_list'), ACCEPT_ENCODING='gzip;q=1, br;q=0')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Word19', gzip.decompress(response.content))
+
+    @override_settings(COMPRESSION_THREAD_MIN_SIZE=0)
+    async def test_async_requests_in_thread(self):
+        """Test if large responses of async views are compressed in a worker thread"""
+
+        response = await self.async_client.get(reverse('dictionary:words_list'), ACCEPT_ENCODING='gzip;q=1, br;q=0')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Word19', gzip.decompress(response.content))
+
+    def test_sync_has_no_etag(self):
+        """Test if sync pages are not revalidated with the version of the dictionary"""
+
+        response = self.client.get(reverse('dictionary:api_sync'))
+
+        self.assertNotIn('ETag', response)
+
+
+@override_settings(WORKER_PROCESSES=1)
+class AsyncViewsTests(TestCase):
+    """
+    Tests async views served through the ASGI handler
+    URL: /dictionary/, /dictionary/words/, /dictionary/words/<int: word_id>, /dictionary/words/search/, /dictionary/words/autocomplete
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+        cls.language2 = Language.objects.create(user=cls.user1, language_name='Russian')
+        cls.language3 = Language.objects.create(user=cls.user2, language_name='English')
+
+        cls.bus = Word.objects.create(word='Bus', user=cls.user1, word_language=cls.language1, description='Vehicle')
+        cls.dog = Word.objects.create(word='Dog', user=cls.user2, word_language=cls.language3, description='Animal')
+
+        Translation.objects.create(word=cls.bus, user=cls.user1, translation_language=cls.language2, translation='Автобус')
+        Hint.objects.create(word=cls.bus, user=cls.user1, hint='Big')
+
+    def setUp(self):
+        """Login before each test start and drop fragments and indexes cached by other tests"""
+
+        self.async_client.force_login(user=self.user1)
+        cache.clear()
+        fuzzy.invalidate()
+        autocomplete.invalidate()
+
+    async def test_pages(self):
+        """Test if pages are rendered by async views"""
+
+        urls = {
+            reverse('dictionary:index'): 'Bus (Автобус)',
+            reverse('dictionary:words_list'): 'Bus (Автобус)',
+            reverse('dictionary:word_detail', args=[self.bus.pk]): 'Автобус',
+            f"{ reverse('dictionary:words_search') }?word=bus": 'Bus',
+            f"{ reverse('dictionary:words_search') }?word=автобс&fuzzy=on": 'Bus',
+        }
+
+        for url, text in urls.items():
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+
+                self.assertContains(response, text)
+
+    async def test_autocomplete(self):
+        """Test if words are completed by the async view"""
+
+        response = await self.async_client.get(reverse('dictionary:words_autocomplete'), {'term': 'b'})
+
+        self.assertEqual(response.json(), {'results': [{'id': self.bus.pk, 'word': 'Bus'}]})
+
+    async def test_not_found(self):
+        """Test if words of other users are not found"""
+
+        response = await self.async_client.get(reverse('dictionary:word_detail', args=[self.dog.pk]))
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(LOGIN_URL='/login/')
+    async def test_logout_redirects(self):
+        """Test if unauthorized user is redirected to the login page"""
+
+        await sync_to_async(self.async_client.logout)()
+        response = await self.async_client.get(reverse('dictionary:words_list'))
+
+        self.assertRedirects(response, f'/login/?next={ reverse("dictionary:words_list") }', fetch_redirect_response=False)
+
+    async def test_method_not_allowed(self):
+        """Test if the search accepts GET requests only"""
+
+        response = await self.async_client.post(reverse('dictionary:words_search'), {'word': 'bus'})
+
+        self.assertEqual(response.status_code, 405)
+
+    async def test_not_modified(self):
+        """Test if conditional requests are answered by async views"""
+
+        response = await self.async_client.get(reverse('dictionary:words_list'))
+        # Headers of async requests are named the way they are sent
+        response = await self.async_client.get(reverse('dictionary:words_list'), IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('private', response['Cache-Control'])
+
+    async def test_queries_are_measured(self):
+        """Test if queries made by the async ORM are recorded by `QueryTimingMiddleware`"""
+
+        with self.assertLogs('app.performance', level='INFO') as logs:
+            await self.async_client.get(reverse('dictionary:word_detail', args=[self.bus.pk]))
+
+        record = logs.records[0].performance
+
+        self.assertEqual(record['view'], 'dictionary:word_detail')
+        self.assertGreaterEqual(record['queries'], 5)
+        self.assertGreater(record['render_ms'], 0)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BenchmarkTests(TestCase):
+    """Tests the synthetic dictionaries and the benchmark of the dictionary views"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.user2 = User.objects.create_user(username='usrnm2', password='psswd2')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files"""
+
+        shutil.rmtree(stg.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_generator_is_deterministic(self):
+        """Test if the same seed generates the same dictionary"""
+
+        for user in (self.user1, self.user2):
+            DictionaryGenerator(seed=1, batch_size=7).generate(user, languages=3, words=20)
+
+        words1 = list(Word.objects.filter(user=self.user1).order_by('pk').values_list('word', 'word_language__language_name', 'translations__translation'))
+        words2 = list(Word.objects.filter(user=self.user2).order_by('pk').values_list('word', 'word_language__language_name', 'translations__translation'))
+
+        self.assertEqual(len(words1), 20)
+        self.assertEqual(words1, words2)
+        self.assertEqual(Hint.objects.filter(user=self.user1).count(), 20)
+        self.assertFalse(Translation.objects.filter(user=self.user1, translation_language=F('word__word_language')).exists())
+
+    def test_generate_dictionaries_command(self):
+        """Test if the command generates users with dictionaries of the size provided"""
+
+        call_command('generate_dictionaries', users=2, languages=3, words=5, hints=2, translations=2, chunk_size=2, stdout=io.StringIO())
+
+        for username in ('generated0', 'generated1'):
+            user = User.objects.get(username=username)
+
+            self.assertEqual(Language.objects.filter(user=user).count(), 3)
+            self.assertEqual(Word.objects.filter(user=user).count(), 5)
+            self.assertEqual(Hint.objects.filter(user=user).count(), 10)
+            self.assertEqual(Translation.objects.filter(user=user).count(), 10)
+
+        if connection.vendor == 'sqlite':
+            with self.assertRaises(CommandError):
+                call_command('generate_dictionaries', processes=2, stdout=io.StringIO())
+
+    def test_benchmark(self):
+        """Test if every scenario is measured and leaves the dictionary as it was"""
+
+        DictionaryGenerator().generate(self.user1, languages=3, words=20)
+
+        results = Benchmark(self.user1, iterations=2).run()
+
+        self.assertEqual(list(results), SCENARIOS)
+        self.assertTrue(all(stats['queries'] > 0 and stats['p50'] <= stats['p99'] for stats in results.values()))
+        self.assertEqual(Word.objects.filter(user=self.user1).count(), 20)
+        self.assertEqual(Language.objects.filter(user=self.user1).count(), 3)
+
+    def test_compare_with_baseline(self):
+        """Test if slower scenarios and scenarios that make more queries are reported"""
+
+        baseline = {'1000': {'index': {'p50': 10.0, 'queries': 5}, 'words_list': {'p50': 10.0, 'queries': 3}}}
+        results = {'1000': {'index': {'p50': 12.0, 'queries': 6}, 'words_list': {'p50': 20.0, 'queries': 3}, 'word_detail': {'p50': 1.0, 'queries': 4}}}
+
+        self.assertEqual(compare(results, baseline, tolerance=0.25), [
+            "index (1000 words): 5 -> 6 queries",
+            "words_list (1000 words): median latency 10.0ms -> 20.0ms",
+        ])
+
+
+@skipUnless(connection.vendor == 'sqlite', "Query plans are checked on SQLite only")
+class IndexesTests(TestCase):
+    """Tests that the hot queries are served by indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setting up test data"""
+
+        cls.user1 = User.objects.create_user(username='usrnm', password='psswd')
+        cls.language1 = Language.objects.create(user=cls.user1, language_name='English')
+
+    def assertUsesIndex(self, queryset, index_name: str):
+        """Asserts that the query plan of the queryset searches the index provided and does not sort rows"""
+
+        plan = queryset.explain()
+
+        self.assertIn(f'USING INDEX { index_name }', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_words_list(self):
+        """Test if user's words are listed by the index"""
+
+        words = Word.objects.filter(user=self.user1).with_primary_translation().order_by('-date_added')[:20]
+
+        self.assertUsesIndex(words, 'word_user_date_added_idx')
+
+    def test_words_list_next_page(self):
+        """Test if the paginator reads a page of user's words after a cursor by an index range scan"""
+
+        Word.objects.bulk_create([Word(word=f'Word{ i }', user=self.user1, word_language=self.language1) for i in range(3)])
+        paginator = CursorPaginator(Word.objects.filter(user=self.user1).with_primary_translation(), 2)
+        cursor = paginator.get_page().next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            page = paginator.get_page(cursor)
+
+        self.assertEqual(len(page), 1)
+        self.assertEqual(len(queries), 1)
+
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(f"EXPLAIN QUERY PLAN { queries[0]['sql'] }")
+            plan = '\n'.join(row[-1] for row in db_cursor.fetchall())
+
+        self.assertIn('USING INDEX word_user_date_added_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_languages_list(self):
+        """Test if user's languages are listed by the index"""
+
+        languages = Language.objects.filter(user=self.user1).order_by('-date_added')[:20]
+
+        self.assertUsesIndex(languages, 'language_user_date_added_idx')
+
+    def test_word_duplicate_check(self):
+        """Test if `WordForm` checks duplicates by the index"""
+
+        words = Word.objects.alias(word_lower=Lower('word')).filter(user=self.user1, word_lower=Lower(Value('Bus')), word_language=self.language1)
+
+        self.assertUsesIndex(words, 'word_user_language_word_idx')
+
+    def test_language_duplicate_check(self):
+        """Test if `LanguageForm` checks duplicates by the index"""
+
+        languages = Language.objects.alias(language_name_lower=Lower('language_name')).filter(user=self.user1, language_name_lower=Lower(Value('english')))
+
+        self.assertUsesIndex(languages, 'language_user_name_idx')
+
+    def test_due_reviews(self):
+        """Test if words due to be reviewed are read from the due-queue index"""
+
+        due = reviews.due_reviews(self.user1)[:stg.REVIEW_BATCH_SIZE]
+
+        self.assertUsesIndex(due, 'review_user_due_at_idx')
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'dictionary'
 urlpatterns = [
@@ -17,8 +17,12 @@ urlpatterns = [
     # Add items views
     path('words/add/', views.add_word, name='add_word'),
     path('words/add/from_file/', views.add_words_from_file, name='add_words_from_file'),
+    path('words/add/from_file/<int:job_id>/', views.import_job_detail, name='import_job_detail'),
     path('languages/add/', views.add_language, name='add_language'),
 
+    # Export items views
+    path('words/export', views.export_words, name='export_words'),
+
     # Edit items views
     path('words/edit/<int:word_id>', views.edit_word, name='edit_word'),
     path('languages/edit/<int:language_id>', views.edit_language, name='edit_language'),
@@ -26,7 +30,19 @@ urlpatterns = [
     # Delete items views
     path('words/delete/<int:word_id>', views.delete_word, name='delete_word'),
     path('languages/delete/<int:language_id>', views.delete_language, name='delete_language'),
+    path('languages/delete/jobs/<int:job_id>/cancel', views.cancel_deletion_job, name='cancel_deletion_job'),
+
+    # Review items
+    path('review/', views.review_words, name='review_words'),
+    path('review/<int:word_id>', views.review_word, name='review_word'),
+    path('quiz/', views.quiz_words, name='quiz_words'),
+
+    # JSON API
+    path('api/sync', api.sync_changes, name='api_sync'),
+    path('api/<str:resource>/', api.list_objects, name='api_list'),
+    path('api/<str:resource>/batch', api.batch, name='api_batch'),
 
     # Search items
     path('words/search', views.search_words, name='words_search'),
-]
\ No newline at end of file
+    path('words/autocomplete', views.autocomplete_words, name='words_autocomplete'),
+]
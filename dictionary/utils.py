@@ -1,5 +1,16 @@
+from collections import OrderedDict
+from typing import Callable
+
+from django.conf import settings as stg
+from django.core.files import File
 from django.core.files.uploadedfile import UploadedFile
 
+from . import versions
+
+import io
+import threading
+import time
+
 def has_file_correct_extension(file: UploadedFile, extension: str) -> bool:
     """
     This function returns True if an extension provided corresponds with the file's extension,
@@ -18,5 +29,161 @@ def has_file_correct_size(file: UploadedFile, size: int = 2_500_000) -> bool:
     return file.size < size
 
 
+class UploadedFileStream(io.RawIOBase):
+    """
+    Read-only binary stream over `File.chunks()`. Lets parsers consume an upload or a stored
+    file chunk by chunk, whether it is kept in memory or on disk.
+    """
+
+    def __init__(self, file: File):
+        self._chunks = file.chunks()
+        self._chunk = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            try:
+                self._chunk = memoryview(next(self._chunks))
+
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+
+        return size
+
+
+class OutputChunksStream(io.RawIOBase):
+    """
+    Write-only binary stream that keeps written bytes until they are taken with `pop()`. Lets writers
+    that need a file, eg. Parquet writers, produce a response chunk by chunk.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+
+        return len(data)
+
+    def tell(self) -> int:
+        # Writers compute offsets from the position, which keeps growing when chunks are taken
+        return self._position
+
+    def pop(self) -> bytes:
+        """Returns the bytes written since the previous call"""
+
+        data = b''.join(self._chunks)
+        self._chunks = []
+
+        return data
+
+
+class UserIndexRegistry:
+    """
+    Thread-safe cache of in-memory indexes built per user. The least recently used indexes are dropped
+    when there are more than `max_users_setting` of them, and indexes expire after `timeout_setting` seconds.
+
+    Every index is stored with the version of the user's dictionary it was built from, read before the rows,
+    and is built again once the version changes, so that changes made by other processes are picked up.
+    Changes the current thread has made can be applied to an index in place with `update()` instead.
+    """
+
+    def __init__(self, build: Callable, timeout_setting: str, max_users_setting: str):
+        self.build = build
+        self.timeout_setting = timeout_setting
+        self.max_users_setting = max_users_setting
+        self.lock = threading.RLock()
+        self._indexes = OrderedDict()
+
+        # Tokens of the builds in progress per user, dropped by invalidations so that their results are not stored
+        self._builds = {}
+
+    def get(self, user):
+        """Returns the index of the user, building it if it is not cached, has expired or is behind the dictionary"""
+
+        version, _ = versions.get_version(user.pk)
+
+        with self.lock:
+            built_at, index_version, index = self._indexes.get(user.pk, (None, None, None))
+
+            if index is not None and index_version == version and time.monotonic() - built_at < getattr(stg, self.timeout_setting):
+                self._indexes.move_to_end(user.pk)
+                return index
+
+            build = self._builds[user.pk] = object()
+
+        index = self.build(user)
+
+        with self.lock:
+            if self._builds.get(user.pk) is build:
+                del self._builds[user.pk]
+                self._indexes[user.pk] = (time.monotonic(), version, index)
+                self._indexes.move_to_end(user.pk)
+
+                while len(self._indexes) > getattr(stg, self.max_users_setting):
+                    self._indexes.popitem(last=False)
+
+        return index
+
+    def peek(self, user_id: int):
+        """Returns the index of the user if it is built, None otherwise. Must be called holding `self.lock`"""
+
+        return self._indexes.get(user_id, (None, None, None))[2]
+
+    def update(self, user_id: int, change: Callable):
+        """
+        Applies the change to the index of the user in place, if it is built. Must be called once the change is committed,
+        after its versions are bumped. The index is moved to the current version of the dictionary if the versions since its own were all bumped
+        by the current thread, and is dropped otherwise, as it misses changes made elsewhere.
+        """
+
+        version, _ = versions.get_version(user_id)
+        first, last = versions.own_bumps(user_id)
+
+        with self.lock:
+            built_at, index_version, index = self._indexes.get(user_id, (None, None, None))
+
+            if index is None:
+                return
+
+            if index_version != version:
+                if first is None or not first - 1 <= index_version < last == version:
+                    self._drop(user_id)
+                    return
+
+                self._indexes[user_id] = (built_at, version, index)
+
+            with index.lock:
+                change(index)
+
+    def invalidate(self, user=None):
+        """Drops the index of the user provided, or indexes of all users, so that they are built again"""
+
+        with self.lock:
+            if user is None:
+                self._indexes.clear()
+                self._builds.clear()
+
+            else:
+                self._drop(user.pk)
+
+    def _drop(self, user_id: int):
+        """Drops the index of the user and the build in progress. Must be called holding `self.lock`"""
+
+        self._indexes.pop(user_id, None)
+        self._builds.pop(user_id, None)
+
+
 # def is_csv_file_valid(file: UploadedFile) -> bool:
     
\ No newline at end of file
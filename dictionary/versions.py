@@ -0,0 +1,137 @@
+from django.conf import settings as stg
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils import timezone
+
+import threading
+import time
+
+
+# Versions each thread has bumped last, per user, as `(first, last)` runs that no other thread bumped in between
+_bumps = threading.local()
+
+
+def cache_key(user_id: int) -> str:
+    return f'dictionary:version:{ user_id }'
+
+
+def date_cache_key(user_id: int) -> str:
+    return f'dictionary:version-date:{ user_id }'
+
+
+def get_version(user_id: int) -> tuple:
+    """
+    Returns the version of the user's dictionary and the time it was changed at, or None if it is not known.
+
+    Versions that are not cached start from the current time, so fragments cached for a version evicted are never
+    served again. They expire after `VERSION_CACHE_TIMEOUT` seconds, which bounds how long a process that does not
+    share its cache with the one that changed the dictionary serves pages of the previous version.
+    """
+
+    key, date_key = cache_key(user_id), date_cache_key(user_id)
+    values = cache.get_many([key, date_key])
+
+    if key not in values:
+        # Processes that start the version at once use the one added first
+        cache.add(key, time.time_ns(), stg.VERSION_CACHE_TIMEOUT)
+        cache.add(date_key, timezone.now(), stg.VERSION_CACHE_TIMEOUT)
+        values = cache.get_many([key, date_key])
+
+    return values.get(key) or time.time_ns(), values.get(date_key)
+
+
+def bump(user_id: int):
+    """
+    Increments the version of the user's dictionary, so that fragments rendered for the previous one are not used.
+    Pages read the version before the data, so a page rendered concurrently with a change is cached for the old version.
+    The version is incremented by the cache itself, so concurrent changes are never lost.
+    """
+
+    try:
+        version = cache.incr(cache_key(user_id))
+
+    except ValueError:
+        # A version started from the current time is greater than the one evicted
+        cache.add(cache_key(user_id), time.time_ns(), stg.VERSION_CACHE_TIMEOUT)
+        version = None
+
+    cache.set(date_cache_key(user_id), timezone.now(), stg.VERSION_CACHE_TIMEOUT)
+    record_bump(user_id, version)
+
+
+def record_bump(user_id: int, version: int = None):
+    """Records the version bumped by the current thread, extending its run if no other thread bumped one in between"""
+
+    runs = getattr(_bumps, 'runs', None)
+
+    # Runs of users the thread does not change anymore are not kept forever
+    if runs is None or len(runs) > 1000:
+        runs = _bumps.runs = {}
+
+    first, last = runs.pop(user_id, (None, None))
+
+    if version is not None:
+        runs[user_id] = (first, version) if last is not None and version == last + 1 else (version, version)
+
+
+def own_bumps(user_id: int) -> tuple:
+    """
+    Returns the first and the last versions of the user's dictionary in the latest run of versions bumped
+    by the current thread, or `(None, None)`. Versions are incremented atomically, so every version in the run
+    is a change made by the thread.
+    """
+
+    return getattr(_bumps, 'runs', {}).get(user_id, (None, None))
+
+
+def is_shared() -> bool:
+    """
+    Returns whether every process sees the versions the others bump, ie. the cache is not kept in the memory
+    of each process or there is only one process. Otherwise pages are neither cached nor revalidated for versions,
+    since a process would serve the pages of a version the job worker or another web worker has already changed.
+    """
+
+    return stg.WORKER_PROCESSES == 1 or not isinstance(caches['default'], LocMemCache)
+
+
+def request_version(request) -> tuple:
+    """Returns the version of the dictionary of the user making the request, read once per request"""
+
+    if not hasattr(request, 'dictionary_version'):
+        request.dictionary_version = get_version(request.user.pk)
+
+    return request.dictionary_version
+
+
+def fragment_timeout() -> int:
+    """Returns the number of seconds fragments are cached for, 0 if the cache is not shared"""
+
+    return stg.FRAGMENT_CACHE_TIMEOUT if is_shared() else 0
+
+
+def fragment_key(request, fragment_name: str, *vary_on) -> str:
+    """
+    Returns the cache key of the template fragment rendered for the current version of the user's dictionary.
+    Templates cache fragments with `{% cache timeout fragment_name user.pk dictionary_version *vary_on %}`.
+    """
+
+    return make_template_fragment_key(fragment_name, [request.user.pk, request_version(request)[0], *vary_on])
+
+
+def etag(request, *args, **kwargs) -> str:
+    """Returns the ETag of pages rendered from the user's dictionary, for the `condition` decorator"""
+
+    if not is_shared():
+        return None
+
+    return f'{ request.user.pk }-{ request_version(request)[0] }'
+
+
+def last_modified(request, *args, **kwargs):
+    """Returns the time the user's dictionary was changed at, for the `condition` decorator"""
+
+    if not is_shared():
+        return None
+
+    return request_version(request)[1]
@@ -1,58 +1,89 @@
-from django.core.exceptions import PermissionDenied, NON_FIELD_ERRORS, SuspiciousOperation
-from django.core.paginator import Paginator
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import NON_FIELD_ERRORS, SuspiciousOperation
 from django.contrib.auth.decorators import login_required
-from django.forms import ValidationError
-from django.http import HttpResponseRedirect
-from django.shortcuts import render, get_object_or_404
-from django.urls import reverse
+from django.http import Http404, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.db import transaction
-from django.views.decorators.http import require_GET
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
 
 from django.conf import settings as stg
 
-from app.utils import bootstrapify_form
+from app.decorators import async_cache_control, async_condition, async_login_required, async_require_GET, async_require_http_methods, max_queries
+from app.utils import bootstrapify_form, render
 
-from .models import Hint, Language, Translation, Word
-from .forms import DictionaryFileForm, LanguageForm, SearchForm, WordForm, HintForm, TranslationForm
+from .exporters import EXPORT_FORMATS, WordsExporter
+from .deletion import LanguageDeleter, can_delete_in_request
+from .models import DeletionJob, Hint, ImportJob, Language, Review, Translation, Word
+from .pagination import CursorPaginator
+from .search import WordSearchPaginator, is_search_index_supported
+from . import autocomplete, counters, fuzzy, quiz, reviews, summary, versions
+from .forms import DictionaryFileForm, LanguageForm, ReviewForm, SearchForm, WordForm, HintForm, TranslationForm
 
-import io
-import pandas as pd
 
-
-@login_required
-def index(request):
+@async_login_required
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=versions.etag, last_modified_func=versions.last_modified)
+async def index(request):
     """
     URL: /dictionary/
-    Renders a template with recent words and languages added.
+    Renders a template with recent words and languages added. Languages and the numbers of words
+    and translations are read from the cached summary of the user's dictionary.
+    Lists are cached for the version of the dictionary, and browsers revalidate the page with its ETag.
     """
 
-    recent_words = Word.objects.filter(user=request.user).order_by('-date_added')[:stg.RECENT_WORD_COUNT]
-    users_languages = Language.objects.filter(user=request.user).order_by('-date_added')
+    users_summary = await summary.aget_summary(request.user)
 
     context = {
-        'recent_words': recent_words,
-        'languages': users_languages,
+        'summary': users_summary,
+        'lists_fragment': await cache.aget(versions.fragment_key(request, 'dictionary_index')) if versions.is_shared() else None,
+        'dictionary_version': versions.request_version(request)[0],
+        'fragment_cache_timeout': versions.fragment_timeout(),
     }
 
+    # Lists are only fetched if their fragment is not cached
+    if context['lists_fragment'] is None:
+        recent_words = Word.objects.filter(user=request.user).with_primary_translation().order_by('-date_added')[:stg.RECENT_WORD_COUNT]
+
+        context['recent_words'] = [word async for word in recent_words]
+        context['languages'] = users_summary.languages
+
     return render(request, "dictionary/index.html", context)
 
 
-@login_required
-def words_list(request):
+@async_login_required
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=versions.etag, last_modified_func=versions.last_modified)
+async def words_list(request):
     """
     URL: /dictionary/words
     Renders a template with all words added, sorted by creation time in descending order.
-    Pagination is used to split words to equal groups.
+    Cursor pagination is used to split words to equal groups.
+    Pages are cached for the version of the dictionary, and browsers revalidate them with their ETag.
     """
 
-    all_words = Word.objects.filter(user=request.user).order_by('-date_added')
-    paginator = Paginator(all_words, stg.PAGINATOR_PER_PAGE)
-    page_number = request.GET.get('page')
+    cursor = request.GET.get('cursor')
+
+    context = {
+        'cursor': cursor,
+        'words_fragment': await cache.aget(versions.fragment_key(request, 'words_list', cursor)) if versions.is_shared() else None,
+        'export_formats': EXPORT_FORMATS,
+        'dictionary_version': versions.request_version(request)[0],
+        'fragment_cache_timeout': versions.fragment_timeout(),
+    }
 
-    # get_page returns a valid page even if a page_number value is not valid
-    page_obj = paginator.get_page(page_number)
+    # The page is only fetched if its fragment is not cached
+    if context['words_fragment'] is None:
+        all_words = Word.objects.filter(user=request.user).with_primary_translation()
+        paginator = CursorPaginator(all_words, stg.PAGINATOR_PER_PAGE)
 
-    context = {'words': page_obj}
+        if stg.PAGINATOR_COUNT:
+            await paginator.acount()
+
+        # get_page returns the first page if a cursor value is not valid
+        context['words'] = await paginator.aget_page(cursor)
 
     return render(request, 'dictionary/words_list.html', context)
 
@@ -62,35 +93,46 @@ def languages_list(request):
     """
     URL: /dictionary/languages
     Renders a template with all languages added, sorted by creation time in descending order.
-    Pagination is used to split words to equal groups.
+    Cursor pagination is used to split languages to equal groups.
+    The progress of the deletion job is shown if its id is given in the `job` GET parameter.
     """
 
-    all_languages = Language.objects.filter(user=request.user).order_by('-date_added')
-    paginator = Paginator(all_languages, stg.PAGINATOR_PER_PAGE)
-    page_number = request.GET.get('page')
+    all_languages = Language.objects.filter(user=request.user)
+    paginator = CursorPaginator(all_languages, stg.PAGINATOR_PER_PAGE, count=stg.PAGINATOR_COUNT)
+    cursor = request.GET.get('cursor')
+
+    # get_page returns the first page if a cursor value is not valid
+    page_obj = paginator.get_page(cursor)
 
-    # get_page returns a valid page even if a page_number value is not valid
-    page_obj = paginator.get_page(page_number)
+    job_id = request.GET.get('job', '')
+    job = DeletionJob.objects.filter(pk=job_id, user=request.user).first() if job_id.isdigit() else None
 
-    context = {'languages': page_obj}
+    context = {'languages': page_obj, 'job': job}
 
     return render(request, 'dictionary/languages_list.html', context)
 
 
-@login_required
-def word_detail(request, word_id: int):
+@async_login_required
+async def word_detail(request, word_id: int):
     """
     URL: /dictionary/words/<int: word_id>
-    Renders a template with the information about the word provided if the word exists, otherwise throws 404 error.
+    Renders a template with the information about the word provided if the user's word exists, otherwise throws 404 error.
+    The word is fetched with its language, and its translations and hints are prefetched along with it.
     """
 
-    word = get_object_or_404(Word, pk=word_id)
+    words = Word.objects.select_related('word_language').prefetch_related(
+        Prefetch('translations', queryset=Translation.objects.select_related('translation_language').order_by('pk')),
+        Prefetch('hints', queryset=Hint.objects.order_by('pk')),
+    )
+
+    try:
+        word = await words.aget(pk=word_id, user=request.user)
 
-    if word.user != request.user:
-        raise PermissionDenied()
+    except Word.DoesNotExist:
+        raise Http404
 
-    translations = list(Translation.objects.filter(word=word, user=word.user))
-    hints = list(Hint.objects.filter(word=word, user=word.user))
+    translations = list(word.translations.all())
+    hints = list(word.hints.all())
 
     context = {
         'word': word,
@@ -105,21 +147,17 @@ def word_detail(request, word_id: int):
 def language_detail(request, language_id: int):
     """
     URL: /dictionary/languages/<int: language_id>
-    Renders a template with the information about the language provided if the word exists, otherwise throws 404 error.
+    Renders a template with the information about the language provided if the user's language exists, otherwise throws 404 error.
     """
 
-    language = get_object_or_404(Language, pk=language_id)
+    language = get_object_or_404(Language, pk=language_id, user=request.user)
 
-    if language.user != request.user:
-        raise PermissionDenied()
-
-    context = {
-        'language': language,
-    }
+    context = {'language': language}
 
     return render(request, 'dictionary/language_detail.html', context)
 
 
+@max_queries(25)
 @login_required
 def add_word(request):
     """
@@ -144,19 +182,27 @@ def add_word(request):
             if not word_form.has_error(NON_FIELD_ERRORS):
                 user = request.user
 
-                # Creating a Word instance
-                word_form.instance.user = user
-                new_word = word_form.save()
+                with transaction.atomic():
+                    # Creating a Word instance
+                    word_form.instance.user = user
+                    new_word = word_form.save()
 
-                # Creating a Hint instance
-                hint_form.instance.word = new_word
-                hint_form.instance.user = user
-                hint_form.save()
+                    # Creating a Hint instance
+                    hint_form.instance.word = new_word
+                    hint_form.instance.user = user
+                    hint_form.save()
 
-                # Creating a Translation instance
-                translation_form.instance.word = new_word
-                translation_form.instance.user = user
-                translation_form.save()
+                    # Creating a Translation instance
+                    translation_form.instance.word = new_word
+                    translation_form.instance.user = user
+                    new_translation = translation_form.save()
+
+                    reviews.add_words([new_word])
+                    counters.change_counts(words={word_language.pk: 1}, translations={translation_language.pk: 1})
+
+                fuzzy.index_word(new_word, [new_translation.translation])
+                autocomplete.index_word(new_word)
+                quiz.invalidate(user)
 
                 return HttpResponseRedirect(reverse('dictionary:words_list'))
 
@@ -177,107 +223,86 @@ def add_word(request):
     )
 
 
-@transaction.atomic
 @login_required
 def add_words_from_file(request):
     """
     URL: /dictionary/words/add/from_file
-    Handles .csv file upload with words and tries to save those in the database.
+    Handles .csv or .parquet file upload with words and queues it to be saved in the database by the import worker.
+    The progress of the job queued is shown if its id is given in the `job` GET parameter.
     """
 
+    job = None
+
     if request.method == 'POST':
         dictionary_file_form = DictionaryFileForm(request.POST, request.FILES)
 
         if dictionary_file_form.is_valid():
+            job = ImportJob.objects.create(user=request.user, file=dictionary_file_form.cleaned_data['file'])
 
-            user = request.user
-            file = dictionary_file_form.cleaned_data['file'].read()
-            csv = io.BytesIO(file)
+            return HttpResponseRedirect(f"{ reverse('dictionary:add_words_from_file') }?job={ job.pk }")
 
-            # Different schemas could be added in the future
-            allowed_column_schemas = [
-                ['Word', 'WordLanguage', 'Description', 'Hint', 'Translation', 'TranslationLanguage'],
-            ]
-
-            df = pd.read_csv(csv)
-            schema = list(df.columns)
-
-            # Validating data
-            if df.isnull().values.any():
-                dictionary_file_form.add_error('file', f"File does not contain enough data to proceed!")
-
-            if schema not in allowed_column_schemas:
-                dictionary_file_form.add_error('file', f"File schema [{ ', '.join(schema) }] is invalid! See help for more infornation.")
-
-            if not dictionary_file_form.has_error('file'):
-
-                # Iterating over elements in .csv file
-                for _, row in df.iterrows():
-                    word                    = row['Word'].capitalize()
-                    word_language           = row['WordLanguage'].capitalize()
-                    description             = row['Description'].capitalize()
-                    hint                    = row['Hint'].capitalize()
-                    translation             = row['Translation'].capitalize()
-                    translation_language    = row['TranslationLanguage'].capitalize()
-
-                    all_languages = [lang.language_name.lower() for lang in Language.objects.filter(user=user)]
+    else:
+        dictionary_file_form = DictionaryFileForm()
+        job_id = request.GET.get('job', '')
 
-                    # Adding languages if needed
-                    try:
-                        if (word_language.lower() not in all_languages):
-                            new_language = Language(user=user, language_name=word_language)
+        if job_id.isdigit():
+            job = ImportJob.objects.filter(pk=job_id, user=request.user).first()
 
-                            new_language.full_clean()
-                            new_language.save()
 
-                        if (translation_language.lower() not in all_languages):
-                            new_language = Language(user=user, language_name=translation_language)
+    return render(
+        request,
+        'dictionary/add_words_from_file.html',
+        {
+            'dictionary_file_form': bootstrapify_form(dictionary_file_form),
+            'job': job,
+        }
+    )
 
-                            new_language.full_clean()
-                            new_language.save()
 
-                    except ValidationError:
-                        dictionary_file_form.add_error('file', "File data is invalid1!")
-                        transaction.set_rollback(True)
-                        break
+@async_require_GET
+@async_login_required
+async def import_job_detail(request, job_id: int):
+    """
+    URL: /dictionary/words/add/from_file/<int: job_id>
+    Returns the progress of the import job provided as JSON if the job exists, otherwise throws 404 error.
+    """
 
-                    word_language = Language.objects.get(user=user, language_name=word_language)
-                    translation_language = Language.objects.get(user=user, language_name=translation_language)
+    try:
+        job = await ImportJob.objects.aget(pk=job_id, user=request.user)
 
-                    # Adding new instances
-                    new_word = Word(word=word, user=user, word_language=word_language, description=description)
-                    new_hint = Hint(word=new_word, user=user, hint=hint)
-                    new_translation = Translation(word=new_word, user=user, translation_language=translation_language, translation=translation)
+    except ImportJob.DoesNotExist:
+        raise Http404
 
-                    # Validating them
-                    try:
-                        new_word.full_clean()
-                        new_word.save()
+    return JsonResponse({
+        'id': job.pk,
+        'status': job.status,
+        'rows_total': job.rows_total,
+        'rows_imported': job.rows_imported,
+        'errors': job.errors,
+        'date_added': job.date_added,
+        'date_finished': job.date_finished,
+    })
 
-                        for new_instance in [new_hint, new_translation]:
-                            new_instance.word = new_word
-                            new_instance.full_clean()
-                            new_instance.save()
 
-                    except ValidationError:
-                        dictionary_file_form.add_error('file', "File data is invalid2!")
-                        transaction.set_rollback(True)
-                        break
+@require_GET
+@login_required
+def export_words(request):
+    """
+    URL: /dictionary/words/export
+    Streams all user's words as a .csv file, or in another format given in the `format` GET parameter,
+    eg. `jsonl` or `parquet`. Files follow the schema of the files words are added from.
+    """
 
-            if not dictionary_file_form.has_error('file'):
-                return HttpResponseRedirect(reverse('dictionary:words_list'))
+    export_format = request.GET.get('format', 'csv')
 
-    else:
-        dictionary_file_form = DictionaryFileForm()
+    if export_format not in EXPORT_FORMATS:
+        raise SuspiciousOperation
 
+    exporter = WordsExporter(request.user)
+    response = StreamingHttpResponse(getattr(exporter, export_format)(), content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="dictionary.{ export_format }"'
 
-    return render(
-        request,
-        'dictionary/add_words_from_file.html',
-        {
-            'dictionary_file_form': bootstrapify_form(dictionary_file_form),
-        }
-    )
+    return response
 
 
 @login_required
@@ -312,21 +337,23 @@ def add_language(request):
     )
 
 
+@max_queries(25)
 @login_required
 def edit_word(request, word_id: int):
     """
     URL: /dictionary/words/edit/<int: language_id>
-    Renders a form that allow user to edit a word, alongside with the corresponding
-    hints and translations.
+    Renders a form that allow user to edit a word, alongside with its first hint and translation.
+    Words can have any number of hints and translations once they are added by the API or generated,
+    the first ones are created if the word has none.
     """
 
-    word = get_object_or_404(Word, pk=word_id)
+    word = get_object_or_404(Word, pk=word_id, user=request.user)
+    hint = word.hints.order_by('pk').first() or Hint(word=word, user=request.user)
+    translation = word.translations.order_by('pk').first() or Translation(word=word, user=request.user)
 
-    if word.user != request.user:
-        raise PermissionDenied()
-
-    hint = Hint.objects.get(word=word, user=word.user)
-    translation = Translation.objects.get(word=word, user=word.user)
+    # Forms change the instances when they are validated
+    old_word_language_id = word.word_language_id
+    old_translation_language_id = translation.translation_language_id
 
     if request.method == 'POST':
         word_form = WordForm(request.user, request.POST, instance=word)
@@ -336,9 +363,23 @@ def edit_word(request, word_id: int):
         if all([word_form.is_valid(), hint_form.is_valid(), translation_form.is_valid()]):
 
             # Updating instances
-            word_form.save()
-            hint_form.save()
-            translation_form.save()
+            with transaction.atomic():
+                word_form.save()
+                hint_form.save()
+                translation_form.save()
+
+                # Counters of both languages are changed if the word or the translation is moved, or the translation is added
+                counters.change_counts(
+                    words=counters.moved(old_word_language_id, word.word_language_id),
+                    translations=(
+                        counters.moved(old_translation_language_id, translation.translation_language_id)
+                        if old_translation_language_id is not None else {translation.translation_language_id: 1}
+                    ),
+                )
+
+            fuzzy.index_word(word, list(word.translations.values_list('translation', flat=True)))
+            autocomplete.index_word(word)
+            quiz.invalidate(request.user)
 
             return HttpResponseRedirect(reverse('dictionary:word_detail', args=[word.pk]))
 
@@ -366,10 +407,7 @@ def edit_language(request, language_id: int):
     Renders a form that allow user to edit a language.
     """
 
-    language = get_object_or_404(Language, pk=language_id)
-
-    if language.user != request.user:
-        raise PermissionDenied()
+    language = get_object_or_404(Language, pk=language_id, user=request.user)
 
     if request.method == 'POST':
         language_form = LanguageForm(request.user, request.POST, instance=language)
@@ -393,6 +431,7 @@ def edit_language(request, language_id: int):
     )
 
 
+@max_queries(25)
 @login_required
 def delete_word(request, word_id: int):
     """
@@ -400,39 +439,71 @@ def delete_word(request, word_id: int):
     Deletes a word and other related instances, eg. Hints, Translations.
     """
 
-    word = get_object_or_404(Word, pk=word_id)
+    word = get_object_or_404(Word, pk=word_id, user=request.user)
+
+    with transaction.atomic():
+        deleted_translations = counters.translation_counts(Translation.objects.filter(word=word))
+        word.delete()
 
-    if word.user != request.user:
-        raise PermissionDenied()
+        counters.change_counts(
+            words={word.word_language_id: -1},
+            translations={language_id: -count for language_id, count in deleted_translations.items()},
+        )
 
-    word.delete()
+    fuzzy.remove_word(request.user, word_id)
+    autocomplete.remove_word(request.user, word_id)
+    quiz.invalidate(request.user)
 
     return HttpResponseRedirect(reverse('dictionary:words_list'))
 
 
+@max_queries(None)
 @login_required
 def delete_language(request, language_id: int):
     """
     URL: /dictionary/languages/delete/<int: language_id>
-    Deletes a language.
+    Deletes a language with its words in batches. Languages with more than `DELETION_SYNC_LIMIT` words
+    and translations to them are queued to be deleted by the worker, and the progress of the deletion is shown in the list of languages.
     """
 
-    language = get_object_or_404(Language, pk=language_id)
+    language = get_object_or_404(Language, pk=language_id, user=request.user)
+
+    if not can_delete_in_request(language):
+        # The same language is not queued twice
+        job = DeletionJob.objects.filter(language=language, status__in=[DeletionJob.PENDING, DeletionJob.RUNNING]).first()
 
-    if language.user != request.user:
-        raise PermissionDenied()
+        if job is None:
+            job = DeletionJob.objects.create(user=request.user, language=language, language_name=language.language_name)
 
-    language.delete()
+        return HttpResponseRedirect(f"{ reverse('dictionary:languages_list') }?job={ job.pk }")
+
+    # Batches are not paused for other writers here, as the request waits for the whole deletion
+    LanguageDeleter(language, pause=0).run()
 
     return HttpResponseRedirect(reverse('dictionary:languages_list'))
 
 
-@require_GET
 @login_required
-def search_words(request):
+def cancel_deletion_job(request, job_id: int):
+    """
+    URL: /dictionary/languages/delete/jobs/<int: job_id>/cancel
+    Cancels the deletion of a language queued. Words deleted before the deletion is stopped are not restored.
+    """
+
+    job = get_object_or_404(DeletionJob, pk=job_id, user=request.user)
+    DeletionJob.objects.filter(pk=job.pk, status__in=[DeletionJob.PENDING, DeletionJob.RUNNING]).update(status=DeletionJob.CANCELLED)
+
+    return HttpResponseRedirect(f"{ reverse('dictionary:languages_list') }?job={ job.pk }")
+
+
+@async_require_GET
+@async_login_required
+async def search_words(request):
     """
     URL: /dictionary/words/search/
-    Searches words by the GET request given.
+    Searches words by the GET request given. Words, descriptions, hints and translations are searched
+    in the full-text search index and the results are ranked, if the database supports it.
+    If `fuzzy` is given, words and translations closest to the query are found instead, so that typos are tolerated.
     """
 
     search_input_name = 'word'
@@ -440,13 +511,36 @@ def search_words(request):
 
     if search_form.is_valid():
         search_query = search_form.cleaned_data.get(search_input_name)
-        search_results = Word.objects.filter(user=request.user, word__icontains=search_query).order_by('-date_added')
-        
-        paginator = Paginator(search_results, stg.PAGINATOR_PER_PAGE)
-        page_number = request.GET.get('page')
 
-        # get_page returns a valid page even if a page_number value is not valid
-        page_obj = paginator.get_page(page_number)
+        if search_form.cleaned_data.get('fuzzy'):
+            # The fuzzy index of the user is built with the sync ORM if it is not in memory
+            word_ids = await sync_to_async(fuzzy.fuzzy_search)(request.user, search_query)
+            words = {word.pk: word async for word in Word.objects.filter(user=request.user, pk__in=word_ids).with_primary_translation()}
+
+            return render(
+                request,
+                'dictionary/word_search.html',
+                {
+                    'search_query': search_query,
+                    'words': [words[word_id] for word_id in word_ids if word_id in words],
+                    'fuzzy': True,
+                }
+            )
+
+        if is_search_index_supported():
+            paginator = WordSearchPaginator(request.user, search_query, stg.PAGINATOR_PER_PAGE)
+
+        else:
+            search_results = Word.objects.filter(user=request.user, word__icontains=search_query).with_primary_translation()
+            paginator = CursorPaginator(search_results, stg.PAGINATOR_PER_PAGE)
+
+        if stg.PAGINATOR_COUNT:
+            await paginator.acount()
+
+        cursor = request.GET.get('cursor')
+
+        # get_page returns the first page if a cursor value is not valid
+        page_obj = await paginator.aget_page(cursor)
 
         return render(
             request,
@@ -460,3 +554,103 @@ def search_words(request):
 
     else:
         raise SuspiciousOperation
+
+
+@async_require_GET
+@async_login_required
+async def autocomplete_words(request):
+    """
+    URL: /dictionary/words/autocomplete
+    Returns user's words that start with the `term` GET parameter as JSON, to complete the search query as it is typed.
+    Words are looked up in the in-memory prefix index of the user, so keystrokes do not query the words table.
+    """
+
+    term = request.GET.get('term', '')[:Word._meta.get_field('word').max_length]
+
+    # The prefix index of the user is built with the sync ORM if it is not in memory
+    results = await sync_to_async(autocomplete.complete)(request.user, term)
+
+    return JsonResponse({
+        'results': [{'id': word_id, 'word': word} for word_id, word in results],
+    })
+
+
+@async_require_GET
+@async_login_required
+async def review_words(request):
+    """
+    URL: /dictionary/review/
+    Renders a template with the word due to be reviewed first and the number of words due, up to `REVIEW_BATCH_SIZE`.
+    The batch is read as a range of the due-queue index, so it takes one query however many words the user has.
+    """
+
+    due = [review async for review in reviews.due_reviews(request.user)[:stg.REVIEW_BATCH_SIZE]]
+
+    context = {
+        'review': due[0] if due else None,
+        'due_count': len(due),
+        'more_due': len(due) == stg.REVIEW_BATCH_SIZE,
+        'grades': reviews.GRADES,
+    }
+
+    return render(request, 'dictionary/review_words.html', context)
+
+
+@require_POST
+@login_required
+def review_word(request, word_id: int):
+    """
+    URL: /dictionary/review/<int: word_id>
+    Grades the review of the word with the `grade` POST parameter and schedules its next review.
+    Only the review state of the word is updated, by its primary key.
+    """
+
+    review = get_object_or_404(Review, word_id=word_id, user=request.user)
+    form = ReviewForm(request.POST)
+
+    if not form.is_valid():
+        raise SuspiciousOperation
+
+    reviews.schedule(review, form.cleaned_data['grade'])
+    review.save(update_fields=['ease', 'interval', 'repetitions', 'due_at', 'date_reviewed'])
+
+    return HttpResponseRedirect(reverse('dictionary:review_words'))
+
+
+@async_require_http_methods(['GET', 'POST'])
+@async_login_required
+async def quiz_words(request):
+    """
+    URL: /dictionary/quiz/
+    Renders a multiple choice quiz on translations of user's words to the language given in the `language`
+    GET parameter, or to any language. Quizzes are built from the in-memory quiz index of the user.
+    Answers posted are checked against translations of their words, and the score is rendered.
+    """
+
+    if request.method == 'POST':
+        word_ids = [int(word_id) for word_id in request.POST.getlist('word')[:stg.QUIZ_QUESTIONS] if word_id.isdigit()]
+        answers = {word_id: request.POST.get(f'answer-{ word_id }', '') for word_id in word_ids}
+
+        results = await sync_to_async(quiz.check_answers)(request.user, answers)
+
+        context = {
+            'results': [{'answer': answers[word_id], 'correct': correct} for word_id, correct in results.items()],
+            'score': sum(results.values()),
+        }
+
+        return render(request, 'dictionary/quiz.html', context)
+
+    language = request.GET.get('language', '')
+    language_id = int(language) if language.isdigit() else None
+
+    # The quiz index of the user is built with the sync ORM if it is not in memory
+    questions = await sync_to_async(quiz.make_quiz)(request.user, language_id)
+    users_summary = await summary.aget_summary(request.user)
+
+    context = {
+        'questions': questions,
+        'languages': users_summary.languages,
+        'language_id': language_id,
+    }
+
+    return render(request, 'dictionary/quiz.html', context)
@@ -1,4 +1,4 @@
-from django.shortcuts import render
+from app.utils import render
 
 
 def index(request):